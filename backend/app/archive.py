@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import io
+import time
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+ArchiveEntry = Tuple[str, Iterable[bytes]]
+
+# Entries that are already compressed are stored as-is rather than deflated again.
+STORED_SUFFIXES = (".gz", ".zst")
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only, non-seekable sink that collects bytes until drained."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._pending = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        self._pending += len(data)
+        return len(data)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self._pending = 0
+        return data
+
+
+def stream_zip(
+    entries: Iterable[ArchiveEntry],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield a deflated ZIP archive chunk by chunk.
+
+    ``entries`` is consumed lazily, and so is the content of each entry, so an
+    entry may be produced by a generator that depends on earlier entries having
+    been fully written. Entries are written with data descriptors (the sink is
+    not seekable) and ZIP64 headers since their final size is unknown upfront.
+    Entries named with a ``STORED_SUFFIXES`` suffix are stored uncompressed.
+    """
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in entries:
+            with archive.open(_entry_info(name), "w", force_zip64=True) as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    if sink.pending >= chunk_size:
+                        yield sink.drain()
+            if sink.pending:
+                yield sink.drain()
+    if sink.pending:
+        yield sink.drain()
+
+
+def _entry_info(name: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+    info.compress_type = zipfile.ZIP_STORED if name.endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+    return info
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from .config_loader import BASE_DIR, vertical_source_hash
+from .models import GenerationRequest
+
+logger = logging.getLogger("eval_dataset_generator")
+
+# Bump when archive contents change for the same request and config, so
+# entries written by older code are never served.
+ARTEFACT_CACHE_FORMAT_VERSION = 2
+# Override with EVAL_ARTEFACT_CACHE_DIR; entries are disposable and rebuilt on demand.
+DEFAULT_CACHE_DIR = BASE_DIR / ".cache" / "artefacts"
+# Override with EVAL_ARTEFACT_CACHE_MAX_BYTES; 0 disables the cache.
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# Request fields that do not change the generated archive.
+_KEY_EXCLUDED_FIELDS = {"workers"}
+
+
+def artefact_cache_dir() -> Path:
+    return Path(os.environ.get("EVAL_ARTEFACT_CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+def artefact_cache_max_bytes() -> int:
+    return int(os.environ.get("EVAL_ARTEFACT_CACHE_MAX_BYTES") or DEFAULT_MAX_BYTES)
+
+
+def dataset_cache_key(request: GenerationRequest) -> str | None:
+    """Content address of the archive ``request`` generates, or None if uncacheable.
+
+    The key hashes the normalised request together with the content of the
+    vertical's YAML files. Without a ``random_seed`` generation is not
+    reproducible, so such requests have no key.
+    """
+    if request.random_seed is None:
+        return None
+    payload = {
+        "format_version": ARTEFACT_CACHE_FORMAT_VERSION,
+        "request": request.model_dump(mode="json", exclude=_KEY_EXCLUDED_FIELDS),
+        "source_hash": vertical_source_hash(request.vertical),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def etag_for(key: str) -> str:
+    # Weak: archives for one key are equivalent but differ in manifest.json's
+    # generated_at once an entry is evicted and regenerated.
+    return f'W/"{key}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class CachedArtefact:
+    key: str
+    path: Path
+    size: int
+
+    @property
+    def filename(self) -> str:
+        return self.path.name
+
+    @property
+    def etag(self) -> str:
+        return etag_for(self.key)
+
+
+class ArtefactCache:
+    """Size-bounded, least-recently-used disk cache of generated archives.
+
+    Each entry is a directory named after its key holding the zip under its
+    download filename. Reads refresh the zip's mtime, which orders eviction.
+    The location and size bound are read from the environment on use, so
+    they can be changed without recreating the cache.
+    """
+
+    def __init__(self, directory: Path | None = None, max_bytes: int | None = None) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "uncacheable": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or artefact_cache_dir()
+
+    @property
+    def max_bytes(self) -> int:
+        return artefact_cache_max_bytes() if self._max_bytes is None else self._max_bytes
+
+    def record(self, event: str) -> None:
+        with self._lock:
+            self._counters[event] += 1
+
+    def lookup(self, key: str) -> CachedArtefact | None:
+        """Return the cached archive for ``key`` and mark it recently used."""
+        entry = self._entry(self.directory / key)
+        if entry is None:
+            self.record("misses")
+            return None
+        try:
+            os.utime(entry.path)
+        except OSError:
+            pass
+        self.record("hits")
+        return entry
+
+    def store(self, key: str, filename: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield ``chunks`` unchanged while writing them to the cache entry for ``key``.
+
+        The entry is published only once the stream is fully consumed; a
+        stream that fails or is closed early leaves nothing behind. Cache
+        write errors are logged and never interrupt the stream.
+        """
+        if self.max_bytes <= 0:
+            yield from chunks
+            return
+        root = self.directory
+        staging = root / f".{key}.{uuid.uuid4().hex}"
+        handle = None
+        try:
+            staging.mkdir(parents=True)
+            handle = (staging / filename).open("wb")
+        except OSError as exc:
+            logger.warning("artefact_cache_write_failed %s", exc)
+        try:
+            for chunk in chunks:
+                if handle is not None:
+                    try:
+                        handle.write(chunk)
+                    except OSError as exc:
+                        logger.warning("artefact_cache_write_failed %s", exc)
+                        handle.close()
+                        handle = None
+                yield chunk
+            if handle is not None:
+                handle.close()
+                handle = None
+                self._publish(staging, root / key)
+        finally:
+            if handle is not None:
+                handle.close()
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _publish(self, staging: Path, target: Path) -> None:
+        try:
+            staging.rename(target)
+        except OSError:
+            # A concurrent request stored the same key first; keep that entry.
+            return
+        self.record("stores")
+        self.evict()
+
+    def evict(self) -> List[str]:
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        max_bytes = self.max_bytes
+        with self._lock:
+            entries = self._entries()
+            total = sum(entry.size for entry in entries)
+            evicted: List[str] = []
+            for entry in sorted(entries, key=_last_used):
+                if total <= max_bytes:
+                    break
+                shutil.rmtree(entry.path.parent, ignore_errors=True)
+                total -= entry.size
+                evicted.append(entry.key)
+            self._counters["evictions"] += len(evicted)
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries():
+                shutil.rmtree(entry.path.parent, ignore_errors=True)
+
+    def stats(self) -> Dict[str, object]:
+        entries = self._entries()
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(entry.size for entry in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def _entries(self) -> List[CachedArtefact]:
+        try:
+            directories = [path for path in self.directory.iterdir() if not path.name.startswith(".")]
+        except FileNotFoundError:
+            return []
+        entries = (self._entry(path) for path in directories)
+        return [entry for entry in entries if entry is not None]
+
+    @staticmethod
+    def _entry(directory: Path) -> CachedArtefact | None:
+        try:
+            path = next(directory.iterdir())
+            size = path.stat().st_size
+        except (OSError, StopIteration):
+            return None
+        return CachedArtefact(directory.name, path, size)
+
+
+def _last_used(entry: CachedArtefact) -> float:
+    try:
+        return entry.path.stat().st_mtime
+    except OSError:
+        return 0.0
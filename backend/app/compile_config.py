@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Sequence
+
+from . import config_loader
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Precompile vertical config snapshots: ``python -m app.compile_config [vertical ...]``."""
+    parser = argparse.ArgumentParser(
+        prog="compile-config",
+        description="Validate vertical YAML config and write precompiled snapshots.",
+    )
+    parser.add_argument(
+        "verticals",
+        nargs="*",
+        help="Verticals to compile (default: every directory under the config root).",
+    )
+    args = parser.parse_args(argv)
+
+    verticals = args.verticals or sorted(
+        path.name for path in config_loader.CONFIG_DIR.iterdir() if path.is_dir()
+    )
+    failed = False
+    for vertical in verticals:
+        try:
+            snapshot_path = config_loader.compile_vertical_snapshot(vertical)
+        except (FileNotFoundError, ValueError) as exc:
+            print(f"{vertical}: {exc}", file=sys.stderr)
+            failed = True
+            continue
+        print(f"{vertical}: {snapshot_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Sequence
+
+from . import golden_index
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Precompile golden scoring indexes: ``python -m app.compile_golden golden.jsonl ...``."""
+    parser = argparse.ArgumentParser(
+        prog="compile-golden",
+        description="Compile golden JSONL datasets into cached scoring indexes.",
+    )
+    parser.add_argument("paths", nargs="+", help="Golden JSONL files to compile.")
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Index directory (default: $EVAL_GOLDEN_CACHE_DIR or .cache/golden in the repo root).",
+    )
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.paths:
+        try:
+            with open(path, "rb") as handle:
+                index = golden_index.compile_golden_index(handle, args.cache_dir)
+        except (OSError, ValueError) as exc:
+            print(f"{path}: {exc}", file=sys.stderr)
+            failed = True
+            continue
+        print(f"{path}: {index.count} entries -> {index.path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
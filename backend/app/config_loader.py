@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
+import threading
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
 
 import yaml
 
@@ -10,13 +14,40 @@ from .models import IndustryVertical
 BASE_DIR = Path(__file__).resolve().parents[2]
 CONFIG_DIR = BASE_DIR / "config" / "verticals"
 
+_CONFIG_FILES = ("workflows.yaml", "behaviours.yaml", "axes.yaml")
+
+# Precompiled snapshot written by ``compile_vertical_snapshot`` next to the YAML.
+SNAPSHOT_FILENAME = ".snapshot.json"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# libyaml's C loader is an order of magnitude faster than the pure-Python one.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Cache keys include the config root so a patched CONFIG_DIR never sees
+# entries loaded from another root.
+_CacheKey = Tuple[str, str]
+Fingerprint = Tuple[Tuple[str, int | None, int | None], ...]
+
+
+class CachedTemplates(NamedTuple):
+    """Parsed templates shared across callers; treat ``templates`` as read-only."""
+
+    fingerprint: Fingerprint
+    templates: Dict[str, Any]
+
+
+_cache_lock = threading.RLock()
+_config_cache: Dict[_CacheKey, Tuple[Fingerprint, Dict[str, object]]] = {}
+_templates_cache: Dict[_CacheKey, CachedTemplates] = {}
+_source_hash_cache: Dict[_CacheKey, Tuple[Fingerprint, str]] = {}
+
 
 def _load_yaml(path: Path) -> Any:
     if not path.exists():
         raise FileNotFoundError(f"Missing config file: {path}")
     try:
         content = path.read_text(encoding="utf-8")
-        return yaml.safe_load(content)
+        return yaml.load(content, Loader=_YAML_LOADER)
     except yaml.YAMLError as exc:
         raise ValueError(f"Invalid YAML in {path}: {exc}") from exc
 
@@ -56,12 +87,65 @@ def _coerce_vertical(vertical: IndustryVertical | str) -> str:
     return vertical
 
 
+def _cache_key(vertical_key: str) -> _CacheKey:
+    return (str(CONFIG_DIR), vertical_key)
+
+
+def _fingerprint(paths: Sequence[Path]) -> Fingerprint:
+    """Identify file versions by path, mtime and size without reading them."""
+    entries = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            entries.append((str(path), None, None))
+        else:
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def clear_config_cache(vertical: IndustryVertical | str | None = None) -> None:
+    """Drop cached config and templates so the next load re-reads from disk.
+
+    Entries are already refreshed when a file's mtime or size changes; this is
+    the explicit hook for edits that keep both (or for tests).
+    """
+    with _cache_lock:
+        if vertical is None:
+            _config_cache.clear()
+            _templates_cache.clear()
+            _source_hash_cache.clear()
+            return
+        key = _cache_key(_coerce_vertical(vertical))
+        _config_cache.pop(key, None)
+        _templates_cache.pop(key, None)
+        _source_hash_cache.pop(key, None)
+
+
 def load_vertical_config(vertical: IndustryVertical | str) -> Dict[str, object]:
     vertical_key = _coerce_vertical(vertical)
     vertical_dir = CONFIG_DIR / vertical_key
     if not vertical_dir.exists():
         raise FileNotFoundError(f"Missing vertical directory: {vertical_dir}")
 
+    key = _cache_key(vertical_key)
+    fingerprint = _fingerprint([vertical_dir / name for name in _CONFIG_FILES])
+    with _cache_lock:
+        cached = _config_cache.get(key)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, _read_vertical_config(vertical_key, vertical_dir))
+            _config_cache[key] = cached
+    return copy.deepcopy(cached[1])
+
+
+def _read_vertical_config(vertical_key: str, vertical_dir: Path) -> Dict[str, object]:
+    snapshot = _load_fresh_snapshot(vertical_dir)
+    if snapshot is not None:
+        return snapshot["config"]
+    return _parse_vertical_config(vertical_key, vertical_dir)
+
+
+def _parse_vertical_config(vertical_key: str, vertical_dir: Path) -> Dict[str, object]:
     workflows = _load_list_config(vertical_dir / "workflows.yaml", "workflows")
     behaviours = _load_list_config(vertical_dir / "behaviours.yaml", "behaviours")
     axes = _load_axes_config(vertical_dir / "axes.yaml")
@@ -75,17 +159,51 @@ def load_vertical_config(vertical: IndustryVertical | str) -> Dict[str, object]:
 
 
 def load_vertical_templates(vertical: IndustryVertical | str) -> Dict[str, Any]:
+    return copy.deepcopy(get_cached_templates(vertical).templates)
+
+
+def get_cached_templates(vertical: IndustryVertical | str) -> CachedTemplates:
+    """Return the process-wide parsed templates for a vertical.
+
+    The returned mapping is shared with other callers and must not be mutated;
+    use ``load_vertical_templates`` for a private copy.
+    """
     vertical_key = _coerce_vertical(vertical)
-    templates_dir = CONFIG_DIR / vertical_key / "templates"
+    vertical_dir = CONFIG_DIR / vertical_key
+    templates_dir = vertical_dir / "templates"
     if not templates_dir.exists():
         raise FileNotFoundError(f"Missing templates directory: {templates_dir}")
 
-    template_files = sorted(
-        [path for path in templates_dir.glob("*.y*ml") if path.is_file()]
-    )
+    template_files = _list_template_files(vertical_dir)
     if not template_files:
         raise FileNotFoundError(f"No template files found in: {templates_dir}")
 
+    key = _cache_key(vertical_key)
+    fingerprint = _fingerprint(template_files)
+    with _cache_lock:
+        cached = _templates_cache.get(key)
+        if cached is None or cached.fingerprint != fingerprint:
+            templates = _read_vertical_templates(vertical_dir, template_files)
+            cached = CachedTemplates(fingerprint, templates)
+            _templates_cache[key] = cached
+    return cached
+
+
+def _list_template_files(vertical_dir: Path) -> List[Path]:
+    templates_dir = vertical_dir / "templates"
+    if not templates_dir.exists():
+        return []
+    return sorted(path for path in templates_dir.glob("*.y*ml") if path.is_file())
+
+
+def _read_vertical_templates(vertical_dir: Path, template_files: Sequence[Path]) -> Dict[str, Any]:
+    snapshot = _load_fresh_snapshot(vertical_dir)
+    if snapshot is not None:
+        return snapshot["templates"]
+    return _parse_vertical_templates(template_files)
+
+
+def _parse_vertical_templates(template_files: Sequence[Path]) -> Dict[str, Any]:
     templates: Dict[str, Any] = {}
     for template_file in template_files:
         data = _load_yaml(template_file)
@@ -94,3 +212,94 @@ def load_vertical_templates(vertical: IndustryVertical | str) -> Dict[str, Any]:
         templates[template_file.stem] = data
 
     return templates
+
+
+def _source_files(vertical_dir: Path) -> List[Path]:
+    return [vertical_dir / name for name in _CONFIG_FILES] + _list_template_files(vertical_dir)
+
+
+def _source_hash(vertical_dir: Path, sources: Sequence[Path] | None = None) -> str:
+    """Content hash of every YAML file a vertical is built from."""
+    digest = hashlib.sha256()
+    if sources is None:
+        sources = _source_files(vertical_dir)
+    for path in sources:
+        digest.update(path.relative_to(vertical_dir).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        if path.exists():
+            digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def vertical_source_hash(vertical: IndustryVertical | str) -> str:
+    """Content hash of a vertical's YAML config and templates.
+
+    Cached like the parsed config: the files are re-read and hashed only
+    when one of them is added, removed or changes mtime or size.
+    """
+    vertical_key = _coerce_vertical(vertical)
+    vertical_dir = CONFIG_DIR / vertical_key
+    if not vertical_dir.exists():
+        raise FileNotFoundError(f"Missing vertical directory: {vertical_dir}")
+    sources = _source_files(vertical_dir)
+    key = _cache_key(vertical_key)
+    fingerprint = _fingerprint(sources)
+    with _cache_lock:
+        cached = _source_hash_cache.get(key)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, _source_hash(vertical_dir, sources))
+            _source_hash_cache[key] = cached
+    return cached[1]
+
+
+def _load_fresh_snapshot(vertical_dir: Path) -> Dict[str, Any] | None:
+    """Load the compiled snapshot if it exists and matches the YAML on disk."""
+    snapshot_path = vertical_dir / SNAPSHOT_FILENAME
+    if not snapshot_path.exists():
+        return None
+    try:
+        snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        return None
+    if snapshot.get("source_hash") != _source_hash(vertical_dir):
+        return None
+    return snapshot
+
+
+def compile_vertical_snapshot(vertical: IndustryVertical | str) -> Path:
+    """Validate a vertical's YAML and write it as a single precompiled snapshot.
+
+    The snapshot carries a content hash of its sources; loaders use it only
+    while the hash still matches and fall back to the YAML otherwise.
+    """
+    vertical_key = _coerce_vertical(vertical)
+    vertical_dir = CONFIG_DIR / vertical_key
+    if not vertical_dir.exists():
+        raise FileNotFoundError(f"Missing vertical directory: {vertical_dir}")
+    template_files = _list_template_files(vertical_dir)
+    if not template_files:
+        raise FileNotFoundError(f"No template files found in: {vertical_dir / 'templates'}")
+
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "vertical": vertical_key,
+        "source_hash": _source_hash(vertical_dir),
+        "config": _parse_vertical_config(vertical_key, vertical_dir),
+        "templates": _parse_vertical_templates(template_files),
+    }
+    try:
+        payload = json.dumps(snapshot, ensure_ascii=False)
+    except TypeError as exc:
+        raise ValueError(f"Config for {vertical_key} cannot be snapshotted: {exc}") from exc
+
+    snapshot_path = vertical_dir / SNAPSHOT_FILENAME
+    temp_path = snapshot_path.with_suffix(".tmp")
+    temp_path.write_text(payload, encoding="utf-8")
+    temp_path.replace(snapshot_path)
+    clear_config_cache(vertical_key)
+    return snapshot_path
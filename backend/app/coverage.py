@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from itertools import combinations, product
+from math import comb, prod
+from typing import Any, Dict, List, Sequence, Tuple, TypeVar
+
+Row = Tuple[int, ...]
+T = TypeVar("T")
+
+
+class MixedRadixProduct(Sequence[Tuple[T, ...]]):
+    """The cartesian product of ``options``, addressable by index.
+
+    Index ``i`` decodes to one value per option list as the digits of ``i``
+    in the mixed-radix system whose radices are the option counts, with the
+    last option varying fastest, i.e. the order of ``itertools.product``.
+    Any combination is computed in O(len(options)) without enumerating the
+    product, and ``index`` is the inverse.
+    """
+
+    __slots__ = ("_options", "_size")
+
+    def __init__(self, options: Sequence[Sequence[T]]) -> None:
+        self._options: Tuple[Tuple[T, ...], ...] = tuple(tuple(values) for values in options)
+        self._size = prod(len(values) for values in self._options)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Any) -> Tuple[T, ...]:
+        if isinstance(index, slice):
+            raise TypeError("MixedRadixProduct does not support slicing")
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("combination index out of range")
+        digits: List[T] = []
+        for values in reversed(self._options):
+            index, digit = divmod(index, len(values))
+            digits.append(values[digit])
+        return tuple(reversed(digits))
+
+    def index(self, combination: Sequence[T], start: int = 0, stop: int | None = None) -> int:
+        """Return the index of ``combination``; ValueError if it is not in the product."""
+        if len(combination) != len(self._options):
+            raise ValueError("combination has the wrong number of values")
+        index = 0
+        for values, value in zip(self._options, combination):
+            index = index * len(values) + values.index(value)
+        if index < start or (stop is not None and index >= stop):
+            raise ValueError("combination is not in the requested range")
+        return index
+
+
+def build_covering_array(sizes: Sequence[int], strength: int) -> List[Row]:
+    """Return rows of value indexes covering every ``strength``-way interaction.
+
+    ``sizes[i]`` is the number of values of parameter ``i``. Each row picks
+    one value index per parameter, and every combination of values of any
+    ``strength`` parameters appears in at least one row. A strength at or
+    above the number of parameters yields the full cartesian product.
+
+    Built with the in-parameter-order greedy strategy (IPOG): start from the
+    product of the ``strength`` largest parameters, then add parameters one
+    at a time, first extending each row with the value that covers the most
+    missing interactions, then appending rows for any still missing. The
+    result is deterministic.
+    """
+    if strength < 1:
+        raise ValueError("coverage strength must be at least 1")
+    if any(size < 1 for size in sizes):
+        raise ValueError("every parameter needs at least one value")
+    if strength >= len(sizes):
+        return list(product(*(range(size) for size in sizes)))
+
+    # Larger parameters first keeps the initial product and the array small.
+    order = sorted(range(len(sizes)), key=lambda index: (-sizes[index], index))
+    ordered_sizes = [sizes[index] for index in order]
+    rows: List[List[int | None]] = [
+        list(values) for values in product(*(range(size) for size in ordered_sizes[:strength]))
+    ]
+    for column in range(strength, len(ordered_sizes)):
+        _extend_column(rows, ordered_sizes, column, strength)
+
+    array: List[Row] = []
+    for position, row in enumerate(rows):
+        # Unconstrained cells can take any value; cycling keeps values balanced.
+        filled = [
+            position % ordered_sizes[column] if value is None else value
+            for column, value in enumerate(row)
+        ]
+        original = [0] * len(sizes)
+        for column, parameter in enumerate(order):
+            original[parameter] = filled[column]
+        array.append(tuple(original))
+    return array
+
+
+def _extend_column(
+    rows: List[List[int | None]],
+    sizes: Sequence[int],
+    column: int,
+    strength: int,
+) -> None:
+    # Interactions of the new column with each (strength - 1)-subset of the
+    # earlier columns that no row covers yet.
+    missing: Dict[Tuple[int, ...], set[Tuple[int, ...]]] = {
+        columns: set(product(*(range(sizes[index]) for index in (*columns, column))))
+        for columns in combinations(range(column), strength - 1)
+    }
+
+    # Horizontal growth: extend each row with its best value for the new column.
+    for row in rows:
+        best_value, best_gain = 0, -1
+        for value in range(sizes[column]):
+            gain = 0
+            for columns, interactions in missing.items():
+                key = _key(row, columns, value)
+                if key is not None and key in interactions:
+                    gain += 1
+            if gain > best_gain:
+                best_value, best_gain = value, gain
+        row.append(best_value)
+        for columns, interactions in missing.items():
+            key = _key(row, columns, best_value)
+            if key is not None:
+                interactions.discard(key)
+
+    # Vertical growth: place each interaction still missing in a row whose
+    # relevant cells are unset or already agree, or in a new row.
+    width = column + 1
+    for columns, interactions in missing.items():
+        targets = (*columns, column)
+        for interaction in sorted(interactions):
+            for row in rows:
+                if all(row[index] is None or row[index] == value for index, value in zip(targets, interaction)):
+                    break
+            else:
+                row = [None] * width
+                rows.append(row)
+            for index, value in zip(targets, interaction):
+                row[index] = value
+
+
+def _key(row: Sequence[int | None], columns: Tuple[int, ...], value: int) -> Tuple[int, ...] | None:
+    values = tuple(row[index] for index in columns)
+    if any(item is None for item in values):
+        return None
+    return (*values, value)
+
+
+def coverage_report(rows: Sequence[Row], sizes: Sequence[int], strength: int) -> Dict[str, object]:
+    """Describe how many ``strength``-way interactions ``rows`` cover."""
+    strength = min(strength, len(sizes))
+    total = 0
+    covered = 0
+    for columns in combinations(range(len(sizes)), strength):
+        total += prod(sizes[index] for index in columns)
+        covered += len({tuple(row[index] for index in columns) for row in rows})
+    return {
+        "strength": strength,
+        "rows": len(rows),
+        "full_product_rows": prod(sizes),
+        "parameters": len(sizes),
+        "interaction_sets": comb(len(sizes), strength),
+        "interactions_total": total,
+        "interactions_covered": covered,
+        "coverage": covered / total if total else 1.0,
+    }
@@ -2,95 +2,215 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Protocol, Sequence, TextIO
 
 from .models import BehaviourFlag, ConversationPlan, GoldenDataset, GoldenEntry, GoldenTurnExpectation
+from .plans import PlanRecord, TurnRecord, as_plan_record
 from .template_engine import TemplateEngine
 
+# Builders accept internal plan records or the pydantic API model.
+PlanLike = PlanRecord | ConversationPlan
+
+
+class EntrySink(Protocol):
+    """Receives entries one at a time, e.g. ``JsonlSink`` or ``JsonArraySpool``."""
+
+    def append(self, entry: Dict[str, Any]) -> None: ...
+
+
+class ConversationArtefacts(NamedTuple):
+    """Everything generated for one conversation from a single render of its turns.
+
+    ``golden_dataset_entry`` is None when it was not requested. The entries
+    share their user turn dicts; treat them as read-only.
+    """
+
+    eval_entry: Dict[str, Any]
+    golden_dataset_entry: Dict[str, Any] | None
+    golden_entry: Dict[str, Any]
+
+
+class JsonlSink:
+    """Append entries to a JSONL file as they arrive."""
+
+    def __init__(self, output_path: Path | str) -> None:
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: TextIO = path.open("w", encoding="utf-8")
+        self.count = 0
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(entry, ensure_ascii=False))
+        self._handle.write("\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def build_conversation_artefacts(
+    plan: PlanLike,
+    template_engine: TemplateEngine,
+    config: Mapping[str, Any],
+    golden_turns: bool = True,
+) -> ConversationArtefacts:
+    """Render a plan's turns once and build its eval, golden and expectation entries.
+
+    With ``golden_turns=False`` assistant turns are not rendered and no
+    golden dataset entry is built.
+    """
+    plan = as_plan_record(plan)
+    turns = _build_full_turns(plan, template_engine) if golden_turns else _build_user_turns(plan, template_engine)
+    user_turns = [turn for turn in turns if turn["role"] == "user"] if golden_turns else turns
+    return ConversationArtefacts(
+        eval_entry=_build_conversation_payload(plan, user_turns),
+        golden_dataset_entry=_build_conversation_payload(plan, turns) if golden_turns else None,
+        golden_entry=build_golden_entry_payload(plan, config),
+    )
+
+
+def iter_conversation_artefacts(
+    plans: Iterable[PlanLike],
+    template_engine: TemplateEngine,
+    config: Mapping[str, Any],
+    golden_turns: bool = True,
+) -> Iterator[ConversationArtefacts]:
+    """Lazily build every artefact of each plan in one pass, one plan at a time."""
+    for plan in plans:
+        yield build_conversation_artefacts(plan, template_engine, config, golden_turns)
+
+
+def write_dataset_artefacts(
+    plans: Iterable[PlanLike],
+    template_engine: TemplateEngine,
+    config: Mapping[str, Any],
+    *,
+    eval_sink: EntrySink | None = None,
+    golden_dataset_sink: EntrySink | None = None,
+    golden_sink: EntrySink | None = None,
+) -> int:
+    """Walk ``plans`` once, appending each artefact to its sink; return the plan count.
+
+    Only one conversation is held in memory at a time. Assistant turns are
+    rendered only when ``golden_dataset_sink`` is given.
+    """
+    count = 0
+    artefacts = iter_conversation_artefacts(
+        plans, template_engine, config, golden_turns=golden_dataset_sink is not None
+    )
+    for conversation in artefacts:
+        if eval_sink is not None:
+            eval_sink.append(conversation.eval_entry)
+        if golden_dataset_sink is not None:
+            golden_dataset_sink.append(conversation.golden_dataset_entry)
+        if golden_sink is not None:
+            golden_sink.append(conversation.golden_entry)
+        count += 1
+    return count
+
 
 def build_eval_dataset_entries(
-    plans: Sequence[ConversationPlan],
+    plans: Iterable[PlanLike],
     template_engine: TemplateEngine,
 ) -> List[Dict[str, Any]]:
     """Build eval dataset entries with user-only turns."""
-    entries: List[Dict[str, Any]] = []
+    return list(iter_eval_dataset_entries(plans, template_engine))
+
+
+def iter_eval_dataset_entries(
+    plans: Iterable[PlanLike],
+    template_engine: TemplateEngine,
+) -> Iterator[Dict[str, Any]]:
+    """Lazily build eval dataset entries, one plan at a time."""
     for plan in plans:
-        turns = _build_user_turns(plan, template_engine)
-        entries.append(_build_conversation_payload(plan, turns))
-    return entries
+        yield build_eval_dataset_entry(plan, template_engine)
+
+
+def build_eval_dataset_entry(
+    plan: PlanLike,
+    template_engine: TemplateEngine,
+) -> Dict[str, Any]:
+    """Build a single eval dataset entry with user-only turns."""
+    plan = as_plan_record(plan)
+    turns = _build_user_turns(plan, template_engine)
+    return _build_conversation_payload(plan, turns)
 
 
 def build_golden_dataset_entries(
-    plans: Sequence[ConversationPlan],
+    plans: Iterable[PlanLike],
     template_engine: TemplateEngine,
 ) -> List[Dict[str, Any]]:
     """Build golden dataset entries with user + agent_expected turns."""
-    entries: List[Dict[str, Any]] = []
+    return list(iter_golden_dataset_entries(plans, template_engine))
+
+
+def iter_golden_dataset_entries(
+    plans: Iterable[PlanLike],
+    template_engine: TemplateEngine,
+) -> Iterator[Dict[str, Any]]:
+    """Lazily build golden dataset entries, one plan at a time."""
     for plan in plans:
-        turns = _build_full_turns(plan, template_engine)
-        entries.append(_build_conversation_payload(plan, turns))
-    return entries
+        plan = as_plan_record(plan)
+        yield _build_conversation_payload(plan, _build_full_turns(plan, template_engine))
 
 
 def write_eval_dataset_jsonl(
-    plans: Sequence[ConversationPlan],
+    plans: Iterable[PlanLike],
     template_engine: TemplateEngine,
     output_path: Path | str,
 ) -> None:
     """Write eval_dataset.jsonl to disk."""
-    entries = build_eval_dataset_entries(plans, template_engine)
-    _write_jsonl(entries, output_path)
+    _write_jsonl(iter_eval_dataset_entries(plans, template_engine), output_path)
 
 
 def write_golden_dataset_jsonl(
-    plans: Sequence[ConversationPlan],
+    plans: Iterable[PlanLike],
     template_engine: TemplateEngine,
     output_path: Path | str,
 ) -> None:
     """Write golden_dataset.jsonl to disk."""
-    entries = build_golden_dataset_entries(plans, template_engine)
-    _write_jsonl(entries, output_path)
+    _write_jsonl(iter_golden_dataset_entries(plans, template_engine), output_path)
+
+
+def write_dataset_jsonl(
+    plans: Iterable[PlanLike],
+    template_engine: TemplateEngine,
+    config: Mapping[str, Any],
+    output_dir: Path | str,
+) -> int:
+    """Write eval_dataset.jsonl, golden_dataset.jsonl and golden.jsonl in one pass."""
+    output_dir = Path(output_dir)
+    with (
+        JsonlSink(output_dir / "eval_dataset.jsonl") as eval_sink,
+        JsonlSink(output_dir / "golden_dataset.jsonl") as golden_dataset_sink,
+        JsonlSink(output_dir / "golden.jsonl") as golden_sink,
+    ):
+        return write_dataset_artefacts(
+            plans,
+            template_engine,
+            config,
+            eval_sink=eval_sink,
+            golden_dataset_sink=golden_dataset_sink,
+            golden_sink=golden_sink,
+        )
 
 
 def build_golden_dataset(
-    plans: Sequence[ConversationPlan],
+    plans: Sequence[PlanLike],
     template_engine: TemplateEngine,
     config: Mapping[str, Any],
     dataset_id: str = "",
     version: str = "1.0.0",
 ) -> GoldenDataset:
     """Build golden dataset with evaluation expectations."""
-    entries: List[GoldenEntry] = []
-    
-    for plan in plans:
-        # Determine which turn to evaluate (typically last assistant turn)
-        num_turns = len(plan.turn_plan)
-        eval_turn_index = num_turns - 1  # Last turn (0-indexed)
-        
-        # Get expected response variants based on policy_boundary
-        policy_boundary = plan.axes.get("policy_boundary", "within_policy")
-        expected_responses = _get_expected_responses(
-            plan.workflow,
-            policy_boundary,
-            config,
-        )
-        
-        # Determine outcome based on policy_boundary
-        decision = "DENY" if "outside" in policy_boundary else "ALLOW"
-        
-        entry = GoldenEntry(
-            conversation_id=plan.scenario_id,
-            turns=[
-                GoldenTurnExpectation(
-                    turn_index=eval_turn_index,
-                    expected={"variants": expected_responses},
-                )
-            ],
-            final_outcome={"decision": decision},
-            constraints={"respect_policy": True},
-        )
-        entries.append(entry)
-    
+    entries = [build_golden_entry(plan, config) for plan in plans]
+
     # Generate dataset_id if not provided
     if not dataset_id and plans:
         vertical = plans[0].vertical.value
@@ -103,6 +223,56 @@ def build_golden_dataset(
     )
 
 
+def build_golden_entry(
+    plan: PlanLike,
+    config: Mapping[str, Any],
+) -> GoldenEntry:
+    """Build the golden expectations for a single conversation."""
+    payload = build_golden_entry_payload(plan, config)
+    return GoldenEntry(
+        conversation_id=payload["conversation_id"],
+        turns=[GoldenTurnExpectation(**turn) for turn in payload["turns"]],
+        final_outcome=payload["final_outcome"],
+        constraints=payload["constraints"],
+    )
+
+
+def build_golden_entry_payload(
+    plan: PlanLike,
+    config: Mapping[str, Any],
+) -> Dict[str, Any]:
+    """Build a golden entry as plain JSON data, shaped like ``GoldenEntry.model_dump()``.
+
+    Used by the streaming writers so no pydantic model is built per conversation.
+    """
+    # Determine which turn to evaluate (typically last assistant turn)
+    num_turns = len(plan.turn_plan)
+    eval_turn_index = num_turns - 1  # Last turn (0-indexed)
+
+    # Get expected response variants based on policy_boundary
+    policy_boundary = plan.axes.get("policy_boundary", "within_policy")
+    expected_responses = _get_expected_responses(
+        plan.workflow,
+        policy_boundary,
+        config,
+    )
+
+    # Determine outcome based on policy_boundary
+    decision = "DENY" if "outside" in policy_boundary else "ALLOW"
+
+    return {
+        "conversation_id": plan.scenario_id,
+        "turns": [
+            {
+                "turn_index": eval_turn_index,
+                "expected": {"variants": list(expected_responses)},
+            }
+        ],
+        "final_outcome": {"decision": decision},
+        "constraints": {"respect_policy": True},
+    }
+
+
 def _get_expected_responses(
     workflow: str,
     policy_boundary: str,
@@ -127,13 +297,13 @@ def _get_expected_responses(
 
 
 def _build_user_turns(
-    plan: ConversationPlan,
+    plan: PlanRecord,
     template_engine: TemplateEngine,
 ) -> List[Dict[str, Any]]:
     """Render only user turns from the plan."""
     turns: List[Dict[str, Any]] = []
     for index, turn in enumerate(plan.turn_plan):
-        if turn.get("speaker") != "user":
+        if turn.speaker != "user":
             continue
         text = _render_turn_text(plan, turn, template_engine)
         turns.append(
@@ -146,13 +316,13 @@ def _build_user_turns(
 
 
 def _build_full_turns(
-    plan: ConversationPlan,
+    plan: PlanRecord,
     template_engine: TemplateEngine,
 ) -> List[Dict[str, Any]]:
     """Render user + agent_expected turns from the plan."""
     turns: List[Dict[str, Any]] = []
     for index, turn in enumerate(plan.turn_plan):
-        speaker = turn.get("speaker")
+        speaker = turn.speaker
         if speaker not in {"user", "agent", "assistant"}:
             continue
         text = _render_turn_text(plan, turn, template_engine)
@@ -174,26 +344,23 @@ def _build_full_turns(
 
 
 def _render_turn_text(
-    plan: ConversationPlan,
-    turn: Mapping[str, Any],
+    plan: PlanRecord,
+    turn: TurnRecord,
     template_engine: TemplateEngine,
 ) -> str:
     """Render text using templates unless explicit text is provided."""
-    if isinstance(turn.get("text"), str):
-        return turn["text"]
-
-    axes = dict(plan.axes)
-    if isinstance(turn.get("axes"), Mapping):
-        axes.update(turn["axes"])
+    if turn.text is not None:
+        return turn.text
 
-    behaviour = _coerce_behaviour(turn.get("behaviour"), plan.behaviours)
-    variables = turn.get("variables") if isinstance(turn.get("variables"), Mapping) else {}
+    axes = plan.axes if turn.axes is None else {**plan.axes, **turn.axes}
+    behaviour = _coerce_behaviour(turn.behaviour, plan.behaviours)
+    variables = turn.variables or {}
 
     return template_engine.realise_turn(
         vertical=plan.vertical,
         workflow=plan.workflow,
-        speaker=turn.get("speaker", "user"),
-        role=turn.get("role", ""),
+        speaker=turn.speaker or "user",
+        role=turn.role,
         behaviour=behaviour,
         axes=axes,
         variables=variables,
@@ -201,13 +368,15 @@ def _render_turn_text(
 
 
 def _build_conversation_payload(
-    plan: ConversationPlan,
+    plan: PlanRecord,
     turns: List[Dict[str, Any]],
 ) -> Dict[str, Any]:
     """Assemble the conversation payload for JSON output."""
     return {
         "conversation_id": plan.scenario_id,
         "metadata": {
+            "workflow": plan.workflow,
+            "behaviours": [_behaviour_value(behaviour) for behaviour in plan.behaviours],
             "domain_label": plan.domain_label,
             "behavior": plan.behavior_label,
             "axes": dict(plan.axes),
@@ -238,11 +407,8 @@ def _behaviour_value(behaviour: BehaviourFlag) -> str:
     return behaviour.value
 
 
-def _write_jsonl(entries: Sequence[Dict[str, Any]], output_path: Path | str) -> None:
+def _write_jsonl(entries: Iterable[Dict[str, Any]], output_path: Path | str) -> None:
     """Write newline-delimited JSON to disk."""
-    path = Path(output_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
+    with JsonlSink(output_path) as sink:
         for entry in entries:
-            handle.write(json.dumps(entry, ensure_ascii=False))
-            handle.write("\n")
+            sink.append(entry)
@@ -1,16 +1,50 @@
 from __future__ import annotations
 
 import hashlib
+import multiprocessing
 import random
-from itertools import product
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
 from string import Formatter
-from typing import Any, Dict, Iterable, Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, Mapping, NamedTuple, Sequence
 
+from . import config_loader
 from .config_loader import load_vertical_config
-from .models import BehaviourFlag, ConversationPlan, GenerationRequest
+from .coverage import MixedRadixProduct, build_covering_array, coverage_report
+from .cpus import available_cpus
+from .models import BehaviourFlag, GenerationRequest
+from .plans import PlanRecord, TurnRecord, freeze_axes
 from .template_engine import TemplateEngine
 
+# Conversations per process-pool task in parallel generation.
+PLAN_SHARD_SIZE = 1000
+# Smallest run worth a process pool. A plan costs ~35us to build serially,
+# but the parent still spends ~25us unpickling each one a worker returns, so
+# at best the pool saves ~10us per plan against ~0.5s of spawning and
+# importing per worker: it breaks even around 50k plans with idle cores and
+# never on a single core. Smaller runs (most requests) stay serial.
+PARALLEL_MIN_CONVERSATIONS = 100_000
+# Frozen axes mappings kept for reuse; plans of the same combination share one.
+_AXES_CACHE_SIZE = 4096
+
+_AGENT_RESPONSES = (
+    "I can help you with that.",
+    "Let me check that for you.",
+    "I've processed your request.",
+    "Thank you for providing that information.",
+    "I understand your concern.",
+    "I'm looking into that now.",
+    "That's a great question.",
+    "I can certainly assist you.",
+)
+# Assistant turns are identical across plans, so every plan shares these.
+_AGENT_TURNS = tuple(
+    TurnRecord(speaker="assistant", role="agent", text=text) for text in _AGENT_RESPONSES
+)
+
 
 class _SafeDict(dict[str, Any]):
     def __missing__(self, key: str) -> str:
@@ -166,6 +200,17 @@ def _render_turn_text(
     if candidate is None:
         return f"{workflow} request from user."
 
+    if candidate.compiled is not None:
+        base_context = {
+            "vertical": vertical,
+            "workflow": workflow,
+            "speaker": "user",
+            "role": "customer",
+            "behaviour": behaviour,
+        }
+        # Unknown placeholders render as their own name, as below.
+        return candidate.compiled.render((variables, axes, base_context), str)
+
     render_context: Dict[str, Any] = {
         "vertical": vertical,
         "workflow": workflow,
@@ -192,21 +237,10 @@ def _build_multi_turn_plan(
     template_engine: TemplateEngine,
     variables: Mapping[str, Any],
     num_turns: int = 3,
-) -> list[Dict[str, Any]]:
+) -> tuple[TurnRecord, ...]:
     """Build a multi-turn conversation plan with multiple user turns and agent responses."""
-    turn_plan: list[Dict[str, Any]] = []
-    
-    agent_responses = [
-        "I can help you with that.",
-        "Let me check that for you.",
-        "I've processed your request.",
-        "Thank you for providing that information.",
-        "I understand your concern.",
-        "I'm looking into that now.",
-        "That's a great question.",
-        "I can certainly assist you.",
-    ]
-    
+    turn_plan: list[TurnRecord] = []
+
     # Generate turns in alternating user-agent pattern
     for turn_index in range(num_turns):
         if turn_index % 2 == 0:
@@ -219,118 +253,420 @@ def _build_multi_turn_plan(
                 axes=axes,
                 variables=variables,
             )
-            turn_plan.append({
-                "speaker": "user",
-                "role": "customer",
-                "behaviour": behaviour_value,
-                "axes": dict(axes),
-                "text": text,
-            })
+            # User turns inherit the plan's axes rather than copying them.
+            turn_plan.append(
+                TurnRecord(speaker="user", role="customer", text=text, behaviour=behaviour_value)
+            )
         else:
             # Assistant turn with expected response
             response_idx = turn_index // 2
-            response_text = agent_responses[response_idx % len(agent_responses)]
-            turn_plan.append({
-                "speaker": "assistant",
-                "role": "agent",
-                "text": response_text,
-            })
-    
-    return turn_plan
-
-
-def build_conversation_plans(request: GenerationRequest) -> tuple[list[ConversationPlan], dict]:
-    vertical_key = request.vertical.value
+            turn_plan.append(_AGENT_TURNS[response_idx % len(_AGENT_TURNS)])
+
+    return tuple(turn_plan)
+
+
+@dataclass(frozen=True)
+class _WorkflowMetadata:
+    domain_label: str
+    behavior_label: str
+    policy_excerpt: str
+
+
+@dataclass(frozen=True)
+class _ScenarioMetadata:
+    scenario_id: str
+    facts_bullets: str
+    short_description: str
+
+
+class _ScenarioCache:
+    """Per-(workflow, axes) metadata shared by every behaviour and sample.
+
+    Plans are built workflow by workflow, so only the current workflow's
+    entries are kept; memory is bounded by the number of axes combinations.
+    """
+
+    def __init__(self) -> None:
+        self._workflow: str | None = None
+        self._entries: Dict[int, _ScenarioMetadata] = {}
+
+    def get(
+        self,
+        workflow: str,
+        combo_index: int,
+        axes: Mapping[str, str],
+        workflow_metadata: _WorkflowMetadata,
+        config: Mapping[str, Any],
+    ) -> _ScenarioMetadata:
+        if workflow != self._workflow:
+            self._workflow = workflow
+            self._entries = {}
+        metadata = self._entries.get(combo_index)
+        if metadata is None:
+            metadata = _ScenarioMetadata(
+                scenario_id=_generate_conversation_id(
+                    domain_label=workflow_metadata.domain_label,
+                    behavior_label=workflow_metadata.behavior_label,
+                    axes=axes,
+                    workflow=workflow,
+                ),
+                facts_bullets=_generate_facts_bullets(workflow, axes, config),
+                short_description=_generate_short_description(
+                    workflow_metadata.behavior_label, axes
+                ),
+            )
+            self._entries[combo_index] = metadata
+        return metadata
+
+
+@dataclass(frozen=True)
+class _GenerationContext:
+    """Everything derived from a request that every plan in the run shares."""
+
+    request: GenerationRequest
+    config: Mapping[str, Any]
+    behaviours: list[BehaviourFlag]
+    behaviour_iter: list[BehaviourFlag | None]
+    axes_options: Dict[str, list[str]]
+    axes_keys: tuple[str, ...]
+    # Value tuples in ``axes_keys`` order: a covering array or the lazily
+    # indexed full product.
+    axes_combinations: Sequence[tuple[str, ...]]
+    coverage: Dict[str, Any] | None
+    # Sampled slot indices (see ``_sample_slots``); None generates every slot.
+    slots: list[int] | None
+    template_engine: TemplateEngine
+    workflow_metadata: Dict[str, _WorkflowMetadata]
+    variables: Dict[str, str]
+    scenario_cache: _ScenarioCache
+    axes_cache: Dict[int, Mapping[str, str]]
+
+    @property
+    def slots_per_stratum(self) -> int:
+        """Slots of one workflow x behaviour pair: combinations x samples."""
+        return len(self.axes_combinations) * self.request.num_samples_per_combo
+
+    @property
+    def population(self) -> int:
+        return len(self.request.workflows) * len(self.behaviour_iter) * self.slots_per_stratum
+
+    @property
+    def total_conversations(self) -> int:
+        return len(self.slots) if self.slots is not None else self.population
+
+    def axes_at(self, combo_index: int) -> Mapping[str, str]:
+        axes = self.axes_cache.get(combo_index)
+        if axes is None:
+            if len(self.axes_cache) >= _AXES_CACHE_SIZE:
+                self.axes_cache.clear()
+            combo = self.axes_combinations[combo_index]
+            axes = freeze_axes(dict(zip(self.axes_keys, combo, strict=False)))
+            self.axes_cache[combo_index] = axes
+        return axes
+
+
+class _PlanLayout(NamedTuple):
+    """The run's combinations and sampled slots, built once and shipped to pool workers."""
+
+    axes_combinations: Sequence[tuple[str, ...]]
+    coverage: Dict[str, Any] | None
+    slots: list[int] | None
+
+
+def _prepare_generation(
+    request: GenerationRequest,
+    layout: _PlanLayout | None = None,
+) -> _GenerationContext:
     config = load_vertical_config(request.vertical)
 
     behaviours = _coerce_behaviour_list(request.behaviours, config.get("behaviours", []))
     axes_options = _normalize_axes_options(request.axes, config.get("axes", {}))
 
-    if axes_options:
-        axes_keys = list(axes_options.keys())
-        axes_combinations = [
-            dict(zip(axes_keys, combo, strict=False))
-            for combo in product(*(axes_options[key] for key in axes_keys))
-        ]
-    else:
-        axes_combinations = [{}]
+    axes_keys = tuple(axes_options)
+    behaviour_iter = list(behaviours) if behaviours else [None]
+    if layout is None:
+        layout = _plan_layout(request, [axes_options[key] for key in axes_keys], len(behaviour_iter))
+    axes_combinations, coverage, slots = layout
+
+    vertical_key = request.vertical.value
+    workflow_metadata = {
+        workflow: _WorkflowMetadata(
+            domain_label=_get_domain_label(vertical_key, workflow, config),
+            behavior_label=_get_behavior_label(workflow, config),
+            policy_excerpt=_get_policy_excerpt(workflow, config),
+        )
+        for workflow in request.workflows
+    }
+
+    return _GenerationContext(
+        request=request,
+        config=config,
+        behaviours=behaviours,
+        behaviour_iter=behaviour_iter,
+        axes_options=axes_options,
+        axes_keys=axes_keys,
+        axes_combinations=axes_combinations,
+        coverage=coverage,
+        slots=slots,
+        template_engine=TemplateEngine.from_vertical(request.vertical),
+        workflow_metadata=workflow_metadata,
+        variables={
+            "channel": request.channel,
+            "language_locale": request.language_locale,
+            "customer_name": "Customer",
+        },
+        scenario_cache=_ScenarioCache(),
+        axes_cache={},
+    )
+
+
+def _plan_layout(
+    request: GenerationRequest,
+    options: Sequence[Sequence[str]],
+    behaviour_count: int,
+) -> _PlanLayout:
+    strength = request.coverage_strength
+    if strength is not None and strength > len(options):
+        raise ValueError(f"coverage_strength {strength} exceeds the number of axes ({len(options)})")
+    axes_combinations, coverage = _axes_combinations(options, strength)
+    slots = _sample_slots(
+        request,
+        strata=len(request.workflows) * behaviour_count,
+        per_stratum=len(axes_combinations) * request.num_samples_per_combo,
+    )
+    return _PlanLayout(axes_combinations, coverage, slots)
+
+
+def _axes_combinations(
+    options: Sequence[Sequence[str]],
+    strength: int | None,
+) -> tuple[Sequence[tuple[str, ...]], Dict[str, Any] | None]:
+    """Axis value combinations to generate, plus a coverage report when sampled.
+
+    Without a ``strength`` every combination is used, addressed by index
+    rather than enumerated. With one, the combinations come from a covering
+    array in which every ``strength``-way combination of axis values appears
+    at least once.
+    """
+    if strength is None or not options or not all(options):
+        return MixedRadixProduct(options), None
+    sizes = [len(values) for values in options]
+    rows = build_covering_array(sizes, strength)
+    combinations = [
+        tuple(values[index] for values, index in zip(options, row)) for row in rows
+    ]
+    return combinations, coverage_report(rows, sizes, strength)
+
+
+def _sample_slots(request: GenerationRequest, strata: int, per_stratum: int) -> list[int] | None:
+    """Draw ``max_conversations`` slot indices when the run would exceed it.
+
+    Sampling is stratified: every workflow x behaviour pair gets an equal
+    share (the remainder goes to randomly chosen pairs), drawn without
+    replacement from its combination x sample slots. ``random.sample`` over
+    a ``range`` costs time proportional to the draws, not the population.
+    Seeded by ``random_seed``; indices are returned in enumeration order.
+    """
+    budget = request.max_conversations
+    if budget is None or budget >= strata * per_stratum:
+        return None
+    rng = random.Random(f"{request.random_seed or 0}:max_conversations")
+    quota, remainder = divmod(budget, strata)
+    larger = set(rng.sample(range(strata), remainder))
+    slots: list[int] = []
+    for stratum in range(strata):
+        draws = rng.sample(range(per_stratum), quota + (stratum in larger))
+        slots.extend(stratum * per_stratum + draw for draw in sorted(draws))
+    return slots
+
+
+def _resolve_slot(
+    context: _GenerationContext,
+    index: int,
+) -> tuple[str, BehaviourFlag | None, int]:
+    """Map a conversation's position in the run onto (workflow, behaviour, combination index).
+
+    Slots enumerate workflow x behaviour x axes combination x sample in the
+    same order as the nested loops of the serial generator; with a
+    ``max_conversations`` sample, positions are first mapped to their slot.
+    """
+    if context.slots is not None:
+        index = context.slots[index]
+    index //= context.request.num_samples_per_combo
+    index, combo_index = divmod(index, len(context.axes_combinations))
+    workflow_index, behaviour_index = divmod(index, len(context.behaviour_iter))
+    return (
+        context.request.workflows[workflow_index],
+        context.behaviour_iter[behaviour_index],
+        combo_index,
+    )
+
+
+def _build_plan(
+    context: _GenerationContext,
+    workflow: str,
+    behaviour: BehaviourFlag | None,
+    combo_index: int,
+    rng: random.Random,
+) -> PlanRecord:
+    request = context.request
+    axes = context.axes_at(combo_index)
+    workflow_metadata = context.workflow_metadata[workflow]
+    scenario = context.scenario_cache.get(
+        workflow, combo_index, axes, workflow_metadata, context.config
+    )
 
+    behaviour_value = behaviour.value if isinstance(behaviour, BehaviourFlag) else None
+    turn_plan = _build_multi_turn_plan(
+        vertical_key=request.vertical.value,
+        workflow=workflow,
+        behaviour_value=behaviour_value,
+        axes=axes,
+        template_engine=context.template_engine,
+        variables=context.variables,
+        num_turns=rng.randint(request.min_turns, request.max_turns),
+    )
+
+    return PlanRecord(
+        vertical=request.vertical,
+        workflow=workflow,
+        scenario_id=scenario.scenario_id,
+        behaviours=(behaviour,) if isinstance(behaviour, BehaviourFlag) else (),
+        axes=axes,
+        turn_plan=turn_plan,
+        domain_label=workflow_metadata.domain_label,
+        behavior_label=workflow_metadata.behavior_label,
+        policy_excerpt=workflow_metadata.policy_excerpt,
+        facts_bullets=scenario.facts_bullets,
+        short_description=scenario.short_description,
+    )
+
+
+def _iter_plan_range(
+    context: _GenerationContext,
+    start: int,
+    stop: int,
+    rng: random.Random,
+) -> Iterator[PlanRecord]:
+    for index in range(start, stop):
+        workflow, behaviour, combo_index = _resolve_slot(context, index)
+        yield _build_plan(context, workflow, behaviour, combo_index, rng)
+
+
+def _advance_rng(rng: random.Random, request: GenerationRequest, draws: int) -> None:
+    """Consume the draws a shard of ``draws`` plans makes from the shared stream."""
+    for _ in range(draws):
+        rng.randint(request.min_turns, request.max_turns)
+
+
+_worker_context: _GenerationContext | None = None
+
+
+def _init_plan_worker(config_dir: str, request: GenerationRequest, layout: _PlanLayout) -> None:
+    # The layout (covering array, sampled slots) comes from the parent, so
+    # workers never rebuild it.
+    global _worker_context
+    config_loader.CONFIG_DIR = Path(config_dir)
+    _worker_context = _prepare_generation(request, layout)
+
+
+def _build_plan_shard(start: int, stop: int, rng_state: tuple) -> list[PlanRecord]:
+    """Process-pool entry point: build plans ``start``..``stop`` of a run."""
+    if _worker_context is None:
+        raise RuntimeError("plan worker was not initialised")
+    rng = random.Random()
+    rng.setstate(rng_state)
+    return list(_iter_plan_range(_worker_context, start, stop, rng))
+
+
+def _iter_plans_parallel(
+    context: _GenerationContext,
+    workers: int,
+    shard_size: int,
+) -> Iterator[PlanRecord]:
+    """Build plans across a process pool, yielding them in serial order.
+
+    Each shard is seeded with the state the serial generator's RNG would have
+    at the shard's first plan, so output is identical for any worker count.
+    At most ``2 * workers`` shards are in flight to keep memory bounded.
+    """
+    request = context.request
+    total = context.total_conversations
     rng = random.Random(request.random_seed or 0)
-    template_engine = TemplateEngine.from_vertical(request.vertical)
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_plan_worker,
+        initargs=(
+            str(config_loader.CONFIG_DIR),
+            request,
+            _PlanLayout(context.axes_combinations, context.coverage, context.slots),
+        ),
+    )
+    pending: deque[Future[list[PlanRecord]]] = deque()
+    try:
+        for start in range(0, total, shard_size):
+            stop = min(start + shard_size, total)
+            pending.append(
+                executor.submit(_build_plan_shard, start, stop, rng.getstate())
+            )
+            _advance_rng(rng, request, stop - start)
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    plans: list[ConversationPlan] = []
-    counter = 0
 
-    for workflow in request.workflows:
-        if behaviours:
-            behaviour_iter = behaviours
-        else:
-            behaviour_iter = [None]
-
-        for behaviour in behaviour_iter:
-            for axes in axes_combinations:
-                for _ in range(request.num_samples_per_combo):
-                    counter += 1
-
-                    # Get metadata from config
-                    domain_label = _get_domain_label(vertical_key, workflow, config)
-                    behavior_label = _get_behavior_label(workflow, config)
-                    policy_excerpt = _get_policy_excerpt(workflow, config)
-                    facts_bullets = _generate_facts_bullets(workflow, axes, config)
-                    short_description = _generate_short_description(behavior_label, axes)
-
-                    # Generate new conversation ID format
-                    scenario_id = _generate_conversation_id(
-                        domain_label=domain_label,
-                        behavior_label=behavior_label,
-                        axes=axes,
-                        workflow=workflow,
-                    )
-
-                    behaviour_value = behaviour.value if isinstance(behaviour, BehaviourFlag) else None
-                    variables = {
-                        "channel": request.channel,
-                        "language_locale": request.language_locale,
-                        "customer_name": "Customer",
-                    }
-
-                    turn_plan = _build_multi_turn_plan(
-                        vertical_key=vertical_key,
-                        workflow=workflow,
-                        behaviour_value=behaviour_value,
-                        axes=axes,
-                        template_engine=template_engine,
-                        variables=variables,
-                        num_turns=rng.randint(request.min_turns, request.max_turns),
-                    )
-
-                    plans.append(
-                        ConversationPlan(
-                            vertical=request.vertical,
-                            workflow=workflow,
-                            scenario_id=scenario_id,
-                            behaviours=[behaviour] if isinstance(behaviour, BehaviourFlag) else [],
-                            axes=axes,
-                            turn_plan=turn_plan,
-                            domain_label=domain_label,
-                            behavior_label=behavior_label,
-                            policy_excerpt=policy_excerpt,
-                            facts_bullets=facts_bullets,
-                            short_description=short_description,
-                        )
-                    )
+def build_conversation_plans(
+    request: GenerationRequest,
+    *,
+    workers: int | None = None,
+    shard_size: int = PLAN_SHARD_SIZE,
+) -> tuple[Iterator[PlanRecord], dict]:
+    """Return a lazy iterator over conversation plans and the run manifest.
+
+    Plans are produced on demand so callers can stream them straight into
+    their output without holding the whole dataset in memory. The manifest's
+    ``total_conversations`` is computed from the selection sizes upfront.
+
+    With more than one worker (``workers`` or ``request.workers``, capped at
+    the available CPUs) and at least ``PARALLEL_MIN_CONVERSATIONS`` plans,
+    they are built in a process pool in shards of ``shard_size``; the output
+    is the same as the serial path.
+    """
+    context = _prepare_generation(request)
+    total_conversations = context.total_conversations
+    workers = workers or request.workers
 
     manifest = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
-        "vertical": vertical_key,
+        "vertical": request.vertical.value,
         "workflows": list(request.workflows),
-        "behaviours": [b.value for b in behaviours],
-        "axes": axes_options,
+        "behaviours": [b.value for b in context.behaviours],
+        "axes": context.axes_options,
         "num_samples_per_combo": request.num_samples_per_combo,
         "language_locale": request.language_locale,
         "channel": request.channel,
         "random_seed": request.random_seed,
-        "total_conversations": len(plans),
+        "total_conversations": total_conversations,
     }
-
+    if context.slots is not None:
+        manifest["max_conversations"] = request.max_conversations
+        manifest["sampling"] = {
+            "method": "stratified",
+            "strata": len(request.workflows) * len(context.behaviour_iter),
+            "population": context.population,
+        }
+    if context.coverage is not None:
+        manifest["coverage_strength"] = request.coverage_strength
+        manifest["coverage"] = context.coverage
+
+    workers = min(workers, available_cpus())
+    if workers > 1 and total_conversations >= max(PARALLEL_MIN_CONVERSATIONS, shard_size + 1):
+        plans = _iter_plans_parallel(context, workers, shard_size)
+    else:
+        rng = random.Random(request.random_seed or 0)
+        plans = _iter_plan_range(context, 0, total_conversations, rng)
     return plans, manifest
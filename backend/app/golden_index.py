@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+from dataclasses import dataclass, field
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+
+from .config_loader import BASE_DIR
+from .json_stream import iter_json_array
+from .jsonl import iter_jsonl
+from .score_summary import SummaryLabels
+from .scoring import GoldenExpectations, TurnExpectation
+from .serialization import get_serializer
+from .similarity import VariantSimilarity
+
+GOLDEN_INDEX_FORMAT_VERSION = 6
+# Override with EVAL_GOLDEN_CACHE_DIR; indexes are disposable and rebuilt on demand.
+DEFAULT_CACHE_DIR = BASE_DIR / ".cache" / "golden"
+# Override with EVAL_GOLDEN_CACHE_MAX_BYTES. Least recently used indexes are
+# evicted past this size, except those used within the grace period, which
+# may still be being scored.
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+EVICTION_GRACE_SECONDS = 15 * 60
+
+# Entry count and offset of the trailer.
+_PREFIX = struct.Struct("<QQ")
+_HASH_BLOCK_SIZE = 1024 * 1024
+_SNIFF_SIZE = 64 * 1024
+_MISSING = object()
+
+
+def golden_cache_dir() -> Path:
+    return Path(os.environ.get("EVAL_GOLDEN_CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+def golden_cache_max_bytes() -> int:
+    return int(os.environ.get("EVAL_GOLDEN_CACHE_MAX_BYTES") or DEFAULT_CACHE_MAX_BYTES)
+
+
+def hash_golden_file(file: BinaryIO) -> str:
+    """SHA-256 of the file's content, read in blocks from the start."""
+    digest = hashlib.sha256()
+    _update_digest(digest, file)
+    return digest.hexdigest()
+
+
+def _update_digest(digest: "hashlib._Hash", file: BinaryIO) -> None:
+    file.seek(0)
+    for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    file.seek(0)
+
+
+def detect_record_format(
+    file: BinaryIO,
+    filename: str | None = None,
+    items_key: str = "entries",
+) -> str:
+    """Tell a JSONL file (``"jsonl"``) from a generated JSON document (``"document"``).
+
+    The file extension decides when present; otherwise the first line is
+    sniffed. A pretty-printed document starts with a lone ``{`` that does not
+    parse on its own, and a compact one is a single object holding the
+    ``items_key`` array.
+    """
+    suffix = Path(filename).suffix.lower() if filename else ""
+    if suffix == ".jsonl":
+        return "jsonl"
+    if suffix == ".json":
+        return "document"
+    file.seek(0)
+    head = file.read(_SNIFF_SIZE)
+    file.seek(0)
+    first_line = next((line for line in head.splitlines() if line.strip()), b"")
+    try:
+        first = json.loads(first_line)
+    except ValueError:
+        return "document"
+    if isinstance(first, dict) and isinstance(first.get(items_key), list):
+        return "document"
+    return "jsonl"
+
+
+def iter_records(
+    file: BinaryIO,
+    items_key: str,
+    record_format: str | None = None,
+    filename: str | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream the objects of a JSONL file or of a document's ``items_key`` array."""
+    record_format = record_format or detect_record_format(file, filename, items_key)
+    if record_format == "jsonl":
+        yield from iter_jsonl(file)
+        return
+    if record_format != "document":
+        raise ValueError(f"Unknown record format: {record_format}")
+    for item in iter_json_array(file, items_key):
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid {items_key} item; expected object")
+        yield item
+
+
+def iter_golden_entries(
+    golden_file: BinaryIO,
+    dataset_file: BinaryIO | None = None,
+    *,
+    golden_format: str | None = None,
+    golden_filename: str | None = None,
+    dataset_filename: str | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream golden entries from golden JSONL or a generated ``<id>.golden.json``.
+
+    With the matching eval dataset (``<id>.dataset.json`` or JSONL), both
+    files are read in lockstep and each conversation's ``metadata`` (behaviour,
+    axes, ...) is attached to its golden entry for the score summary.
+    """
+    entries = iter_records(golden_file, "entries", golden_format, golden_filename)
+    if dataset_file is None:
+        yield from entries
+        return
+
+    conversations = iter_records(dataset_file, "conversations", filename=dataset_filename)
+    for entry, conversation in zip_longest(entries, conversations, fillvalue=_MISSING):
+        if entry is _MISSING or conversation is _MISSING:
+            raise ValueError("Golden and eval dataset files hold different numbers of conversations")
+        if entry.get("conversation_id") != conversation.get("conversation_id"):
+            raise ValueError(
+                "Golden and eval dataset files are out of step at conversation "
+                f"{entry.get('conversation_id')!r}"
+            )
+        metadata = conversation.get("metadata")
+        if isinstance(metadata, dict) and "metadata" not in entry:
+            entry = {**entry, "metadata": metadata}
+        yield entry
+
+
+@dataclass(frozen=True)
+class GoldenIndex:
+    """A compiled golden dataset stored on disk.
+
+    The file holds a fixed-width entry count and trailer offset, one JSON
+    line per ``GoldenExpectations`` (ids, normalised needles and labels) and
+    a JSON trailer with the header and the turn variants the
+    ``VariantSimilarity`` model is fitted on. It is plain data, so a file
+    planted in a shared cache directory cannot run code when loaded.
+    Iterating reads one line at a time, so the dataset is never held in
+    memory as a whole; matchers are rebuilt per entry, and needle sets shared
+    across entries come from the ``compile_matcher`` cache.
+    """
+
+    path: Path
+    source_hash: str
+    count: int
+    similarity: VariantSimilarity | None = field(default=None, compare=False, repr=False)
+    similarity_offset: int = 0
+
+    def __iter__(self) -> Iterator[GoldenExpectations]:
+        with self.path.open("rb") as handle:
+            handle.seek(_PREFIX.size)
+            while handle.tell() < self.similarity_offset:
+                yield _entry_from_record(json.loads(handle.readline())).compiled()
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def compile_golden_index(
+    file: BinaryIO,
+    cache_dir: Path | str | None = None,
+    *,
+    dataset_file: BinaryIO | None = None,
+    filename: str | None = None,
+    dataset_filename: str | None = None,
+) -> GoldenIndex:
+    """Return the cached index for a golden dataset, compiling it on a miss.
+
+    ``file`` is golden JSONL or a generated golden.json (see
+    ``iter_golden_entries``). The cache key is the content hash of the
+    input(s), so a repeated upload of the same golden dataset skips parsing
+    entirely. Raises ``ValueError`` on malformed input.
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else golden_cache_dir()
+    golden_format = detect_record_format(file, filename, "entries")
+    digest = hashlib.sha256(golden_format.encode("utf-8") + b"\0")
+    _update_digest(digest, file)
+    if dataset_file is not None:
+        digest.update(b"\0dataset\0")
+        _update_digest(digest, dataset_file)
+    source_hash = digest.hexdigest()
+    path = cache_dir / f"{source_hash}.v{GOLDEN_INDEX_FORMAT_VERSION}.idx"
+
+    cached = load_golden_index(path, source_hash)
+    if cached is not None:
+        try:
+            os.utime(path)  # Mark as recently used for eviction.
+        except OSError:
+            pass
+        return cached
+
+    # Private to this user: indexes are trusted as the scorer's expectations.
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    serializer = get_serializer(compact=True)
+    handle, temp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as output:
+            # The entry count and trailer offset are patched into the
+            # fixed-width prefix once the entries have been streamed out.
+            output.write(_PREFIX.pack(0, 0))
+            goldens = iter_golden_entries(
+                file,
+                dataset_file,
+                golden_format=golden_format,
+                dataset_filename=dataset_filename,
+            )
+            count = 0
+            # Distinct turn variants, for the similarity model fitted at the end.
+            variants: Dict[str, None] = {}
+            for golden in goldens:
+                entry = GoldenExpectations.from_golden(golden)
+                count += 1
+                for turn in entry.turns:
+                    variants.update(dict.fromkeys(turn.variants))
+                output.write(serializer.dumps(_entry_record(entry)) + b"\n")
+            similarity = VariantSimilarity(variants) if variants else None
+            similarity_offset = output.tell()
+            output.write(serializer.dumps(_trailer(source_hash, similarity)))
+            output.seek(0)
+            output.write(_PREFIX.pack(count, similarity_offset))
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    evict_golden_cache(cache_dir, keep=path)
+    return GoldenIndex(
+        path=path,
+        source_hash=source_hash,
+        count=count,
+        similarity=similarity,
+        similarity_offset=similarity_offset,
+    )
+
+
+def load_golden_index(path: Path | str, source_hash: str | None = None) -> GoldenIndex | None:
+    """Open a compiled index if it is readable and current, else return None.
+
+    Any failure to read or validate the trailer counts as a miss, so a
+    truncated or corrupt file is recompiled rather than surfacing. The
+    trailer sits at the end of the file, so truncation is always detected.
+    Files owned by another user are ignored.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as handle:
+            stat = os.fstat(handle.fileno())
+            if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+                return None
+            count, similarity_offset = _PREFIX.unpack(handle.read(_PREFIX.size))
+            if not _PREFIX.size <= similarity_offset < stat.st_size:
+                return None
+            handle.seek(similarity_offset)
+            header = json.loads(handle.read())
+            if not _is_current(header, source_hash):
+                return None
+            similarity = _similarity_from_trailer(header["similarity"])
+    except Exception:
+        return None
+    return GoldenIndex(
+        path=path,
+        source_hash=header["source_hash"],
+        count=count,
+        similarity=similarity,
+        similarity_offset=similarity_offset,
+    )
+
+
+def evict_golden_cache(
+    cache_dir: Path | str | None = None,
+    max_bytes: int | None = None,
+    keep: Path | None = None,
+) -> List[Path]:
+    """Delete least recently used indexes until the cache fits ``max_bytes``.
+
+    Indexes of other format versions and leftover temp files go first.
+    ``keep`` and anything used within ``EVICTION_GRACE_SECONDS`` are never
+    deleted. Returns the deleted paths.
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else golden_cache_dir()
+    max_bytes = golden_cache_max_bytes() if max_bytes is None else max_bytes
+    current_suffix = f".v{GOLDEN_INDEX_FORMAT_VERSION}.idx"
+    candidates: List[Tuple[bool, float, int, Path]] = []
+    try:
+        paths = [path for path in cache_dir.iterdir() if path.suffix in {".idx", ".tmp"}]
+    except FileNotFoundError:
+        return []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        candidates.append((path.name.endswith(current_suffix), stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, _, size, _ in candidates)
+    cutoff = time.time() - EVICTION_GRACE_SECONDS
+    evicted: List[Path] = []
+    for current, mtime, size, path in sorted(candidates):
+        if total <= max_bytes:
+            break
+        if path == keep or (mtime > cutoff and (current or path.suffix == ".tmp")):
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        evicted.append(path)
+    return evicted
+
+
+def _is_current(header: Any, source_hash: str | None) -> bool:
+    if not isinstance(header, dict) or not isinstance(header.get("source_hash"), str):
+        return False
+    if header.get("format_version") != GOLDEN_INDEX_FORMAT_VERSION:
+        return False
+    return source_hash is None or header["source_hash"] == source_hash
+
+
+def _trailer(source_hash: str, similarity: VariantSimilarity | None) -> Dict[str, Any]:
+    return {
+        "format_version": GOLDEN_INDEX_FORMAT_VERSION,
+        "source_hash": source_hash,
+        "similarity": (
+            None
+            if similarity is None
+            else {"variants": list(similarity.variants), "threshold": similarity.threshold}
+        ),
+    }
+
+
+def _similarity_from_trailer(payload: Any) -> VariantSimilarity | None:
+    if payload is None:
+        return None
+    variants, threshold = payload["variants"], payload["threshold"]
+    if not all(isinstance(variant, str) for variant in variants):
+        raise ValueError("Similarity variants must be strings")
+    return VariantSimilarity(variants, threshold=float(threshold))
+
+
+def _entry_record(entry: GoldenExpectations) -> Dict[str, Any]:
+    labels = entry.labels
+    return {
+        "conversation_id": entry.conversation_id,
+        "actions": entry.actions,
+        "facts": entry.facts,
+        "disallowed": entry.disallowed,
+        "turns": [
+            {
+                "turn_index": turn.turn_index,
+                "variants": turn.variants,
+                "actions": turn.actions,
+                "facts": turn.facts,
+                "disallowed": turn.disallowed,
+            }
+            for turn in entry.turns
+        ],
+        "labels": {"workflow": labels.workflow, "behaviours": labels.behaviours, "axes": labels.axes},
+    }
+
+
+def _entry_from_record(record: Dict[str, Any]) -> GoldenExpectations:
+    labels = record["labels"]
+    return GoldenExpectations(
+        conversation_id=record["conversation_id"],
+        actions=tuple(record["actions"]),
+        facts=_pairs(record["facts"]),
+        disallowed=tuple(record["disallowed"]),
+        turns=tuple(
+            TurnExpectation(
+                turn_index=turn["turn_index"],
+                variants=tuple(turn["variants"]),
+                actions=tuple(turn["actions"]),
+                facts=_pairs(turn["facts"]),
+                disallowed=tuple(turn["disallowed"]),
+            )
+            for turn in record["turns"]
+        ),
+        labels=SummaryLabels(
+            workflow=labels["workflow"],
+            behaviours=tuple(labels["behaviours"]),
+            axes=_pairs(labels["axes"]),
+        ),
+    )
+
+
+def _pairs(items: List[List[str]]) -> Tuple[Tuple[str, str], ...]:
+    return tuple((key, value) for key, value in items)
@@ -0,0 +1,610 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple, TypeVar
+
+from .archive import ArchiveEntry, stream_zip
+from .config_loader import BASE_DIR
+from .golden_index import compile_golden_index
+from .score_summary import ScoreSummary
+from .scoring import index_model_outputs, iter_scored_conversations
+
+logger = logging.getLogger("eval_dataset_generator")
+
+# Override with EVAL_JOBS_DIR. Each job keeps its inputs, results and
+# checkpoint in its own directory so it can be resumed after a restart.
+DEFAULT_JOBS_DIR = BASE_DIR / ".cache" / "jobs"
+# A checkpoint is written after this many results or seconds, whichever comes first.
+CHECKPOINT_INTERVAL = 1000
+CHECKPOINT_SECONDS = 5.0
+
+JOB_FILE = "job.json"
+CHECKPOINT_FILE = "checkpoint.json"
+RESULTS_FILE = "results.jsonl"
+SUMMARY_FILE = "summary.json"
+CANCEL_FILE = "cancel"
+_MODEL_OUTPUTS_FILE = "model_outputs.jsonl"
+_GENERATION_DIR = "generation"
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+_INCOMPLETE = {"queued", "running"}
+# How often a running generation job publishes progress and checks for cancellation.
+PROGRESS_SECONDS = 0.5
+# Override with EVAL_JOB_RETENTION_SECONDS and EVAL_JOBS_MAX_BYTES. Finished
+# jobs are deleted once older than the retention age, and least recently
+# updated first while the jobs directory is over its size budget, except
+# those finished within the grace period, whose results may still be downloading.
+DEFAULT_JOB_RETENTION_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_JOBS_MAX_BYTES = 10 * 1024 * 1024 * 1024
+EVICTION_GRACE_SECONDS = 15 * 60
+
+
+def jobs_dir() -> Path:
+    return Path(os.environ.get("EVAL_JOBS_DIR") or DEFAULT_JOBS_DIR)
+
+
+def job_retention_seconds() -> float:
+    return float(os.environ.get("EVAL_JOB_RETENTION_SECONDS") or DEFAULT_JOB_RETENTION_SECONDS)
+
+
+def jobs_max_bytes() -> int:
+    return int(os.environ.get("EVAL_JOBS_MAX_BYTES") or DEFAULT_JOBS_MAX_BYTES)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+_Job = TypeVar("_Job", bound="_PersistedJob")
+
+
+class _PersistedJob(ABC):
+    """``job.json`` persistence shared by the job records below."""
+
+    job_id: str
+
+    @property
+    @abstractmethod
+    def path(self) -> Path:
+        """Directory holding the job's ``job.json`` and artefacts."""
+
+    def save(self: _Job) -> _Job:
+        _write_json_atomic(self.path / JOB_FILE, asdict(self))
+        return self
+
+    def update(self: _Job, **changes: Any) -> _Job:
+        return replace(self, **changes, updated_at=_now()).save()
+
+
+@dataclass(frozen=True)
+class ScoringJob(_PersistedJob):
+    """State of one scoring job, persisted as ``job.json`` in the job directory.
+
+    ``status`` moves from ``queued`` to ``running`` and then ``completed`` or
+    ``failed``; an interrupted job goes back to ``queued``. Progress lives in
+    the checkpoint file (see ``job_status``).
+    """
+
+    job_id: str
+    model_id: str
+    workers: int
+    golden_file: str
+    golden_filename: str | None
+    dataset_file: str | None
+    dataset_filename: str | None
+    status: str = "queued"
+    total: int | None = None
+    error: str | None = None
+    created_at: str = ""
+    updated_at: str = ""
+
+    @property
+    def path(self) -> Path:
+        return jobs_dir() / self.job_id
+
+
+def create_scoring_job(
+    golden_file: BinaryIO,
+    model_file: BinaryIO,
+    model_id: str,
+    *,
+    workers: int = 1,
+    golden_filename: str | None = None,
+    dataset_file: BinaryIO | None = None,
+    dataset_filename: str | None = None,
+) -> ScoringJob:
+    """Copy the inputs into a new job directory and record the job as queued."""
+    evict_finished_jobs()
+    job_id = uuid.uuid4().hex
+    path = jobs_dir() / job_id
+    path.mkdir(parents=True)
+    golden_name = "golden" + (Path(golden_filename).suffix.lower() if golden_filename else "")
+    dataset_name = None
+    try:
+        _copy_upload(golden_file, path / golden_name)
+        _copy_upload(model_file, path / _MODEL_OUTPUTS_FILE)
+        if dataset_file is not None:
+            dataset_name = "dataset" + (Path(dataset_filename).suffix.lower() if dataset_filename else "")
+            _copy_upload(dataset_file, path / dataset_name)
+        created_at = _now()
+        return ScoringJob(
+            job_id=job_id,
+            model_id=model_id,
+            workers=workers,
+            golden_file=golden_name,
+            golden_filename=golden_filename,
+            dataset_file=dataset_name,
+            dataset_filename=dataset_filename,
+            created_at=created_at,
+            updated_at=created_at,
+        ).save()
+    except BaseException:
+        shutil.rmtree(path, ignore_errors=True)
+        raise
+
+
+def load_scoring_job(job_id: str) -> ScoringJob | None:
+    """Return the job with ``job_id``, or None if there is no such job."""
+    if not _JOB_ID.match(job_id):
+        return None
+    try:
+        payload = json.loads((jobs_dir() / job_id / JOB_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return ScoringJob(**payload)
+
+
+def iter_scoring_jobs() -> Iterator[ScoringJob]:
+    root = jobs_dir()
+    if not root.is_dir():
+        return
+    for path in sorted(root.iterdir()):
+        job = load_scoring_job(path.name)
+        if job is not None:
+            yield job
+
+
+def job_status(job: ScoringJob) -> Dict[str, Any]:
+    """Job state plus checkpointed progress; includes the summary once completed."""
+    checkpoint = _read_checkpoint(job.path)
+    status = {
+        "job_id": job.job_id,
+        "model_id": job.model_id,
+        "status": job.status,
+        "scored": checkpoint["scored"],
+        "total": job.total,
+        "last_conversation_id": checkpoint["last_conversation_id"],
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+    if job.status == "completed":
+        summary_path = job.path / SUMMARY_FILE
+        status["summary"] = json.loads(summary_path.read_text(encoding="utf-8"))
+    return status
+
+
+def run_scoring_job(
+    job: ScoringJob,
+    *,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+    checkpoint_seconds: float = CHECKPOINT_SECONDS,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> ScoringJob:
+    """Score a job to completion, resuming from its last checkpoint.
+
+    Results are appended to ``results.jsonl``. After every
+    ``checkpoint_interval`` results (or ``checkpoint_seconds``) the file is
+    flushed to disk and the checkpoint records its length, the number of
+    results and the last conversation id. On resume, anything written after
+    the checkpoint is truncated away, the already scored golden entries are
+    skipped, and the summary is rebuilt from the kept results. When
+    ``should_stop`` returns True the job is checkpointed and re-queued.
+    """
+    checkpoint = _read_checkpoint(job.path)
+    try:
+        with ExitStack() as stack:
+            golden_file = stack.enter_context((job.path / job.golden_file).open("rb"))
+            dataset_file = None
+            if job.dataset_file is not None:
+                dataset_file = stack.enter_context((job.path / job.dataset_file).open("rb"))
+            golden = compile_golden_index(
+                golden_file,
+                dataset_file=dataset_file,
+                filename=job.golden_filename,
+                dataset_filename=job.dataset_filename,
+            )
+            model_file = stack.enter_context((job.path / _MODEL_OUTPUTS_FILE).open("rb"))
+            model_index = index_model_outputs(model_file)
+            stack.callback(model_index.close)
+            job = job.update(status="running", total=len(golden), error=None)
+
+            results = stack.enter_context((job.path / RESULTS_FILE).open("a+b"))
+            if results.seek(0, os.SEEK_END) < checkpoint["results_bytes"]:
+                raise ValueError("Results file is shorter than its checkpoint")
+            # Drop results written after the checkpoint; they are scored again.
+            results.truncate(checkpoint["results_bytes"])
+            summary = ScoreSummary()
+            entries = iter(golden)
+            stack.callback(entries.close)
+            _replay_checkpoint(entries, results, checkpoint["scored"], summary)
+
+            scored = iter_scored_conversations(
+                entries,
+                model_index.get,
+                workers=job.workers,
+                summary=summary,
+                similarity=golden.similarity,
+            )
+            stack.callback(scored.close)
+            since_checkpoint = 0
+            checkpoint_at = time.monotonic()
+            for result in scored:
+                result["model_id"] = job.model_id
+                results.write((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+                checkpoint["scored"] += 1
+                checkpoint["last_conversation_id"] = result.get("conversation_id")
+                since_checkpoint += 1
+                if (
+                    since_checkpoint >= checkpoint_interval
+                    or time.monotonic() - checkpoint_at >= checkpoint_seconds
+                ):
+                    _write_checkpoint(job.path, results, checkpoint)
+                    since_checkpoint = 0
+                    checkpoint_at = time.monotonic()
+                if should_stop():
+                    _write_checkpoint(job.path, results, checkpoint)
+                    return job.update(status="queued")
+            _write_checkpoint(job.path, results, checkpoint)
+        _write_json_atomic(job.path / SUMMARY_FILE, {"model_id": job.model_id, **summary.to_dict()})
+        return job.update(status="completed")
+    except Exception as exc:
+        logger.exception("Scoring job %s failed", job.job_id)
+        return job.update(status="failed", error=str(exc))
+
+
+def _replay_checkpoint(
+    entries: Iterator[Any],
+    results: BinaryIO,
+    count: int,
+    summary: ScoreSummary,
+) -> None:
+    """Skip the golden entries already scored and re-add their results to ``summary``."""
+    results.seek(0)
+    for _ in range(count):
+        entry = next(entries, None)
+        line = results.readline()
+        if entry is None or not line:
+            raise ValueError("Checkpoint does not match the job's inputs")
+        result = json.loads(line)
+        if result.get("conversation_id") != entry.conversation_id:
+            raise ValueError("Checkpoint does not match the job's inputs")
+        summary.add(result, entry.labels)
+    results.seek(0, os.SEEK_END)
+
+
+def _read_checkpoint(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((path / CHECKPOINT_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"scored": 0, "last_conversation_id": None, "results_bytes": 0}
+
+
+def _write_checkpoint(path: Path, results: BinaryIO, checkpoint: Dict[str, Any]) -> None:
+    # Results must be on disk before the checkpoint that refers to them.
+    results.flush()
+    os.fsync(results.fileno())
+    checkpoint["results_bytes"] = results.tell()
+    _write_json_atomic(path / CHECKPOINT_FILE, checkpoint)
+
+
+def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as output:
+            json.dump(payload, output, ensure_ascii=False)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _copy_upload(file: BinaryIO, path: Path) -> None:
+    file.seek(0)
+    with path.open("wb") as output:
+        shutil.copyfileobj(file, output)
+    file.seek(0)
+
+
+@dataclass(frozen=True)
+class GenerationJob(_PersistedJob):
+    """State and progress of one dataset generation job (``job.json``).
+
+    ``status`` moves from ``queued`` to ``running`` and then ``completed``,
+    ``cancelled`` or ``failed``. The progress counters are published while
+    the job runs; ``artefact`` names the finished zip in the job directory.
+    """
+
+    job_id: str
+    config: str
+    status: str = "queued"
+    dataset_id: str | None = None
+    artefact: str | None = None
+    total: int | None = None
+    plans_built: int = 0
+    entries_rendered: int = 0
+    bytes_written: int = 0
+    error: str | None = None
+    created_at: str = ""
+    updated_at: str = ""
+
+    @property
+    def path(self) -> Path:
+        return jobs_dir() / _GENERATION_DIR / self.job_id
+
+
+@dataclass
+class GenerationProgress:
+    """Counters updated by the generation pipeline of a running job."""
+
+    total: int | None = None
+    plans_built: int = 0
+    entries_rendered: int = 0
+    bytes_written: int = 0
+
+    def count_plans(self, plans: Iterable[Any]) -> Iterator[Any]:
+        for plan in plans:
+            self.plans_built += 1
+            yield plan
+
+
+# Builds the archive of a generation request: (dataset id, archive entries).
+ArchiveFactory = Callable[[str, GenerationProgress], Tuple[str, Iterator[ArchiveEntry]]]
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+def create_generation_job(config: str) -> GenerationJob:
+    """Record a queued generation job for a ``GenerationRequest`` JSON payload."""
+    evict_finished_jobs()
+    created_at = _now()
+    job = GenerationJob(
+        job_id=uuid.uuid4().hex,
+        config=config,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+    job.path.mkdir(parents=True)
+    return job.save()
+
+
+def load_generation_job(job_id: str) -> GenerationJob | None:
+    """Return the generation job with ``job_id``, or None if there is no such job."""
+    if not _JOB_ID.match(job_id):
+        return None
+    try:
+        path = jobs_dir() / _GENERATION_DIR / job_id / JOB_FILE
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return GenerationJob(**payload)
+
+
+def iter_generation_jobs() -> Iterator[GenerationJob]:
+    root = jobs_dir() / _GENERATION_DIR
+    if not root.is_dir():
+        return
+    for path in sorted(root.iterdir()):
+        job = load_generation_job(path.name)
+        if job is not None:
+            yield job
+
+
+def generation_job_status(job: GenerationJob) -> Dict[str, Any]:
+    """Job state and progress counters, without the request payload."""
+    status = asdict(job)
+    del status["config"]
+    return status
+
+
+def request_cancellation(job: GenerationJob) -> None:
+    """Ask a queued or running job to stop; the job picks this up between chunks.
+
+    The request is a marker file, so it reaches the job from any process.
+    """
+    (job.path / CANCEL_FILE).touch()
+
+
+def run_generation_job(
+    job: GenerationJob,
+    prepare: ArchiveFactory,
+    *,
+    should_stop: Callable[[], bool] = lambda: False,
+    progress_seconds: float = PROGRESS_SECONDS,
+) -> GenerationJob:
+    """Generate a job's dataset archive into its directory.
+
+    The zip is written to a ``.part`` file and renamed once complete. Every
+    ``progress_seconds`` the counters are saved to ``job.json`` and the
+    cancel marker is checked. When ``should_stop`` returns True (server
+    shutdown) the partial file is dropped and the job re-queued; generation
+    is deterministic, so it simply runs again.
+    """
+    cancel_path = job.path / CANCEL_FILE
+    if cancel_path.exists():
+        return job.update(status="cancelled")
+    progress = GenerationProgress()
+    part_path: Path | None = None
+    try:
+        job = job.update(status="running", error=None)
+        dataset_id, entries = prepare(job.config, progress)
+        artefact = f"{dataset_id}.zip"
+        part_path = job.path / f"{artefact}.part"
+        job = job.update(dataset_id=dataset_id, total=progress.total)
+
+        archive = stream_zip(entries)
+        published_at = time.monotonic()
+        stopped = False
+        try:
+            with part_path.open("wb") as output:
+                for chunk in archive:
+                    output.write(chunk)
+                    progress.bytes_written += len(chunk)
+                    if should_stop():
+                        stopped = True
+                        break
+                    if time.monotonic() - published_at >= progress_seconds:
+                        if cancel_path.exists():
+                            raise GenerationCancelled()
+                        job = job.update(**_progress_fields(progress))
+                        published_at = time.monotonic()
+        finally:
+            archive.close()
+        if stopped:
+            part_path.unlink()
+            return job.update(status="queued", **_progress_fields(GenerationProgress()))
+        os.replace(part_path, job.path / artefact)
+        return job.update(status="completed", artefact=artefact, **_progress_fields(progress))
+    except GenerationCancelled:
+        _unlink_missing_ok(part_path)
+        return job.update(status="cancelled", **_progress_fields(progress))
+    except Exception as exc:
+        logger.exception("Generation job %s failed", job.job_id)
+        _unlink_missing_ok(part_path)
+        return job.update(status="failed", error=str(exc), **_progress_fields(progress))
+
+
+def evict_finished_jobs(
+    max_age: float | None = None,
+    max_bytes: int | None = None,
+) -> List[str]:
+    """Delete finished scoring and generation jobs past the retention limits.
+
+    Completed, failed and cancelled jobs last updated more than ``max_age``
+    seconds ago are deleted; then, while all job directories together exceed
+    ``max_bytes``, the least recently updated finished jobs go, skipping any
+    updated within ``EVICTION_GRACE_SECONDS``. Queued and running jobs are
+    never deleted. Returns the deleted job ids.
+    """
+    max_age = job_retention_seconds() if max_age is None else max_age
+    max_bytes = jobs_max_bytes() if max_bytes is None else max_bytes
+    jobs: List[_PersistedJob] = [*iter_scoring_jobs(), *iter_generation_jobs()]
+    candidates: List[Tuple[float, int, _PersistedJob]] = []
+    total = 0
+    for job in jobs:
+        try:
+            updated = (job.path / JOB_FILE).stat().st_mtime
+        except OSError:
+            continue
+        size = _directory_size(job.path)
+        total += size
+        if job.status not in _INCOMPLETE:
+            candidates.append((updated, size, job))
+
+    now = time.time()
+    evicted: List[str] = []
+    for updated, size, job in sorted(candidates, key=lambda candidate: candidate[0]):
+        expired = updated < now - max_age
+        if not expired and (total <= max_bytes or updated > now - EVICTION_GRACE_SECONDS):
+            continue
+        shutil.rmtree(job.path, ignore_errors=True)
+        total -= size
+        evicted.append(job.job_id)
+    return evicted
+
+
+def _directory_size(path: Path) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return size
+
+
+def _progress_fields(progress: GenerationProgress) -> Dict[str, int]:
+    return {
+        "plans_built": progress.plans_built,
+        "entries_rendered": progress.entries_rendered,
+        "bytes_written": progress.bytes_written,
+    }
+
+
+def _unlink_missing_ok(path: Path | None) -> None:
+    if path is not None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class JobRunner:
+    """Runs persisted jobs on background threads, off the request path.
+
+    ``run`` is called as ``run(job, should_stop=...)`` and returns the final
+    job record; ``iter_jobs`` lists the jobs on disk for resuming. A job may
+    still fan out to its own process pool; ``max_jobs`` bounds how many jobs
+    run at once.
+    """
+
+    def __init__(
+        self,
+        run: Callable[..., Any],
+        iter_jobs: Callable[[], Iterable[Any]],
+        max_jobs: int = 1,
+        name: str = "job",
+    ) -> None:
+        self._run = run
+        self._iter_jobs = iter_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix=name)
+        self._futures: Dict[str, Future[Any]] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def submit(self, job: Any) -> Future[Any]:
+        with self._lock:
+            future = self._futures.get(job.job_id)
+            if future is None or future.done():
+                future = self._executor.submit(self._run, job, should_stop=self._stopping.is_set)
+                self._futures[job.job_id] = future
+            return future
+
+    def cancel_pending(self, job_id: str) -> bool:
+        """Drop a job that has not started yet; False if it is running or unknown."""
+        with self._lock:
+            future = self._futures.get(job_id)
+            return future is not None and future.cancel()
+
+    def resume_incomplete(self) -> List[str]:
+        """Resubmit jobs left queued or running, e.g. by a crash; returns their ids."""
+        resumed = []
+        for job in self._iter_jobs():
+            if job.status in _INCOMPLETE:
+                self.submit(job)
+                resumed.append(job.job_id)
+        return resumed
+
+    def shutdown(self) -> None:
+        """Ask running jobs to stop and re-queue themselves, then wait for their threads."""
+        self._stopping.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator
+
+_READ_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+# Longest partial token (e.g. "fals", "\\u00e") a truncated buffer can end with.
+_MAX_TOKEN_TAIL = 6
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Text buffer over a binary file, refilled on demand."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next block to the buffer; False once the file is exhausted."""
+        if self.eof:
+            return False
+        block = self._file.read(_READ_SIZE)
+        if not block:
+            self.eof = True
+            self.buffer = self.buffer[self.pos :] + self._decoder.decode(b"", final=True)
+            self.pos = 0
+            return False
+        # Drop consumed text so the buffer only ever holds unparsed input.
+        self.buffer = self.buffer[self.pos :] + self._decoder.decode(block)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON: expected {char!r}, found {found or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value starting at the next non-whitespace character."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                if _may_be_truncated(exc, len(self.buffer)) and self.fill():
+                    continue
+                raise ValueError(f"Invalid JSON: {exc}") from exc
+            if not isinstance(value, (dict, list, str)):
+                # A number or literal cut at the end of the buffer ("1." or
+                # "1e") decodes as a shorter value; wait for what follows.
+                rest = self.buffer[end:].lstrip(_WHITESPACE)
+                if len(rest) <= 2 and rest[:1] not in {",", "]", "}"} and self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def _may_be_truncated(exc: json.JSONDecodeError, length: int) -> bool:
+    """Whether a decode error can be explained by input ending too early."""
+    return exc.msg.startswith("Unterminated string") or exc.pos >= length - _MAX_TOKEN_TAIL
+
+
+def iter_json_array(file: BinaryIO, key: str) -> Iterator[Any]:
+    """Yield the items of ``document[key]`` from a JSON object, one at a time.
+
+    Only the current item (plus a read block) is held in memory; other
+    top-level values are decoded and discarded. Raises ``ValueError`` on
+    malformed input or when ``key`` is missing or not an array.
+    """
+    file.seek(0)
+    reader = _Reader(file)
+    reader.expect("{")
+    if reader.peek() == "}":
+        raise ValueError(f"Invalid JSON document: missing {key!r} array")
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise ValueError("Invalid JSON: object keys must be strings")
+        reader.expect(":")
+        if name != key:
+            reader.value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() == "]":
+                        reader.pos += 1
+                        break
+                    reader.expect(",")
+            return
+        if reader.peek() == "}":
+            raise ValueError(f"Invalid JSON document: missing {key!r} array")
+        reader.expect(",")
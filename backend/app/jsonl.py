@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Mapping, Tuple
+
+# Keys held in a plain dict before the offset index moves to SQLite on disk.
+_MAX_MEMORY_KEYS = 1_000_000
+_SQLITE_BATCH_SIZE = 10_000
+
+
+def parse_jsonl_line(line: bytes) -> Dict[str, Any]:
+    """Decode one JSONL line, which must hold a JSON object."""
+    try:
+        entry = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid JSONL: {exc}") from exc
+    if not isinstance(entry, dict):
+        raise ValueError("Invalid JSONL entry; expected object")
+    return entry
+
+
+def iter_jsonl_records(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(offset, entry)`` for every non-blank line, from the start of ``file``."""
+    file.seek(0)
+    offset = 0
+    for line in iter(file.readline, b""):
+        start = offset
+        offset += len(line)
+        if not line.strip():
+            continue
+        yield start, parse_jsonl_line(line)
+
+
+def iter_jsonl(file: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Yield the objects of a JSONL file one line at a time."""
+    for _, entry in iter_jsonl_records(file):
+        yield entry
+
+
+def validate_jsonl(file: BinaryIO) -> int:
+    """Check every line of ``file`` parses, returning the number of entries."""
+    count = 0
+    for count, _ in enumerate(iter_jsonl_records(file), start=1):
+        pass
+    return count
+
+
+class JsonlOffsetIndex:
+    """Lookup of JSONL entries by key without keeping the entries in memory.
+
+    Only the byte offset of each line is indexed; entries are re-read from
+    ``file`` on lookup. Offsets live in a dict until ``max_memory_keys`` is
+    exceeded, then move to a temporary SQLite table. Later lines win over
+    earlier lines with the same key.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        key: Callable[[Mapping[str, Any]], str],
+        max_memory_keys: int = _MAX_MEMORY_KEYS,
+    ) -> None:
+        self._file = file
+        self._key = key
+        self._max_memory_keys = max_memory_keys
+        self._offsets: Dict[str, int] = {}
+        self._db: sqlite3.Connection | None = None
+        self._db_path: str | None = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._db is not None
+
+    def build(self) -> "JsonlOffsetIndex":
+        """Index every line of the file; raises ``ValueError`` on invalid JSONL."""
+        pending: List[Tuple[str, int]] = []
+        for offset, entry in iter_jsonl_records(self._file):
+            if self._db is None:
+                self._offsets[self._key(entry)] = offset
+                if len(self._offsets) > self._max_memory_keys:
+                    self._spill()
+                continue
+            pending.append((self._key(entry), offset))
+            if len(pending) >= _SQLITE_BATCH_SIZE:
+                self._insert(pending)
+                pending = []
+        if pending:
+            self._insert(pending)
+        return self
+
+    def __len__(self) -> int:
+        if self._db is None:
+            return len(self._offsets)
+        return self._db.execute("SELECT COUNT(*) FROM offsets").fetchone()[0]
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        offset = self._lookup(key)
+        if offset is None:
+            return None
+        self._file.seek(offset)
+        return parse_jsonl_line(self._file.readline())
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._db_path is not None:
+            try:
+                os.unlink(self._db_path)
+            except FileNotFoundError:
+                pass
+            self._db_path = None
+        self._offsets = {}
+
+    def _lookup(self, key: str) -> int | None:
+        if self._db is None:
+            return self._offsets.get(key)
+        row = self._db.execute("SELECT offset FROM offsets WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _spill(self) -> None:
+        handle, self._db_path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+        # Lookups happen from whichever threadpool worker streams the response.
+        self._db = sqlite3.connect(self._db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = OFF")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("CREATE TABLE offsets (key TEXT PRIMARY KEY, offset INTEGER NOT NULL)")
+        self._insert(list(self._offsets.items()))
+        self._offsets = {}
+
+    def _insert(self, rows: List[Tuple[str, int]]) -> None:
+        if self._db is None:
+            return
+        self._db.executemany("INSERT OR REPLACE INTO offsets (key, offset) VALUES (?, ?)", rows)
+        self._db.commit()
@@ -1,24 +1,89 @@
+import asyncio
 import hashlib
-import io
 import json
 import logging
 import re
-import zipfile
-
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
-
+import tempfile
+from contextlib import asynccontextmanager
+from functools import partial
+from itertools import chain, islice
+from typing import AsyncIterator, BinaryIO, Iterable, Iterator
+
+from fastapi import FastAPI, File, Form, Header, HTTPException, UploadFile
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from .archive import ArchiveEntry, stream_zip
+from .artefact_cache import ArtefactCache, dataset_cache_key, etag_for, etag_matches
 from .config_loader import load_vertical_config
-from .dataset_builder import build_eval_dataset_entries, build_golden_dataset, build_golden_dataset_entries
+from .dataset_builder import iter_conversation_artefacts
 from .generation import build_conversation_plans
+from .golden_index import GoldenIndex, compile_golden_index
+from .jobs import (
+    RESULTS_FILE,
+    GenerationJob,
+    GenerationProgress,
+    JobRunner,
+    ScoringJob,
+    create_generation_job,
+    create_scoring_job,
+    generation_job_status,
+    iter_generation_jobs,
+    iter_scoring_jobs,
+    job_status,
+    load_generation_job,
+    load_scoring_job,
+    request_cancellation,
+    run_generation_job,
+    run_scoring_job,
+)
+from .jsonl import JsonlOffsetIndex
 from .models import GenerationRequest, IndustryVertical, VerticalConfigResponse
-from .scoring import score_dataset
+from .plans import PlanRecord
+from .score_summary import ScoreSummary, compare_summaries
+from .scoring import (
+    GoldenLike,
+    index_model_outputs,
+    iter_scored_comparisons,
+    iter_scored_conversations,
+)
+from .serialization import JsonArraySpool, JsonSerializer, get_serializer, iter_json_document
+from .shards import ShardOptions, iter_sharded_archive_entries
+from .similarity import VariantSimilarity
 from .template_engine import TemplateEngine
 
-app = FastAPI(title="Eval Dataset Generator")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("eval_dataset_generator")
 
+# Finished /generate-dataset archives, replayed for repeat seeded requests.
+artefact_cache = ArtefactCache()
+
+# Background runner for /score-jobs; scoring happens off the request path.
+score_jobs = JobRunner(run_scoring_job, iter_scoring_jobs, name="score-job")
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Jobs interrupted by a crash or restart resume: scoring jobs from their
+    # last checkpoint, generation jobs from the start.
+    resumed = score_jobs.resume_incomplete()
+    if resumed:
+        logger.info("Resuming %d scoring job(s)", len(resumed))
+    resumed = generation_jobs.resume_incomplete()
+    if resumed:
+        logger.info("Resuming %d generation job(s)", len(resumed))
+    yield
+    await run_in_threadpool(score_jobs.shutdown)
+    await run_in_threadpool(generation_jobs.shutdown)
+
+
+app = FastAPI(title="Eval Dataset Generator", lifespan=_lifespan)
+
+# Scored conversations serialised per threadpool hop when streaming /score-run.
+SCORE_STREAM_BATCH_SIZE = 500
+# Per-model results kept in memory before /score-compare spills them to disk.
+SCORE_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
 
 @app.get("/health")
 def health_check() -> dict:
@@ -55,28 +120,126 @@ def get_vertical_config(vertical: IndustryVertical) -> VerticalConfigResponse:
     )
 
 
-def _parse_jsonl_bytes(payload: bytes) -> list[dict]:
-    decoded = payload.decode("utf-8")
-    entries: list[dict] = []
-    for line in decoded.splitlines():
-        if not line.strip():
-            continue
-        try:
-            entry = json.loads(line)
-        except json.JSONDecodeError as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid JSONL: {exc}") from exc
-        if not isinstance(entry, dict):
-            raise HTTPException(status_code=400, detail="Invalid JSONL entry; expected object")
-        entries.append(entry)
-    return entries
+def _next_scored_chunk(scored: Iterator[dict], model_id: str, batch_size: int) -> bytes:
+    lines: list[str] = []
+    for entry in islice(scored, batch_size):
+        entry["model_id"] = model_id
+        lines.append(json.dumps(entry, ensure_ascii=False))
+        lines.append("\n")
+    return "".join(lines).encode("utf-8")
+
+
+async def _stream_scored_jsonl(
+    golden_entries: Iterable[GoldenLike],
+    model_index: JsonlOffsetIndex,
+    model_id: str,
+    workers: int = 1,
+    batch_size: int = SCORE_STREAM_BATCH_SIZE,
+    similarity: VariantSimilarity | None = None,
+) -> AsyncIterator[bytes]:
+    """Score golden entries lazily and yield the results as JSONL chunks.
+
+    Each batch is scored in the threadpool so the event loop stays free while
+    results are produced.
+    """
+    scored = iter_scored_conversations(
+        golden_entries, model_index.get, workers=workers, similarity=similarity
+    )
+    try:
+        while True:
+            chunk = await run_in_threadpool(_next_scored_chunk, scored, model_id, batch_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        scored.close()
+        model_index.close()
+
+
+def _iter_score_archive_entries(
+    golden_entries: Iterable[GoldenLike],
+    model_index: JsonlOffsetIndex,
+    model_id: str,
+    workers: int = 1,
+    batch_size: int = SCORE_STREAM_BATCH_SIZE,
+    similarity: VariantSimilarity | None = None,
+) -> Iterator[ArchiveEntry]:
+    """Yield the scored JSONL, then the summary aggregated while it was written."""
+    summary = ScoreSummary()
+    scored = iter_scored_conversations(
+        golden_entries,
+        model_index.get,
+        workers=workers,
+        summary=summary,
+        similarity=similarity,
+    )
 
+    def jsonl_chunks() -> Iterator[bytes]:
+        while True:
+            chunk = _next_scored_chunk(scored, model_id, batch_size)
+            if not chunk:
+                return
+            yield chunk
 
-def _to_jsonl_bytes(entries: list[dict]) -> bytes:
-    buffer = io.StringIO()
-    for entry in entries:
-        buffer.write(json.dumps(entry, ensure_ascii=False))
-        buffer.write("\n")
-    return buffer.getvalue().encode("utf-8")
+    try:
+        yield "scored_results.jsonl", jsonl_chunks()
+    finally:
+        scored.close()
+        model_index.close()
+    yield "summary.json", [get_serializer().dumps({"model_id": model_id, **summary.to_dict()})]
+
+
+def _iter_comparison_archive_entries(
+    golden_entries: Iterable[GoldenLike],
+    model_indexes: dict[str, JsonlOffsetIndex],
+    workers: int = 1,
+    similarity: VariantSimilarity | None = None,
+) -> Iterator[ArchiveEntry]:
+    """Score every model in one pass over the golden file, then yield the archive.
+
+    Per-model results are spooled during the pass (they are written to
+    separate archive entries) and followed by the comparison table.
+    """
+    model_ids = list(model_indexes)
+    summaries = {model_id: ScoreSummary() for model_id in model_ids}
+    spools = {
+        model_id: tempfile.SpooledTemporaryFile(max_size=SCORE_SPOOL_MAX_SIZE)
+        for model_id in model_ids
+    }
+    try:
+        scored = iter_scored_comparisons(
+            golden_entries,
+            [model_indexes[model_id].get for model_id in model_ids],
+            workers=workers,
+            summaries=[summaries[model_id] for model_id in model_ids],
+            similarity=similarity,
+        )
+        for results in scored:
+            for model_id, entry in zip(model_ids, results):
+                entry["model_id"] = model_id
+                spools[model_id].write(
+                    (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+                )
+        for model_index in model_indexes.values():
+            model_index.close()
+
+        for model_id in model_ids:
+            yield f"{_slugify(model_id)}.scored.jsonl", _iter_spooled_file(spools[model_id])
+        yield "comparison.json", [get_serializer().dumps(compare_summaries(summaries))]
+    finally:
+        for model_index in model_indexes.values():
+            model_index.close()
+        for spool in spools.values():
+            spool.close()
+
+
+def _iter_spooled_file(file: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    file.seek(0)
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
 
 
 def _parse_generation_request(payload: str) -> GenerationRequest:
@@ -193,13 +356,126 @@ def _build_dataset_id(
     return f"{request.vertical.value}-{summary}-{version}", False
 
 
+def _iter_dataset_archive_entries(
+    plans: Iterator[PlanRecord],
+    template_engine: TemplateEngine,
+    vertical_config: dict,
+    dataset_header: dict,
+    dataset_id: str,
+    manifest: dict,
+    serializer: JsonSerializer,
+    progress: GenerationProgress | None = None,
+    shard_options: ShardOptions | None = None,
+) -> Iterator[ArchiveEntry]:
+    """Yield archive entries that render every plan exactly once.
+
+    The dataset document is streamed straight into the archive while the
+    golden entries built from the same plans are spooled, then replayed as the
+    next archive entry once the dataset is complete. With ``shard_options``
+    both are written as JSONL shards instead and listed in the manifest.
+    """
+
+    def conversations() -> Iterator[tuple[dict, dict]]:
+        rendered = iter_conversation_artefacts(
+            plans, template_engine, vertical_config, golden_turns=False
+        )
+        for conversation in rendered:
+            yield conversation.eval_entry, conversation.golden_entry
+            if progress is not None:
+                progress.entries_rendered += 1
+
+    if shard_options is not None:
+        shards: dict[str, list] = {}
+        manifest["output"] = {**shard_options.describe(), "dataset": dataset_header, "shards": shards}
+        yield from iter_sharded_archive_entries(conversations(), dataset_id, shard_options, shards)
+        yield "manifest.json", [serializer.dumps(manifest)]
+        return
+
+    golden_spool = JsonArraySpool(serializer=serializer)
+
+    def eval_entries() -> Iterator[dict]:
+        for eval_entry, golden_entry in conversations():
+            golden_spool.append(golden_entry)
+            yield eval_entry
+
+    try:
+        yield (
+            f"{dataset_id}.dataset.json",
+            iter_json_document(dataset_header, "conversations", eval_entries(), serializer),
+        )
+        yield (
+            f"{dataset_id}.golden.json",
+            golden_spool.iter_document({"dataset_id": dataset_id, "version": "1.0.0"}, "entries"),
+        )
+    finally:
+        golden_spool.close()
+
+    # Write manifest.json for backward compatibility
+    yield "manifest.json", [serializer.dumps(manifest)]
+
+
+def _prepare_dataset_archive(
+    request: GenerationRequest,
+    progress: GenerationProgress | None = None,
+) -> tuple[str, dict, Iterator[ArchiveEntry]]:
+    """Set up generation for ``request``: dataset id, manifest and archive entries.
+
+    Nothing is rendered until the entries are consumed, but the first plan is
+    built eagerly so setup errors surface before any archive bytes exist.
+    """
+    shard_options = ShardOptions.from_request(request)
+    plans, manifest = build_conversation_plans(request)
+    template_engine = TemplateEngine.from_vertical(request.vertical)
+    vertical_config = load_vertical_config(request.vertical)
+    dataset_id, is_combined = _build_dataset_id(request, vertical_config, version="1.0.0")
+
+    first_plan = next(plans, None)
+    if first_plan is not None:
+        plans = chain([first_plan], plans)
+    if progress is not None:
+        progress.total = manifest["total_conversations"]
+        plans = progress.count_plans(plans)
+
+    dataset_header = {
+        "dataset_id": dataset_id,
+        "version": "1.0.0",
+        "metadata": {
+            "domain": request.vertical.value,
+            "difficulty": "mixed",
+            "tags": [
+                "combined" if is_combined else "custom",
+                first_plan.domain_label if first_plan else request.vertical.value,
+            ],
+        },
+    }
+    entries = _iter_dataset_archive_entries(
+        plans,
+        template_engine,
+        vertical_config,
+        dataset_header,
+        dataset_id,
+        manifest,
+        get_serializer(compact=request.compact_json),
+        progress,
+        shard_options,
+    )
+    return dataset_id, manifest, entries
+
+
 @app.post("/generate-dataset")
 async def generate_dataset(
     config: str = Form(...),
     domain_schema: UploadFile | None = File(None),
     behaviour_schema: UploadFile | None = File(None),
     axes_schema: UploadFile | None = File(None),
-) -> StreamingResponse:
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """Generate the dataset archive for ``config``.
+
+    Requests with a ``random_seed`` are reproducible, so their archive is
+    cached on disk under a hash of the request and the vertical's YAML and
+    served with an ``ETag``; a matching ``If-None-Match`` gets a 304.
+    """
     try:
         request = _parse_generation_request(config)
     except Exception as exc:
@@ -209,60 +485,38 @@ async def generate_dataset(
         logger.info("schema_overrides_received")
 
     try:
-        plans, manifest = build_conversation_plans(request)
-        template_engine = TemplateEngine.from_vertical(request.vertical)
-        vertical_config = load_vertical_config(request.vertical)
-        
-        # Build dataset entries
-        eval_entries = build_eval_dataset_entries(plans, template_engine)
-        
-        # Build golden dataset
-        dataset_id, is_combined = _build_dataset_id(request, vertical_config, version="1.0.0")
-        golden_dataset_obj = build_golden_dataset(
-            plans,
-            template_engine,
-            vertical_config,
-            dataset_id=dataset_id,
-            version="1.0.0",
-        )
-        
-        # Build dataset JSON structure
-        dataset_json = {
-            "dataset_id": dataset_id,
-            "version": "1.0.0",
-            "metadata": {
-                "domain": request.vertical.value,
-                "difficulty": "mixed",
-                "tags": [
-                    "combined" if is_combined else "custom",
-                    plans[0].domain_label if plans else request.vertical.value,
-                ],
-            },
-            "conversations": eval_entries,
-        }
-        
+        cache_key = await run_in_threadpool(dataset_cache_key, request)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    headers: dict[str, str] = {}
+    if cache_key is None:
+        artefact_cache.record("uncacheable")
+    else:
+        headers["ETag"] = etag_for(cache_key)
+        if etag_matches(if_none_match, headers["ETag"]):
+            artefact_cache.record("not_modified")
+            return Response(status_code=304, headers=headers)
+        cached = await run_in_threadpool(artefact_cache.lookup, cache_key)
+        if cached is not None:
+            logger.info("dataset_cache_hit %s", cached.filename)
+            return FileResponse(
+                cached.path,
+                media_type="application/zip",
+                headers={**headers, "Content-Disposition": f"attachment; filename={cached.filename}"},
+            )
+
+    try:
+        # Plan building (covering arrays, the first pool shard) blocks, so it
+        # runs off the event loop like the job path does.
+        dataset_id, manifest, entries = await run_in_threadpool(_prepare_dataset_archive, request)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    archive_buffer = io.BytesIO()
-    with zipfile.ZipFile(archive_buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-        # Write dataset.json
-        dataset_bytes = json.dumps(dataset_json, ensure_ascii=False, indent=2).encode("utf-8")
-        archive.writestr(f"{dataset_id}.dataset.json", dataset_bytes)
-        
-        # Write golden.json
-        if hasattr(golden_dataset_obj, "model_dump"):
-            golden_dict = golden_dataset_obj.model_dump()
-        else:
-            golden_dict = golden_dataset_obj.dict()
-        golden_bytes = json.dumps(golden_dict, ensure_ascii=False, indent=2).encode("utf-8")
-        archive.writestr(f"{dataset_id}.golden.json", golden_bytes)
-        
-        # Write manifest.json for backward compatibility
-        archive.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
-
-    archive_buffer.seek(0)
     filename = f"{dataset_id}.zip"
+    archive_stream = stream_zip(entries)
+    if cache_key is not None:
+        archive_stream = artefact_cache.store(cache_key, filename, archive_stream)
 
     logger.info(
         "dataset_generated %s",
@@ -271,16 +525,38 @@ async def generate_dataset(
                 "vertical": request.vertical.value,
                 "workflows": request.workflows,
                 "behaviours": [b.value for b in request.behaviours],
-                "total": len(plans),
+                "total": manifest["total_conversations"],
             },
             ensure_ascii=False,
         ),
     )
 
     return StreamingResponse(
-        archive_buffer,
+        archive_stream,
         media_type="application/zip",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        headers={**headers, "Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@app.get("/generate-dataset/cache")
+def get_dataset_cache_stats() -> dict:
+    """Hit/miss counters and current size of the generated archive cache."""
+    return artefact_cache.stats()
+
+
+def _compile_golden_upload(
+    golden_dataset: UploadFile,
+    eval_dataset: UploadFile | None,
+) -> GoldenIndex:
+    """Compile (or reuse) the index for an uploaded golden JSONL or golden.json.
+
+    The optional eval dataset upload contributes per-conversation metadata.
+    """
+    return compile_golden_index(
+        golden_dataset.file,
+        dataset_file=eval_dataset.file if eval_dataset else None,
+        filename=golden_dataset.filename,
+        dataset_filename=eval_dataset.filename if eval_dataset else None,
     )
 
 
@@ -289,24 +565,201 @@ async def score_run(
     golden_dataset: UploadFile = File(...),
     model_outputs: UploadFile = File(...),
     model_id: str = Form(...),
+    workers: int = Form(1, ge=1, le=64),
+    summary: bool = Form(False),
+    eval_dataset: UploadFile | None = File(None),
 ) -> StreamingResponse:
+    # Uploads are spooled to temp files. The golden upload (JSONL or a
+    # generated golden.json) is compiled into a cached index, or reuses one
+    # for identical content; model outputs are indexed by offset and stay
+    # open until the response has been sent.
     try:
-        golden_payload = await golden_dataset.read()
-        model_payload = await model_outputs.read()
-    except Exception as exc:
+        golden = await run_in_threadpool(_compile_golden_upload, golden_dataset, eval_dataset)
+        model_index = await run_in_threadpool(index_model_outputs, model_outputs.file)
+    except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    golden_entries = _parse_jsonl_bytes(golden_payload)
-    model_entries = _parse_jsonl_bytes(model_payload)
+    if summary:
+        return StreamingResponse(
+            stream_zip(
+                _iter_score_archive_entries(
+                    golden, model_index, model_id, workers, similarity=golden.similarity
+                )
+            ),
+            media_type="application/zip",
+            headers={"Content-Disposition": "attachment; filename=scored_results.zip"},
+        )
 
-    scored = score_dataset(golden_entries, model_entries)
-    for entry in scored:
-        entry["model_id"] = model_id
+    return StreamingResponse(
+        _stream_scored_jsonl(golden, model_index, model_id, workers, similarity=golden.similarity),
+        media_type="application/jsonl",
+        headers={"Content-Disposition": "attachment; filename=scored_results.jsonl"},
+    )
+
+
+@app.post("/score-compare")
+async def score_compare(
+    golden_dataset: UploadFile = File(...),
+    model_outputs: list[UploadFile] = File(...),
+    model_ids: list[str] = Form(...),
+    workers: int = Form(1, ge=1, le=64),
+    eval_dataset: UploadFile | None = File(None),
+) -> StreamingResponse:
+    """Score several models against one golden dataset in a single pass.
+
+    ``model_ids`` and ``model_outputs`` pair up by position. The response is a
+    zip with one scored JSONL per model plus ``comparison.json``.
+    """
+    if len(model_ids) != len(model_outputs):
+        raise HTTPException(
+            status_code=400, detail="Provide exactly one model_id per model_outputs file"
+        )
+    if len({_slugify(model_id) for model_id in model_ids}) != len(model_ids):
+        raise HTTPException(status_code=400, detail="model_ids must be distinct")
+
+    try:
+        golden = await run_in_threadpool(_compile_golden_upload, golden_dataset, eval_dataset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    output_bytes = _to_jsonl_bytes(scored)
+    # Model files are indexed concurrently; they are independent uploads.
+    indexes = await asyncio.gather(
+        *(run_in_threadpool(index_model_outputs, upload.file) for upload in model_outputs),
+        return_exceptions=True,
+    )
+    errors = [result for result in indexes if isinstance(result, BaseException)]
+    if errors:
+        for result in indexes:
+            if isinstance(result, JsonlOffsetIndex):
+                result.close()
+        if isinstance(errors[0], ValueError):
+            raise HTTPException(status_code=400, detail=str(errors[0])) from errors[0]
+        raise errors[0]
 
     return StreamingResponse(
-        io.BytesIO(output_bytes),
+        stream_zip(
+            _iter_comparison_archive_entries(
+                golden, dict(zip(model_ids, indexes)), workers, similarity=golden.similarity
+            )
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=model_comparison.zip"},
+    )
+
+
+def _get_scoring_job(job_id: str) -> ScoringJob:
+    job = load_scoring_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scoring job: {job_id}")
+    return job
+
+
+@app.post("/score-jobs", status_code=202)
+async def submit_score_job(
+    golden_dataset: UploadFile = File(...),
+    model_outputs: UploadFile = File(...),
+    model_id: str = Form(...),
+    workers: int = Form(1, ge=1, le=64),
+    eval_dataset: UploadFile | None = File(None),
+) -> dict:
+    """Queue a resumable scoring job; poll ``/score-jobs/{job_id}`` for progress.
+
+    The uploads are copied into the job directory, so the job survives the
+    request and can pick up from its last checkpoint after a restart.
+    """
+    job = await run_in_threadpool(
+        create_scoring_job,
+        golden_dataset.file,
+        model_outputs.file,
+        model_id,
+        workers=workers,
+        golden_filename=golden_dataset.filename,
+        dataset_file=eval_dataset.file if eval_dataset else None,
+        dataset_filename=eval_dataset.filename if eval_dataset else None,
+    )
+    score_jobs.submit(job)
+    return {"job_id": job.job_id, "status": job.status}
+
+
+@app.get("/score-jobs/{job_id}")
+async def get_score_job(job_id: str) -> dict:
+    job = _get_scoring_job(job_id)
+    return await run_in_threadpool(job_status, job)
+
+
+@app.get("/score-jobs/{job_id}/results")
+async def get_score_job_results(job_id: str) -> FileResponse:
+    """Download the scored JSONL of a completed job."""
+    job = _get_scoring_job(job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Scoring job is {job.status}")
+    return FileResponse(
+        job.path / RESULTS_FILE,
         media_type="application/jsonl",
-        headers={"Content-Disposition": "attachment; filename=scored_results.jsonl"},
+        filename="scored_results.jsonl",
     )
+
+
+def _prepare_generation_job(
+    config: str,
+    progress: GenerationProgress,
+) -> tuple[str, Iterator[ArchiveEntry]]:
+    dataset_id, _, entries = _prepare_dataset_archive(_parse_generation_request(config), progress)
+    return dataset_id, entries
+
+
+# Background runner for /generation-jobs; artefacts are written under the jobs directory.
+generation_jobs = JobRunner(
+    partial(run_generation_job, prepare=_prepare_generation_job),
+    iter_generation_jobs,
+    name="generation-job",
+)
+
+
+def _get_generation_job(job_id: str) -> GenerationJob:
+    job = load_generation_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown generation job: {job_id}")
+    return job
+
+
+@app.post("/generation-jobs", status_code=202)
+async def submit_generation_job(config: str = Form(...)) -> dict:
+    """Queue dataset generation; poll ``/generation-jobs/{job_id}`` for progress.
+
+    Takes the same ``config`` as ``/generate-dataset``. The finished zip is
+    stored on disk and served by ``/generation-jobs/{job_id}/download``.
+    """
+    try:
+        _parse_generation_request(config)
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    job = await run_in_threadpool(create_generation_job, config)
+    generation_jobs.submit(job)
+    return {"job_id": job.job_id, "status": job.status}
+
+
+@app.get("/generation-jobs/{job_id}")
+async def get_generation_job(job_id: str) -> dict:
+    return generation_job_status(_get_generation_job(job_id))
+
+
+@app.post("/generation-jobs/{job_id}/cancel")
+async def cancel_generation_job(job_id: str) -> dict:
+    """Cancel a queued or running job; its partial output is discarded."""
+    job = _get_generation_job(job_id)
+    if job.status not in {"queued", "running"}:
+        raise HTTPException(status_code=409, detail=f"Generation job is {job.status}")
+    request_cancellation(job)
+    if generation_jobs.cancel_pending(job.job_id):
+        job = job.update(status="cancelled")
+    return generation_job_status(job)
+
+
+@app.get("/generation-jobs/{job_id}/download")
+async def download_generation_job(job_id: str) -> FileResponse:
+    job = _get_generation_job(job_id)
+    if job.status != "completed" or job.artefact is None:
+        raise HTTPException(status_code=409, detail=f"Generation job is {job.status}")
+    return FileResponse(job.path / job.artefact, media_type="application/zip", filename=job.artefact)
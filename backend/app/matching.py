@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Tuple
+
+try:  # Optional accelerator; plain substring checks are used when it is missing.
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
+_WHITESPACE = re.compile(r"\s+")
+_MATCHER_CACHE_SIZE = 4096
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase ``text`` and collapse whitespace runs, as matching expects."""
+    return _WHITESPACE.sub(" ", text.lower())
+
+
+def normalize_phrase(phrase: str) -> str:
+    return _WHITESPACE.sub(" ", phrase.strip().lower())
+
+
+class PhraseMatcher:
+    """Case- and whitespace-insensitive matcher for a fixed set of phrases.
+
+    With ``pyahocorasick`` installed every phrase is found in a single pass
+    over the text through one Aho-Corasick automaton; otherwise each distinct
+    phrase is looked up in the normalised text. A phrase that is blank after
+    normalisation matches any non-empty text, and an empty phrase never matches.
+    """
+
+    __slots__ = ("phrases", "backend", "_phrases_by_key", "_blank", "_automaton")
+
+    def __init__(self, phrases: Iterable[str], backend: str | None = None) -> None:
+        if backend is None:
+            backend = "ahocorasick" if ahocorasick is not None else "substring"
+        if backend not in {"ahocorasick", "substring"}:
+            raise ValueError(f"Unknown matcher backend: {backend}")
+        if backend == "ahocorasick" and ahocorasick is None:
+            raise ValueError("ahocorasick backend requested but pyahocorasick is not installed")
+        self.backend = backend
+        self.phrases: Tuple[str, ...] = tuple(dict.fromkeys(phrases))
+
+        phrases_by_key: Dict[str, List[str]] = {}
+        for phrase in self.phrases:
+            if phrase:
+                phrases_by_key.setdefault(normalize_phrase(phrase), []).append(phrase)
+        self._blank: Tuple[str, ...] = tuple(phrases_by_key.pop("", ()))
+        self._phrases_by_key = phrases_by_key
+
+        self._automaton = None
+        if backend == "ahocorasick" and phrases_by_key:
+            automaton = ahocorasick.Automaton()
+            for key in phrases_by_key:
+                automaton.add_word(key, key)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Return the phrases occurring in ``text``, already normalised with ``normalize_text``."""
+        if not text:
+            return frozenset()
+        if self._automaton is not None:
+            keys: Iterable[str] = {key for _, key in self._automaton.iter(text)}
+        else:
+            keys = [key for key in self._phrases_by_key if key in text]
+        found = set(self._blank)
+        for key in keys:
+            found.update(self._phrases_by_key[key])
+        return frozenset(found)
+
+
+@lru_cache(maxsize=_MATCHER_CACHE_SIZE)
+def compile_matcher(phrases: Tuple[str, ...]) -> PhraseMatcher:
+    """Return a shared matcher for ``phrases``; repeated phrase sets reuse one automaton."""
+    return PhraseMatcher(phrases)
+
+
+def find_phrases(phrases: Iterable[str], text: str) -> AbstractSet[str]:
+    """Match ``phrases`` against raw ``text`` in one pass."""
+    return compile_matcher(tuple(phrases)).find(normalize_text(text))
@@ -3,7 +3,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class IndustryVertical(str, Enum):
@@ -29,6 +29,20 @@ class BehaviourFlag(str, Enum):
     non_native_speaker = "NonNativeSpeaker"
 
 
+class OutputFormat(str, Enum):
+    json = "json"
+    jsonl_shards = "jsonl_shards"
+
+
+class ShardCompression(str, Enum):
+    none = "none"
+    gzip = "gzip"
+    zstd = "zstd"
+
+
+MAX_COVERAGE_STRENGTH = 4
+
+
 class GenerationRequest(BaseModel):
     vertical: IndustryVertical
     workflows: List[str] = Field(min_length=1)
@@ -40,6 +54,36 @@ class GenerationRequest(BaseModel):
     random_seed: Optional[int] = None
     min_turns: int = Field(default=5, ge=3, le=15)
     max_turns: int = Field(default=9, ge=3, le=15)
+    # Process-pool size for large plan-generation runs; output does not depend on it.
+    workers: int = Field(default=1, ge=1, le=64)
+    # Write dataset/golden/manifest JSON without indentation.
+    compact_json: bool = Field(default=False)
+    # Cover every t-way combination of axis values (a covering array) instead
+    # of the full cartesian product; None keeps the full product. Covering
+    # array construction grows steeply with t, and t can be at most the
+    # number of axes.
+    coverage_strength: Optional[int] = Field(default=None, ge=1, le=MAX_COVERAGE_STRENGTH)
+    # Generate at most this many conversations, sampled evenly per
+    # workflow/behaviour pair (seeded by random_seed); None generates all.
+    max_conversations: Optional[int] = Field(default=None, ge=1)
+    # "jsonl_shards" writes dataset and golden as bounded JSONL shards listed
+    # with counts and checksums in the manifest instead of two JSON documents.
+    output_format: OutputFormat = Field(default=OutputFormat.json)
+    # A shard is closed once it reaches either bound (bytes are counted
+    # before compression); with neither set a shard holds 10,000 conversations.
+    shard_max_records: Optional[int] = Field(default=None, ge=1)
+    shard_max_bytes: Optional[int] = Field(default=None, ge=1)
+    shard_compression: ShardCompression = Field(default=ShardCompression.none)
+
+    @model_validator(mode="after")
+    def _check_coverage_strength(self) -> "GenerationRequest":
+        # Without explicit axes the vertical's defaults apply; generation
+        # checks the strength against those.
+        if self.coverage_strength is not None and self.axes and self.coverage_strength > len(self.axes):
+            raise ValueError(
+                f"coverage_strength {self.coverage_strength} exceeds the number of axes ({len(self.axes)})"
+            )
+        return self
 
 
 class VerticalConfigResponse(BaseModel):
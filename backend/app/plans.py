@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
+
+from .models import BehaviourFlag, ConversationPlan, IndustryVertical
+
+_EMPTY_AXES: Mapping[str, str] = MappingProxyType({})
+
+
+def freeze_axes(axes: Mapping[str, str]) -> Mapping[str, str]:
+    """Return a read-only view of ``axes`` that plans and turns can share."""
+    if isinstance(axes, MappingProxyType):
+        return axes
+    return MappingProxyType(dict(axes)) if axes else _EMPTY_AXES
+
+
+@dataclass(frozen=True, slots=True)
+class TurnRecord:
+    """One planned turn; immutable so identical turns can be shared between plans.
+
+    ``axes`` only holds per-turn overrides; turns otherwise use their plan's axes.
+    """
+
+    speaker: str | None
+    role: str
+    text: str | None = None
+    behaviour: str | None = None
+    axes: Mapping[str, str] | None = None
+    variables: Mapping[str, Any] | None = None
+
+    @classmethod
+    def from_dict(
+        cls,
+        turn: Mapping[str, Any],
+        plan_axes: Mapping[str, str] | None = None,
+    ) -> "TurnRecord":
+        """Convert a ``ConversationPlan.turn_plan`` dict; axes equal to the plan's are dropped."""
+        text = turn.get("text")
+        behaviour = turn.get("behaviour")
+        if isinstance(behaviour, BehaviourFlag):
+            behaviour = behaviour.value
+        axes = turn.get("axes")
+        if not isinstance(axes, Mapping) or (plan_axes is not None and axes == plan_axes):
+            axes = None
+        variables = turn.get("variables")
+        return cls(
+            speaker=turn.get("speaker"),
+            role=turn.get("role", ""),
+            text=text if isinstance(text, str) else None,
+            behaviour=behaviour if isinstance(behaviour, str) else None,
+            axes=freeze_axes(axes) if axes is not None else None,
+            variables=dict(variables) if isinstance(variables, Mapping) else None,
+        )
+
+    def to_dict(self, plan_axes: Mapping[str, str]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"speaker": self.speaker, "role": self.role}
+        if self.speaker == "user":
+            payload["behaviour"] = self.behaviour
+            payload["axes"] = {**plan_axes, **(self.axes or {})}
+        elif self.behaviour is not None:
+            payload["behaviour"] = self.behaviour
+        if self.variables is not None:
+            payload["variables"] = dict(self.variables)
+        if self.text is not None:
+            payload["text"] = self.text
+        return payload
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            _restore_turn,
+            (
+                self.speaker,
+                self.role,
+                self.text,
+                self.behaviour,
+                dict(self.axes) if self.axes is not None else None,
+                self.variables,
+            ),
+        )
+
+
+@dataclass(slots=True)
+class PlanRecord:
+    """Internal, allocation-light counterpart of ``ConversationPlan``.
+
+    Used throughout generation and dataset building; ``axes`` is a shared
+    read-only mapping and turns are shared immutable records. Convert with
+    ``to_model``/``from_model`` at API boundaries.
+    """
+
+    vertical: IndustryVertical
+    workflow: str
+    scenario_id: str
+    behaviours: Tuple[BehaviourFlag, ...]
+    axes: Mapping[str, str]
+    turn_plan: Tuple[TurnRecord, ...]
+    domain_label: str = ""
+    behavior_label: str = ""
+    policy_excerpt: str = ""
+    facts_bullets: str = ""
+    short_description: str = ""
+
+    @classmethod
+    def from_model(cls, plan: ConversationPlan) -> "PlanRecord":
+        axes = freeze_axes(plan.axes)
+        return cls(
+            vertical=plan.vertical,
+            workflow=plan.workflow,
+            scenario_id=plan.scenario_id,
+            behaviours=tuple(plan.behaviours),
+            axes=axes,
+            turn_plan=tuple(TurnRecord.from_dict(turn, axes) for turn in plan.turn_plan),
+            domain_label=plan.domain_label,
+            behavior_label=plan.behavior_label,
+            policy_excerpt=plan.policy_excerpt,
+            facts_bullets=plan.facts_bullets,
+            short_description=plan.short_description,
+        )
+
+    def to_model(self) -> ConversationPlan:
+        return ConversationPlan(
+            vertical=self.vertical,
+            workflow=self.workflow,
+            scenario_id=self.scenario_id,
+            behaviours=list(self.behaviours),
+            axes=dict(self.axes),
+            turn_plan=[turn.to_dict(self.axes) for turn in self.turn_plan],
+            domain_label=self.domain_label,
+            behavior_label=self.behavior_label,
+            policy_excerpt=self.policy_excerpt,
+            facts_bullets=self.facts_bullets,
+            short_description=self.short_description,
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Mapping proxies cannot be pickled (process-pool results), so ship a
+        # plain dict and re-freeze it on the other side.
+        return (
+            _restore_plan,
+            (
+                self.vertical,
+                self.workflow,
+                self.scenario_id,
+                self.behaviours,
+                dict(self.axes),
+                self.turn_plan,
+                self.domain_label,
+                self.behavior_label,
+                self.policy_excerpt,
+                self.facts_bullets,
+                self.short_description,
+            ),
+        )
+
+
+def as_plan_record(plan: PlanRecord | ConversationPlan) -> PlanRecord:
+    if isinstance(plan, PlanRecord):
+        return plan
+    return PlanRecord.from_model(plan)
+
+
+def _restore_turn(
+    speaker: str | None,
+    role: str,
+    text: str | None,
+    behaviour: str | None,
+    axes: Dict[str, str] | None,
+    variables: Mapping[str, Any] | None,
+) -> TurnRecord:
+    return TurnRecord(
+        speaker,
+        role,
+        text,
+        behaviour,
+        freeze_axes(axes) if axes is not None else None,
+        variables,
+    )
+
+
+def _restore_plan(*fields: Any) -> PlanRecord:
+    plan = PlanRecord(*fields)
+    plan.axes = freeze_axes(plan.axes)
+    return plan
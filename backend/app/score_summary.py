@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+# Distinct actions/facts/phrases tracked for the "most missed" style lists.
+_TOP_CAPACITY = 1000
+_TOP_REPORTED = 20
+
+
+@dataclass(frozen=True)
+class SummaryLabels:
+    """Grouping keys of one golden entry used for the per-group pass rates."""
+
+    workflow: str | None = None
+    behaviours: Tuple[str, ...] = ()
+    axes: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_golden(cls, golden: Mapping[str, Any]) -> "SummaryLabels":
+        """Read labels from top-level keys, falling back to ``metadata``."""
+        metadata = golden.get("metadata")
+        if not isinstance(metadata, Mapping):
+            metadata = {}
+
+        workflow = golden.get("workflow") or metadata.get("workflow")
+
+        # ``metadata.behavior`` in generated datasets is the workflow's display
+        # label, not a behaviour flag, so it is never read here.
+        behaviours = golden.get("behaviours") or golden.get("behaviour")
+        if behaviours is None:
+            behaviours = metadata.get("behaviours") or metadata.get("behaviour")
+        if isinstance(behaviours, str):
+            behaviours = [behaviours]
+        if not isinstance(behaviours, list):
+            behaviours = []
+
+        axes = golden.get("axes")
+        if not isinstance(axes, Mapping):
+            axes = metadata.get("axes")
+        if not isinstance(axes, Mapping):
+            axes = {}
+
+        return cls(
+            workflow=str(workflow) if workflow else None,
+            behaviours=tuple(str(item) for item in behaviours if item is not None),
+            axes=tuple((str(axis), str(value)) for axis, value in axes.items()),
+        )
+
+
+@dataclass
+class _PassCounter:
+    total: int = 0
+    passed: int = 0
+
+    def add(self, passed: bool) -> None:
+        self.total += 1
+        self.passed += int(passed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"total": self.total, "passed": self.passed, "pass_rate": _rate(self.passed, self.total)}
+
+
+class TopCounter:
+    """Approximate heavy-hitter counts in bounded memory (Space-Saving).
+
+    Counts are exact while fewer than ``capacity`` distinct items are seen;
+    past that, an unseen item replaces the current minimum and inherits its
+    count, so reported counts are upper bounds.
+    """
+
+    __slots__ = ("capacity", "_counts")
+
+    def __init__(self, capacity: int = _TOP_CAPACITY) -> None:
+        self.capacity = capacity
+        self._counts: Dict[str, int] = {}
+
+    def update(self, items: Iterable[str]) -> None:
+        counts = self._counts
+        for item in items:
+            if item in counts:
+                counts[item] += 1
+            elif len(counts) < self.capacity:
+                counts[item] = 1
+            else:
+                evicted = min(counts, key=counts.__getitem__)
+                counts[item] = counts.pop(evicted) + 1
+
+    def most_common(self, limit: int = _TOP_REPORTED) -> List[Tuple[str, int]]:
+        return sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+@dataclass
+class ScoreSummary:
+    """Running aggregates over scored conversations.
+
+    Updated once per result while scoring, so the summary is available when
+    the last result is produced without re-reading the scored output. Memory
+    is bounded by the number of distinct workflows, behaviours and axis values
+    plus the fixed capacity of the most-missed counters.
+    """
+
+    overall: _PassCounter = field(default_factory=_PassCounter)
+    model_text_missing: int = 0
+    actions_total: int = 0
+    actions_matched: int = 0
+    facts_total: int = 0
+    facts_matched: int = 0
+    conversations_with_violations: int = 0
+    violations_total: int = 0
+    turns: _PassCounter = field(default_factory=_PassCounter)
+    by_turn_index: Dict[int, _PassCounter] = field(default_factory=dict)
+    by_workflow: Dict[str, _PassCounter] = field(default_factory=dict)
+    by_behaviour: Dict[str, _PassCounter] = field(default_factory=dict)
+    by_axis: Dict[str, Dict[str, _PassCounter]] = field(default_factory=dict)
+    missed_actions: TopCounter = field(default_factory=TopCounter)
+    missed_facts: TopCounter = field(default_factory=TopCounter)
+    violated_phrases: TopCounter = field(default_factory=TopCounter)
+
+    def add(self, result: Mapping[str, Any], labels: SummaryLabels | None = None) -> None:
+        passed = bool(result.get("overall_pass"))
+        self.overall.add(passed)
+        if not result.get("model_text_present"):
+            self.model_text_missing += 1
+
+        actions = result.get("expected_actions", {})
+        self.actions_total += actions.get("total", 0)
+        self.actions_matched += len(actions.get("matched", []))
+        self.missed_actions.update(actions.get("missed", []))
+
+        facts = result.get("key_facts", {})
+        self.facts_total += facts.get("total", 0)
+        self.facts_matched += len(facts.get("matched", []))
+        self.missed_facts.update(facts.get("missed", []))
+
+        policy = result.get("policy_violations", {})
+        violation_count = policy.get("violation_count", 0)
+        self.violations_total += violation_count
+        if violation_count:
+            self.conversations_with_violations += 1
+        self.violated_phrases.update(policy.get("violations", []))
+        for turn in result.get("turns", []):
+            turn_passed = bool(turn.get("passed"))
+            self.turns.add(turn_passed)
+            self.by_turn_index.setdefault(turn.get("turn_index"), _PassCounter()).add(turn_passed)
+
+        if labels is None:
+            return
+        if labels.workflow is not None:
+            self.by_workflow.setdefault(labels.workflow, _PassCounter()).add(passed)
+        for behaviour in labels.behaviours:
+            self.by_behaviour.setdefault(behaviour, _PassCounter()).add(passed)
+        for axis, value in labels.axes:
+            self.by_axis.setdefault(axis, {}).setdefault(value, _PassCounter()).add(passed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.overall.to_dict(),
+            "model_text_missing": self.model_text_missing,
+            "expected_actions": {
+                "total": self.actions_total,
+                "matched": self.actions_matched,
+                "match_rate": _rate(self.actions_matched, self.actions_total),
+                "most_missed": _top_list(self.missed_actions, "action"),
+            },
+            "key_facts": {
+                "total": self.facts_total,
+                "matched": self.facts_matched,
+                "match_rate": _rate(self.facts_matched, self.facts_total),
+                "most_missed": _top_list(self.missed_facts, "fact"),
+            },
+            "policy_violations": {
+                "total": self.violations_total,
+                "conversations": self.conversations_with_violations,
+                "most_common": _top_list(self.violated_phrases, "phrase"),
+            },
+            "turns": {
+                **self.turns.to_dict(),
+                "by_index": {
+                    str(index): counter.to_dict()
+                    for index, counter in sorted(self.by_turn_index.items())
+                },
+            },
+            "by_workflow": _group_dict(self.by_workflow),
+            "by_behaviour": _group_dict(self.by_behaviour),
+            "by_axis": {axis: _group_dict(values) for axis, values in sorted(self.by_axis.items())},
+        }
+
+
+def _rate(part: int, total: int) -> float | None:
+    return part / total if total else None
+
+
+def _group_dict(groups: Mapping[str, _PassCounter]) -> Dict[str, Dict[str, Any]]:
+    return {name: counter.to_dict() for name, counter in sorted(groups.items())}
+
+
+def _top_list(counter: TopCounter, label: str) -> List[Dict[str, Any]]:
+    return [{label: item, "count": count} for item, count in counter.most_common()]
+
+
+def compare_summaries(summaries: Mapping[str, ScoreSummary]) -> Dict[str, Any]:
+    """Side-by-side table of the headline metrics of several models.
+
+    Rows are metrics (overall rates, then pass rates per workflow, behaviour
+    and axis value); columns are ``metric`` followed by the model ids.
+    """
+    model_ids = list(summaries)
+    payloads = [summaries[model_id].to_dict() for model_id in model_ids]
+
+    metrics: Dict[str, List[Any]] = {
+        "pass_rate": [payload["pass_rate"] for payload in payloads],
+        "expected_actions.match_rate": [
+            payload["expected_actions"]["match_rate"] for payload in payloads
+        ],
+        "key_facts.match_rate": [payload["key_facts"]["match_rate"] for payload in payloads],
+        "policy_violations.total": [payload["policy_violations"]["total"] for payload in payloads],
+        "model_text_missing": [payload["model_text_missing"] for payload in payloads],
+    }
+    for group in ("by_workflow", "by_behaviour"):
+        for name in sorted({name for payload in payloads for name in payload[group]}):
+            metrics[f"{group[3:]}:{name}.pass_rate"] = [
+                payload[group].get(name, {}).get("pass_rate") for payload in payloads
+            ]
+    axes = sorted({axis for payload in payloads for axis in payload["by_axis"]})
+    for axis in axes:
+        values = sorted(
+            {value for payload in payloads for value in payload["by_axis"].get(axis, {})}
+        )
+        for value in values:
+            metrics[f"axis:{axis}={value}.pass_rate"] = [
+                payload["by_axis"].get(axis, {}).get(value, {}).get("pass_rate")
+                for payload in payloads
+            ]
+
+    return {
+        "models": model_ids,
+        "columns": ["metric", *model_ids],
+        "rows": [[metric, *values] for metric, values in metrics.items()],
+        "summaries": dict(zip(model_ids, payloads)),
+    }
@@ -1,53 +1,522 @@
 from __future__ import annotations
 
-import re
-from typing import Any, Dict, Iterable, List, Mapping, Sequence
+import multiprocessing
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import (
+    AbstractSet,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .cpus import available_cpus
+from .jsonl import JsonlOffsetIndex
+from .matching import PhraseMatcher, compile_matcher, find_phrases, normalize_text
+from .score_summary import ScoreSummary, SummaryLabels
+from .similarity import VariantSimilarity
+
+ModelLookup = Callable[[str], Mapping[str, Any] | None]
+GoldenLike = Union[Mapping[str, Any], "GoldenExpectations"]
+_ScoringItem = Tuple[GoldenLike, Tuple[Mapping[str, Any] | None, ...]]
+
+# Conversations sent to a scoring worker per task.
+SCORE_CHUNK_SIZE = 2000
+# Conversations scored inline before a process pool is started. Scoring costs
+# ~75-105us per conversation, but with a pool the parent still spends ~70us
+# pickling each item out and unpickling its result, against ~0.5s of spawning
+# and importing per worker. Even with idle cores the pool breaks even around
+# 20k raw golden entries (later still for precompiled indexes) and never on
+# a single core, so smaller runs (most requests) stay serial.
+SCORE_PARALLEL_MIN_CONVERSATIONS = 50_000
+
+# Similarity model of the current pool worker, set by ``_init_scoring_worker``.
+_worker_similarity: VariantSimilarity | None = None
 
 
 def score_dataset(
     golden_entries: Sequence[Mapping[str, Any]],
     model_entries: Sequence[Mapping[str, Any]],
+    *,
+    workers: int = 1,
+    chunk_size: int = SCORE_CHUNK_SIZE,
+    summary: ScoreSummary | None = None,
 ) -> List[Dict[str, Any]]:
-    """Score a dataset by aligning conversations and applying heuristics."""
+    """Score a dataset by aligning conversations and applying heuristics.
+
+    Pass a ``ScoreSummary`` to have aggregates accumulated while scoring.
+    Turn responses are also compared with their variants by similarity,
+    using a model fitted on the golden entries.
+    """
+    expectations = [_expectations(golden) for golden in golden_entries]
     model_index = _index_model_entries(model_entries)
-    results: List[Dict[str, Any]] = []
-    for golden in golden_entries:
-        conversation_id = _conversation_id(golden)
-        model = model_index.get(conversation_id)
-        results.append(score_conversation(golden, model))
+    return list(
+        iter_scored_conversations(
+            expectations,
+            model_index.get,
+            workers=workers,
+            chunk_size=chunk_size,
+            summary=summary,
+            similarity=fit_variant_similarity(expectations),
+        )
+    )
+
+
+def iter_scored_conversations(
+    golden_entries: Iterable[GoldenLike],
+    lookup_model: ModelLookup,
+    *,
+    workers: int = 1,
+    chunk_size: int = SCORE_CHUNK_SIZE,
+    summary: ScoreSummary | None = None,
+    similarity: VariantSimilarity | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """Score golden entries against model outputs found by id, in golden order.
+
+    With more than one worker (capped at the available CPUs), conversations
+    past the first ``SCORE_PARALLEL_MIN_CONVERSATIONS`` are scored in chunks of
+    ``chunk_size`` across a process pool; model outputs are still looked up
+    in the calling process, so ``lookup_model`` need not be picklable.
+    ``summary`` is updated with each result as it is yielded.
+    """
+    scored = iter_scored_comparisons(
+        golden_entries,
+        [lookup_model],
+        workers=workers,
+        chunk_size=chunk_size,
+        summaries=[summary] if summary is not None else None,
+        similarity=similarity,
+    )
+    try:
+        for results in scored:
+            yield results[0]
+    finally:
+        scored.close()
+
+
+def compare_models(
+    golden_entries: Sequence[Mapping[str, Any]],
+    model_entries: Mapping[str, Sequence[Mapping[str, Any]]],
+    *,
+    workers: int = 1,
+    chunk_size: int = SCORE_CHUNK_SIZE,
+    summaries: Mapping[str, ScoreSummary] | None = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Score several models' outputs against one golden dataset in one pass.
+
+    ``model_entries`` maps model ids to their outputs; results are returned
+    per model id in golden order.
+    """
+    expectations = [_expectations(golden) for golden in golden_entries]
+    model_ids = list(model_entries)
+    lookups = [_index_model_entries(model_entries[model_id]).get for model_id in model_ids]
+    results: Dict[str, List[Dict[str, Any]]] = {model_id: [] for model_id in model_ids}
+    for scored in iter_scored_comparisons(
+        expectations,
+        lookups,
+        workers=workers,
+        chunk_size=chunk_size,
+        summaries=[summaries[model_id] for model_id in model_ids] if summaries else None,
+        similarity=fit_variant_similarity(expectations),
+    ):
+        for model_id, result in zip(model_ids, scored):
+            results[model_id].append(result)
+    return results
+
+
+def iter_scored_comparisons(
+    golden_entries: Iterable[GoldenLike],
+    lookups: Sequence[ModelLookup],
+    *,
+    workers: int = 1,
+    chunk_size: int = SCORE_CHUNK_SIZE,
+    summaries: Sequence[ScoreSummary] | None = None,
+    similarity: VariantSimilarity | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Score each golden entry against every model, yielding one list per entry.
+
+    Each golden entry is parsed and its needles compiled once, then matched
+    against the output of each model (one result per lookup, in lookup order).
+    Entries may be raw golden mappings or precompiled ``GoldenExpectations``.
+    ``summaries`` pairs up with ``lookups`` and is updated as results are
+    yielded. With a ``similarity`` model fitted on the dataset's variants,
+    turn responses are also scored by similarity, a chunk at a time.
+    """
+    # Labels of entries handed to the scorer but not yet yielded back.
+    pending_labels: deque[SummaryLabels] = deque()
+
+    def items() -> Iterator[_ScoringItem]:
+        for golden in golden_entries:
+            if isinstance(golden, GoldenExpectations):
+                conversation_id = golden.conversation_id
+                labels = golden.labels
+            else:
+                conversation_id = _conversation_id(golden)
+                labels = SummaryLabels.from_golden(golden) if summaries is not None else None
+            if summaries is not None:
+                pending_labels.append(labels)
+            yield golden, tuple(lookup(conversation_id) for lookup in lookups)
+
+    scoring_items = items()
+    workers = min(workers, available_cpus())
+    if workers > 1:
+        results = _iter_scored_parallel(scoring_items, workers, chunk_size, similarity)
+    else:
+        results = _iter_scored_serial(scoring_items, chunk_size, similarity)
+    try:
+        for scored in results:
+            if summaries is not None:
+                labels = pending_labels.popleft()
+                for summary, result in zip(summaries, scored):
+                    summary.add(result, labels)
+            yield scored
+    finally:
+        results.close()
+
+
+def fit_variant_similarity(
+    golden_entries: Iterable["GoldenExpectations"],
+) -> VariantSimilarity | None:
+    """Fit the similarity model on the distinct turn variants; None if there are none."""
+    variants = {
+        variant: None
+        for golden in golden_entries
+        for turn in golden.turns
+        for variant in turn.variants
+    }
+    return VariantSimilarity(variants) if variants else None
+
+
+def _expectations(golden: GoldenLike) -> "GoldenExpectations":
+    if isinstance(golden, GoldenExpectations):
+        return golden
+    return GoldenExpectations.from_golden(golden)
+
+
+def _score_item(item: _ScoringItem) -> List[Dict[str, Any]]:
+    golden, models = item
+    expectations = _expectations(golden)
+    return [expectations.score(model) for model in models]
+
+
+def _score_chunk(
+    items: List[_ScoringItem],
+    similarity: VariantSimilarity | None = None,
+) -> List[List[Dict[str, Any]]]:
+    if similarity is None:
+        return [_score_item(item) for item in items]
+
+    expectations = [_expectations(golden) for golden, _ in items]
+    results = [
+        [expected.score(model) for model in models]
+        for expected, (_, models) in zip(expectations, items)
+    ]
+    # Every turn response of the chunk is compared with its variants in one batch.
+    texts: List[str] = []
+    candidates: List[Tuple[str, ...]] = []
+    targets: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for expected, (_, models), scored in zip(expectations, items, results):
+        if not expected.turns:
+            continue
+        for model, result in zip(models, scored):
+            aligned = ModelTurns(model)
+            for turn, turn_result in zip(expected.turns, result["turns"]):
+                texts.append(aligned.text_at(turn.turn_index))
+                candidates.append(turn.variants)
+                targets.append((result, turn_result))
+
+    for (result, turn_result), (variant, score) in zip(
+        targets, similarity.best_matches(texts, candidates)
+    ):
+        turn_result["similarity"] = score
+        turn_result["best_variant"] = variant
+        if not turn_result["passed"] and score >= similarity.threshold:
+            turn_result["passed"] = _checks_pass(turn_result)
+            result["overall_pass"] = _overall_pass(result)
     return results
 
 
+def _iter_scored_serial(
+    items: Iterator[_ScoringItem],
+    chunk_size: int,
+    similarity: VariantSimilarity | None,
+) -> Iterator[List[Dict[str, Any]]]:
+    if similarity is not None:
+        yield from _iter_scored_chunks(items, chunk_size, similarity)
+    else:
+        yield from (_score_item(item) for item in items)
+
+
+def _iter_scored_chunks(
+    items: Iterator[_ScoringItem],
+    chunk_size: int,
+    similarity: VariantSimilarity,
+) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield from _score_chunk(chunk, similarity)
+
+
+def _init_scoring_worker(similarity: VariantSimilarity | None) -> None:
+    global _worker_similarity
+    _worker_similarity = similarity
+
+
+def _score_worker_chunk(items: List[_ScoringItem]) -> List[List[Dict[str, Any]]]:
+    return _score_chunk(items, _worker_similarity)
+
+
+def _iter_scored_parallel(
+    items: Iterator[_ScoringItem],
+    workers: int,
+    chunk_size: int,
+    similarity: VariantSimilarity | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Score chunks across a process pool, yielding results in input order.
+
+    The first ``SCORE_PARALLEL_MIN_CONVERSATIONS`` items, and a remainder
+    that fits in one chunk, are scored inline, so runs below the break-even
+    never start the pool. At most ``2 * workers`` chunks are in flight to keep
+    memory bounded. The similarity model is sent to each worker once, when
+    the pool starts.
+    """
+    yield from _iter_scored_serial(
+        islice(items, SCORE_PARALLEL_MIN_CONVERSATIONS), chunk_size, similarity
+    )
+    chunk = list(islice(items, chunk_size))
+    if len(chunk) < chunk_size:
+        yield from _score_chunk(chunk, similarity)
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_scoring_worker,
+        initargs=(similarity,),
+    )
+    pending: deque[Future[List[List[Dict[str, Any]]]]] = deque()
+    try:
+        while chunk:
+            pending.append(executor.submit(_score_worker_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+            chunk = list(islice(items, chunk_size))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def index_model_outputs(file: BinaryIO, **kwargs: Any) -> JsonlOffsetIndex:
+    """Index a model-output JSONL file by conversation id without loading it."""
+    return JsonlOffsetIndex(file, key=_conversation_id, **kwargs).build()
+
+
+def _compile_matchers(
+    phrase_sets: Iterable[Tuple[str, ...]],
+    facts: Tuple[Tuple[str, str], ...],
+) -> Tuple[PhraseMatcher, ...]:
+    # Phrase sets such as a workflow's disallowed phrases repeat across
+    # conversations and reuse cached automatons; fact values are specific to
+    # one conversation, so they get their own matcher instead of evicting them.
+    matchers = [compile_matcher(phrases) for phrases in phrase_sets if phrases]
+    if facts:
+        matchers.append(PhraseMatcher(value for _, value in facts))
+    return tuple(matchers)
+
+
+def _find_all(matchers: Tuple[PhraseMatcher, ...], text: str) -> FrozenSet[str]:
+    """Union of the phrases each matcher finds in raw ``text``, normalised once."""
+    if not text or not matchers:
+        return frozenset()
+    normalized = normalize_text(text)
+    if len(matchers) == 1:
+        return matchers[0].find(normalized)
+    return frozenset().union(*(matcher.find(normalized) for matcher in matchers))
+
+
+@dataclass(frozen=True)
+class TurnExpectation:
+    """Checks on the agent response at one ``turn_index`` of a golden conversation.
+
+    ``variants`` are the acceptable responses. ``expected.expected_actions``,
+    ``expected.key_facts`` (a mapping or a list of values) and
+    ``expected.disallowed_phrases`` target this turn only: they are matched
+    against the aligned model response, not the whole conversation.
+    """
+
+    turn_index: int
+    variants: Tuple[str, ...] = ()
+    actions: Tuple[str, ...] = ()
+    facts: Tuple[Tuple[str, str], ...] = ()
+    disallowed: Tuple[str, ...] = ()
+    compiled_matchers: Tuple[PhraseMatcher, ...] | None = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_golden_turn(cls, turn: Mapping[str, Any]) -> "TurnExpectation | None":
+        """Read a ``GoldenTurnExpectation`` payload; None if it has no expectations."""
+        expected = turn.get("expected")
+        turn_index = turn.get("turn_index")
+        if not isinstance(expected, Mapping) or not isinstance(turn_index, int):
+            return None
+        facts = expected.get("key_facts", {})
+        if isinstance(facts, list):
+            facts = {str(value): value for value in facts if value is not None}
+        return cls(
+            turn_index=turn_index,
+            variants=tuple(_phrase_list(expected.get("variants", []))),
+            actions=tuple(_phrase_list(expected.get("expected_actions", []))),
+            facts=tuple(_fact_values(facts).items()) if isinstance(facts, Mapping) else (),
+            disallowed=tuple(_phrase_list(expected.get("disallowed_phrases", []))),
+        )
+
+    @property
+    def needles(self) -> Tuple[str, ...]:
+        return (
+            *self.variants,
+            *self.actions,
+            *(value for _, value in self.facts),
+            *self.disallowed,
+        )
+
+    @property
+    def matchers(self) -> Tuple[PhraseMatcher, ...]:
+        if self.compiled_matchers is not None:
+            return self.compiled_matchers
+        return _compile_matchers((self.variants, self.actions, self.disallowed), self.facts)
+
+    def compiled(self) -> "TurnExpectation":
+        return replace(self, compiled_matchers=self.matchers)
+
+    def score(self, model: Mapping[str, Any] | None) -> Dict[str, Any]:
+        """Score the model's response at this turn."""
+        return self.score_text(ModelTurns(model).text_at(self.turn_index))
+
+    def score_text(self, text: str) -> Dict[str, Any]:
+        """Score an already aligned turn response in one pass over its text."""
+        found = _find_all(self.matchers, text)
+        matched = [variant for variant in self.variants if variant in found]
+        result: Dict[str, Any] = {
+            "turn_index": self.turn_index,
+            "total": len(self.variants),
+            "matched": matched,
+            "passed": False,
+            "model_text_present": bool(text),
+        }
+        if self.actions:
+            result["expected_actions"] = _expected_actions_result(list(self.actions), found)
+        if self.facts:
+            result["key_facts"] = _key_facts_result(dict(self.facts), found)
+        if self.disallowed:
+            result["policy_violations"] = _policy_violations_result(list(self.disallowed), found)
+        result["passed"] = (bool(matched) or not self.variants) and _checks_pass(result)
+        return result
+
+
+@dataclass(frozen=True)
+class GoldenExpectations:
+    """The needles of one golden entry, derived once and reusable across models.
+
+    ``compiled_matchers`` optionally carries prebuilt matchers (see
+    ``compiled()``), which is what the on-disk golden index stores. ``turns``
+    holds the per-turn variant expectations of generated golden datasets.
+    """
+
+    conversation_id: str
+    actions: Tuple[str, ...] = ()
+    facts: Tuple[Tuple[str, str], ...] = ()
+    disallowed: Tuple[str, ...] = ()
+    turns: Tuple[TurnExpectation, ...] = ()
+    labels: SummaryLabels = field(default_factory=SummaryLabels)
+    compiled_matchers: Tuple[PhraseMatcher, ...] | None = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_golden(cls, golden: Mapping[str, Any]) -> "GoldenExpectations":
+        turns = golden.get("turns")
+        expectations = (
+            TurnExpectation.from_golden_turn(turn)
+            for turn in (turns if isinstance(turns, list) else [])
+            if isinstance(turn, Mapping)
+        )
+        return cls(
+            conversation_id=_conversation_id(golden),
+            actions=tuple(_phrase_list(golden.get("expected_actions", []))),
+            facts=tuple(_fact_values(golden.get("key_facts", {})).items()),
+            disallowed=tuple(
+                _phrase_list(golden.get("scoring_rules", {}).get("disallowed_phrases", []))
+            ),
+            turns=tuple(turn for turn in expectations if turn is not None),
+            labels=SummaryLabels.from_golden(golden),
+        )
+
+    @property
+    def needles(self) -> Tuple[str, ...]:
+        return (*self.actions, *(value for _, value in self.facts), *self.disallowed)
+
+    @property
+    def matchers(self) -> Tuple[PhraseMatcher, ...]:
+        if self.compiled_matchers is not None:
+            return self.compiled_matchers
+        return _compile_matchers((self.actions, self.disallowed), self.facts)
+
+    def compiled(self) -> "GoldenExpectations":
+        """Return a copy that carries its matchers, e.g. for persisting."""
+        return replace(
+            self,
+            turns=tuple(turn.compiled() for turn in self.turns),
+            compiled_matchers=self.matchers,
+        )
+
+    def score(self, model: Mapping[str, Any] | None) -> Dict[str, Any]:
+        """Score one model output against these expectations."""
+        model_text = _extract_model_text(model) if model else ""
+        found = _find_all(self.matchers, model_text)
+
+        actions_result = _expected_actions_result(list(self.actions), found)
+        facts_result = _key_facts_result(dict(self.facts), found)
+        policy_result = _policy_violations_result(list(self.disallowed), found)
+
+        result = {
+            "conversation_id": self.conversation_id,
+            "overall_pass": False,
+            "expected_actions": actions_result,
+            "key_facts": facts_result,
+            "policy_violations": policy_result,
+            "model_text_present": bool(model_text),
+        }
+        if self.turns:
+            # Model turns are aligned once; each check scans only its own turn.
+            aligned = ModelTurns(model)
+            result["turns"] = [turn.score_text(aligned.text_at(turn.turn_index)) for turn in self.turns]
+        result["overall_pass"] = _overall_pass(result)
+        return result
+
+
 def score_conversation(
     golden: Mapping[str, Any],
     model: Mapping[str, Any] | None,
 ) -> Dict[str, Any]:
-    """Score a single conversation using heuristic rules."""
-    conversation_id = _conversation_id(golden)
-    model_text = _extract_model_text(model) if model else ""
-
-    expected_actions = golden.get("expected_actions", [])
-    key_facts = golden.get("key_facts", {})
-    scoring_rules = golden.get("scoring_rules", {})
-
-    actions_result = score_expected_actions(expected_actions, model_text)
-    facts_result = score_key_facts(key_facts, model_text)
-    policy_result = score_policy_violations(scoring_rules, model_text)
-
-    overall_pass = (
-        actions_result["all_matched"]
-        and facts_result["all_matched"]
-        and policy_result["violation_count"] == 0
-    )
+    """Score a single conversation using heuristic rules.
 
-    return {
-        "conversation_id": conversation_id,
-        "overall_pass": overall_pass,
-        "expected_actions": actions_result,
-        "key_facts": facts_result,
-        "policy_violations": policy_result,
-        "model_text_present": bool(model_text),
-    }
+    The model text is normalised once and scanned by a matcher per needle
+    group: shared (cached) ones for actions and disallowed phrases, and one
+    for the conversation's fact values.
+    """
+    return GoldenExpectations.from_golden(golden).score(model)
 
 
 def score_expected_actions(
@@ -55,9 +524,39 @@ def score_expected_actions(
     model_text: str,
 ) -> Dict[str, Any]:
     """Check whether expected actions appear in the model output text."""
-    actions = [str(action) for action in expected_actions if action is not None]
-    matched = [action for action in actions if _contains_text(model_text, action)]
-    missed = [action for action in actions if action not in matched]
+    actions = _phrase_list(expected_actions)
+    return _expected_actions_result(actions, find_phrases(actions, model_text))
+
+
+def score_key_facts(
+    key_facts: Mapping[str, Any],
+    model_text: str,
+) -> Dict[str, Any]:
+    """Check whether key fact values appear in the model output text."""
+    facts = _fact_values(key_facts)
+    return _key_facts_result(facts, find_phrases(facts.values(), model_text))
+
+
+def score_policy_violations(
+    scoring_rules: Mapping[str, Any],
+    model_text: str,
+) -> Dict[str, Any]:
+    """Detect disallowed phrases based on policy rules."""
+    phrases = _phrase_list(scoring_rules.get("disallowed_phrases", []))
+    return _policy_violations_result(phrases, find_phrases(phrases, model_text))
+
+
+def _phrase_list(items: Iterable[Any]) -> List[str]:
+    return [str(item) for item in items if item is not None]
+
+
+def _fact_values(key_facts: Mapping[str, Any]) -> Dict[str, str]:
+    return {str(key): str(value) for key, value in key_facts.items()}
+
+
+def _expected_actions_result(actions: List[str], found: AbstractSet[str]) -> Dict[str, Any]:
+    matched = [action for action in actions if action in found]
+    missed = [action for action in actions if action not in found]
     return {
         "total": len(actions),
         "matched": matched,
@@ -66,14 +565,9 @@ def score_expected_actions(
     }
 
 
-def score_key_facts(
-    key_facts: Mapping[str, Any],
-    model_text: str,
-) -> Dict[str, Any]:
-    """Check whether key fact values appear in the model output text."""
-    facts = {str(key): str(value) for key, value in key_facts.items()}
-    matched = [key for key, value in facts.items() if _contains_text(model_text, value)]
-    missed = [key for key in facts if key not in matched]
+def _key_facts_result(facts: Dict[str, str], found: AbstractSet[str]) -> Dict[str, Any]:
+    matched = [key for key, value in facts.items() if value in found]
+    missed = [key for key, value in facts.items() if value not in found]
     return {
         "total": len(facts),
         "matched": matched,
@@ -82,14 +576,21 @@ def score_key_facts(
     }
 
 
-def score_policy_violations(
-    scoring_rules: Mapping[str, Any],
-    model_text: str,
-) -> Dict[str, Any]:
-    """Detect disallowed phrases based on policy rules."""
-    disallowed = scoring_rules.get("disallowed_phrases", [])
-    phrases = [str(item) for item in disallowed if item is not None]
-    violations = [phrase for phrase in phrases if _contains_text(model_text, phrase)]
+def _checks_pass(result: Mapping[str, Any]) -> bool:
+    """Whether the action, fact and policy checks present in ``result`` all pass."""
+    return (
+        result.get("expected_actions", {}).get("all_matched", True)
+        and result.get("key_facts", {}).get("all_matched", True)
+        and result.get("policy_violations", {}).get("violation_count", 0) == 0
+    )
+
+
+def _overall_pass(result: Mapping[str, Any]) -> bool:
+    return _checks_pass(result) and all(turn["passed"] for turn in result.get("turns", ()))
+
+
+def _policy_violations_result(phrases: List[str], found: AbstractSet[str]) -> Dict[str, Any]:
+    violations = [phrase for phrase in phrases if phrase in found]
     return {
         "violation_count": len(violations),
         "violations": violations,
@@ -116,6 +617,19 @@ def _conversation_id(entry: Mapping[str, Any]) -> str:
     )
 
 
+_AGENT_SPEAKERS = {"assistant", "agent"}
+
+
+def _is_agent_turn(turn: Any) -> bool:
+    return isinstance(turn, Mapping) and turn.get("speaker") in _AGENT_SPEAKERS
+
+
+def _is_aligned_agent_turn(turn: Any) -> bool:
+    # Per-turn alignment also accepts role-only turns (chat-style outputs);
+    # conversation-level text keeps reading ``speaker`` only.
+    return isinstance(turn, Mapping) and (turn.get("speaker") or turn.get("role")) in _AGENT_SPEAKERS
+
+
 def _extract_model_text(model: Mapping[str, Any] | None) -> str:
     """Extract a unified text string from a model output entry."""
     if not model:
@@ -130,9 +644,7 @@ def _extract_model_text(model: Mapping[str, Any] | None) -> str:
     if isinstance(turns, list):
         parts: List[str] = []
         for turn in turns:
-            if not isinstance(turn, Mapping):
-                continue
-            if turn.get("speaker") in {"assistant", "agent"}:
+            if _is_agent_turn(turn):
                 text = turn.get("text") or turn.get("output")
                 if isinstance(text, str):
                     parts.append(text)
@@ -141,10 +653,39 @@ def _extract_model_text(model: Mapping[str, Any] | None) -> str:
     return ""
 
 
-def _contains_text(haystack: str, needle: str) -> bool:
-    """Case-insensitive substring match with whitespace normalization."""
-    if not haystack or not needle:
-        return False
-    return re.sub(r"\s+", " ", needle.strip().lower()) in re.sub(
-        r"\s+", " ", haystack.lower()
-    )
+class ModelTurns:
+    """The agent responses of one model output, addressable by golden ``turn_index``.
+
+    Agent turns (``speaker`` or ``role`` of assistant/agent) are indexed once
+    by their own ``turn_index``, or by position when it is absent. The
+    response for a golden turn is the first agent turn at or after its index,
+    found by bisection. Outputs without turns are a single response.
+    """
+
+    __slots__ = ("_reach", "_texts")
+
+    def __init__(self, model: Mapping[str, Any] | None) -> None:
+        # Running maximum of the turn indexes seen so far, so the first turn
+        # at or after an index is a bisection even if indexes are unordered.
+        self._reach: List[int] | None = None
+        turns = model.get("turns") if model else None
+        if not isinstance(turns, list) or not turns:
+            self._texts = [_extract_model_text(model)]
+            return
+        self._texts = []
+        reach: List[int] = []
+        for position, turn in enumerate(turns):
+            if not _is_aligned_agent_turn(turn):
+                continue
+            index = turn.get("turn_index", position)
+            text = turn.get("text") or turn.get("output")
+            if isinstance(index, int) and isinstance(text, str):
+                reach.append(max(index, reach[-1]) if reach else index)
+                self._texts.append(text)
+        self._reach = reach
+
+    def text_at(self, turn_index: int) -> str:
+        if self._reach is None:
+            return self._texts[0]
+        position = bisect_left(self._reach, turn_index)
+        return self._texts[position] if position < len(self._texts) else ""
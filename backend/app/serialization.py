@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from typing import Any, BinaryIO, Iterable, Iterator, Mapping
+
+try:  # Optional accelerator; the stdlib encoder is used when it is missing.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+_ITEM_INDENT = b"    "
+_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class JsonSerializer:
+    """UTF-8 JSON encoder used for every generated artefact.
+
+    Output is either indented by two spaces (the historical format) or
+    compact. ``backend`` is ``"orjson"`` when that package is installed and
+    ``"json"`` otherwise; both produce the same layout.
+    """
+
+    def __init__(self, *, compact: bool = False, backend: str | None = None) -> None:
+        if backend is None:
+            backend = "orjson" if orjson is not None else "json"
+        if backend not in {"orjson", "json"}:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        if backend == "orjson" and orjson is None:
+            raise ValueError("orjson backend requested but orjson is not installed")
+        self.backend = backend
+        self.compact = compact
+
+    def dumps(self, value: Any) -> bytes:
+        if self.backend == "orjson":
+            return orjson.dumps(value, option=0 if self.compact else orjson.OPT_INDENT_2)
+        if self.compact:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return json.dumps(value, ensure_ascii=False, indent=2).encode("utf-8")
+
+    def document_prefix(self, header: Mapping[str, Any], items_key: str) -> bytes:
+        """Render a document up to and including its last array's opening bracket."""
+        head = self.dumps({**header, items_key: []})
+        # The items key is always last, so the dump ends with `[]}` (or `[]\n}`).
+        closing = b"[]}" if self.compact else b"[]\n}"
+        return head[: -len(closing)] + b"["
+
+    def document_suffix(self, has_items: bool) -> bytes:
+        if self.compact:
+            return b"]}"
+        return b"\n  ]\n}" if has_items else b"]\n}"
+
+    def format_item(self, item: Any, first: bool) -> bytes:
+        """Render one array item positioned inside the document."""
+        body = self.dumps(item)
+        if self.compact:
+            return body if first else b"," + body
+        body = _ITEM_INDENT + body.replace(b"\n", b"\n" + _ITEM_INDENT)
+        return (b"\n" if first else b",\n") + body
+
+
+def get_serializer(compact: bool = False) -> JsonSerializer:
+    return JsonSerializer(compact=compact)
+
+
+def iter_json_document(
+    header: Mapping[str, Any],
+    items_key: str,
+    items: Iterable[Any],
+    serializer: JsonSerializer | None = None,
+) -> Iterator[bytes]:
+    """Yield a JSON document chunk by chunk with ``items`` as its last array.
+
+    In indented mode the concatenated output is identical to ``json.dumps({
+    **header, items_key: list(items)}, ensure_ascii=False, indent=2)`` but only
+    one item is held in memory at a time.
+    """
+    serializer = serializer or get_serializer()
+    yield serializer.document_prefix(header, items_key)
+    first = True
+    for item in items:
+        yield serializer.format_item(item, first)
+        first = False
+    yield serializer.document_suffix(not first)
+
+
+class JsonArraySpool:
+    """Buffer array items on a spooled temp file and replay them as a document.
+
+    Used when a second document is produced during the same pass as the one
+    currently being streamed; items spill to disk once the buffer grows past
+    ``max_size`` so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        max_size: int = _SPOOL_MAX_SIZE,
+        serializer: JsonSerializer | None = None,
+    ) -> None:
+        self._file: BinaryIO = tempfile.SpooledTemporaryFile(max_size=max_size)
+        self._serializer = serializer or get_serializer()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, item: Any) -> None:
+        self._file.write(self._serializer.format_item(item, self._count == 0))
+        self._count += 1
+
+    def iter_document(self, header: Mapping[str, Any], items_key: str) -> Iterator[bytes]:
+        """Yield the full document and release the spool once exhausted."""
+        try:
+            yield self._serializer.document_prefix(header, items_key)
+            self._file.seek(0)
+            while True:
+                chunk = self._file.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+            yield self._serializer.document_suffix(self._count > 0)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._file.close()
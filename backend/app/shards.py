@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+from .archive import ArchiveEntry
+from .models import GenerationRequest, OutputFormat, ShardCompression
+from .serialization import JsonSerializer, get_serializer
+
+try:  # Optional; only needed for shard_compression="zstd".
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Conversations per shard when the request sets neither bound.
+DEFAULT_SHARD_RECORDS = 10_000
+
+_SUFFIXES = {
+    ShardCompression.none: ".jsonl",
+    ShardCompression.gzip: ".jsonl.gz",
+    ShardCompression.zstd: ".jsonl.zst",
+}
+_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+_READ_CHUNK_SIZE = 64 * 1024
+_WRITE_CHUNK_SIZE = 64 * 1024
+
+# One conversation's eval dataset entry and golden entry.
+ShardedConversation = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class ShardOptions:
+    """How ``iter_sharded_archive_entries`` splits and compresses its output."""
+
+    max_records: int | None = None
+    max_bytes: int | None = None
+    compression: ShardCompression = ShardCompression.none
+
+    def __post_init__(self) -> None:
+        if self.max_records is None and self.max_bytes is None:
+            object.__setattr__(self, "max_records", DEFAULT_SHARD_RECORDS)
+        if self.compression == ShardCompression.zstd and zstandard is None:
+            raise ValueError("zstd shard compression requested but zstandard is not installed")
+
+    @classmethod
+    def from_request(cls, request: GenerationRequest) -> "ShardOptions | None":
+        """Shard options for ``request``, or None for the single-document output."""
+        if request.output_format != OutputFormat.jsonl_shards:
+            return None
+        return cls(request.shard_max_records, request.shard_max_bytes, request.shard_compression)
+
+    @property
+    def suffix(self) -> str:
+        return _SUFFIXES[self.compression]
+
+    def is_full(self, records: int, size: int) -> bool:
+        return (self.max_records is not None and records >= self.max_records) or (
+            self.max_bytes is not None and size >= self.max_bytes
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "format": OutputFormat.jsonl_shards.value,
+            "compression": self.compression.value,
+            "max_records": self.max_records,
+            "max_bytes": self.max_bytes,
+        }
+
+
+@dataclass
+class _ShardEncoder:
+    """Compress JSONL lines for one shard, tracking its counts and checksum."""
+
+    compression: ShardCompression
+    records: int = 0
+    raw_bytes: int = 0
+    size: int = 0
+    _digest: Any = field(default_factory=hashlib.sha256)
+    _compressor: Any = None
+
+    def __post_init__(self) -> None:
+        if self.compression == ShardCompression.gzip:
+            # wbits=31 writes a gzip member with a zero mtime, so shards are reproducible.
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif self.compression == ShardCompression.zstd:
+            self._compressor = zstandard.ZstdCompressor().compressobj()
+
+    def encode(self, line: bytes) -> bytes:
+        self.records += 1
+        self.raw_bytes += len(line)
+        return self._output(self._compressor.compress(line) if self._compressor else line)
+
+    def finish(self) -> bytes:
+        return self._output(self._compressor.flush() if self._compressor else b"")
+
+    def describe(self, path: str) -> Dict[str, Any]:
+        return {
+            "path": path,
+            "records": self.records,
+            "bytes": self.size,
+            "uncompressed_bytes": self.raw_bytes,
+            "sha256": self._digest.hexdigest(),
+        }
+
+    def _output(self, data: bytes) -> bytes:
+        self._digest.update(data)
+        self.size += len(data)
+        return data
+
+
+def iter_sharded_archive_entries(
+    conversations: Iterable[ShardedConversation],
+    dataset_id: str,
+    options: ShardOptions,
+    shards: Dict[str, List[Dict[str, Any]]],
+    serializer: JsonSerializer | None = None,
+) -> Iterator[ArchiveEntry]:
+    """Yield dataset and golden JSONL shards as alternating archive entries.
+
+    Dataset shard ``i`` holds the eval entries of a run of conversations
+    until a bound in ``options`` is reached; golden shard ``i`` holds the
+    golden entries of the same conversations and is spooled while the dataset
+    shard streams. Each finished shard is described (path, record count,
+    sizes and SHA-256 of its bytes) in ``shards["dataset"]`` and
+    ``shards["golden"]``.
+    """
+    serializer = serializer or get_serializer(compact=True)
+    if not serializer.compact:
+        raise ValueError("JSONL shards need a compact serializer")
+    conversations = iter(conversations)
+    pending = next(conversations, None)
+    shards.setdefault("dataset", [])
+    shards.setdefault("golden", [])
+    index = 0
+    while pending is not None:
+        dataset_path = f"shards/{dataset_id}.dataset.{index:05d}{options.suffix}"
+        golden_path = f"shards/{dataset_id}.golden.{index:05d}{options.suffix}"
+        dataset = _ShardEncoder(options.compression)
+        golden = _ShardEncoder(options.compression)
+        golden_spool: BinaryIO = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+
+        def dataset_chunks() -> Iterator[bytes]:
+            nonlocal pending
+            buffer: List[bytes] = []
+            buffered = 0
+            while pending is not None and not options.is_full(dataset.records, dataset.raw_bytes):
+                eval_entry, golden_entry = pending
+                chunk = dataset.encode(serializer.dumps(eval_entry) + b"\n")
+                golden_spool.write(golden.encode(serializer.dumps(golden_entry) + b"\n"))
+                buffer.append(chunk)
+                buffered += len(chunk)
+                if buffered >= _WRITE_CHUNK_SIZE:
+                    yield b"".join(buffer)
+                    buffer.clear()
+                    buffered = 0
+                pending = next(conversations, None)
+            buffer.append(dataset.finish())
+            golden_spool.write(golden.finish())
+            yield b"".join(buffer)
+            shards["dataset"].append(dataset.describe(dataset_path))
+
+        try:
+            yield dataset_path, dataset_chunks()
+            yield golden_path, _iter_spool(golden_spool)
+            shards["golden"].append(golden.describe(golden_path))
+        finally:
+            golden_spool.close()
+        index += 1
+
+
+def _iter_spool(file: BinaryIO) -> Iterator[bytes]:
+    file.seek(0)
+    while True:
+        chunk = file.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Cosine similarity at which a response counts as a paraphrase of a variant.
+DEFAULT_SIMILARITY_THRESHOLD = 0.5
+# Upper bound on the dense query matrix of one batch (rows x vocabulary).
+_MAX_BATCH_CELLS = 1 << 22
+_MAX_BATCH_ROWS = 1024
+_TOKEN = re.compile(r"\w+")
+
+
+def _ngrams(text: str) -> Counter[str]:
+    """Word unigrams and bigrams of lowercased ``text`` with their counts."""
+    tokens = _TOKEN.findall(text.lower())
+    grams = Counter(tokens)
+    grams.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return grams
+
+
+class VariantSimilarity:
+    """TF-IDF cosine similarity of responses to the expected variants of a dataset.
+
+    Fitted once per golden dataset on its distinct variant texts: the
+    vocabulary, IDF weights and normalised variant vectors (kept sparse, in
+    CSR arrays) are computed up front and reused for every response. Terms
+    that occur in no variant still count towards a response's norm but can
+    never match. ``best_matches`` scores whole batches of responses with
+    array operations instead of comparing texts pairwise.
+    """
+
+    def __init__(
+        self,
+        variants: Iterable[str],
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ) -> None:
+        self.threshold = threshold
+        self.variants: Tuple[str, ...] = tuple(dict.fromkeys(variants))
+        self._rows: Dict[str, int] = {variant: row for row, variant in enumerate(self.variants)}
+
+        counts = [_ngrams(variant) for variant in self.variants]
+        vocabulary: Dict[str, int] = {}
+        for grams in counts:
+            for gram in grams:
+                vocabulary.setdefault(gram, len(vocabulary))
+        self._vocabulary = vocabulary
+
+        document_frequency = np.zeros(len(vocabulary), dtype=np.float64)
+        for grams in counts:
+            document_frequency[[vocabulary[gram] for gram in grams]] += 1
+        documents = len(self.variants)
+        # Smoothed IDF; a term absent from every variant gets the highest weight.
+        self._idf = np.log((1 + documents) / (1 + document_frequency)) + 1
+        self._unseen_idf = float(np.log(1 + documents) + 1)
+
+        self._indptr = np.zeros(documents + 1, dtype=np.int64)
+        indices: List[np.ndarray] = []
+        data: List[np.ndarray] = []
+        for row, grams in enumerate(counts):
+            columns = np.fromiter((vocabulary[gram] for gram in grams), dtype=np.int64, count=len(grams))
+            indices.append(columns)
+            data.append(np.fromiter(grams.values(), dtype=np.float64, count=len(grams)))
+            self._indptr[row + 1] = self._indptr[row] + len(grams)
+        self._indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+        values = np.concatenate(data) if data else np.zeros(0, dtype=np.float64)
+        weights = (1 + np.log(values)) * self._idf[self._indices] if values.size else values
+        rows = np.repeat(np.arange(documents), np.diff(self._indptr))
+        norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=documents))
+        self._data = np.divide(
+            weights,
+            norms[rows],
+            out=np.zeros_like(weights),
+            where=norms[rows] > 0,
+        )
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+    def best_matches(
+        self,
+        texts: Sequence[str],
+        candidates: Sequence[Sequence[str]],
+    ) -> List[Tuple[str | None, float]]:
+        """Return the most similar candidate variant of each text and its cosine.
+
+        ``candidates[i]`` lists the variants acceptable for ``texts[i]``; each
+        must be one the model was fitted on. A text with no candidates, or no
+        term shared with any of them, gets ``(None, 0.0)``.
+        """
+        if len(texts) != len(candidates):
+            raise ValueError("texts and candidates must have the same length")
+        batch_size = max(1, min(_MAX_BATCH_ROWS, _MAX_BATCH_CELLS // max(len(self._vocabulary), 1)))
+        matches: List[Tuple[str | None, float]] = []
+        for start in range(0, len(texts), batch_size):
+            stop = start + batch_size
+            matches.extend(self._best_matches(texts[start:stop], candidates[start:stop]))
+        return matches
+
+    def _best_matches(
+        self,
+        texts: Sequence[str],
+        candidates: Sequence[Sequence[str]],
+    ) -> List[Tuple[str | None, float]]:
+        queries = self._query_matrix(texts)
+
+        # One (text, variant) pair per candidate, expanded to the variant's
+        # non-zero terms; every dot product is then one gather and a bincount.
+        pair_rows: List[int] = []
+        pair_texts: List[int] = []
+        for position, variants in enumerate(candidates):
+            for variant in variants:
+                row = self._rows.get(variant)
+                if row is None:
+                    raise ValueError(f"Variant was not part of the fitted dataset: {variant!r}")
+                pair_rows.append(row)
+                pair_texts.append(position)
+        if not pair_rows:
+            return [(None, 0.0)] * len(texts)
+
+        rows = np.asarray(pair_rows, dtype=np.int64)
+        lengths = self._indptr[rows + 1] - self._indptr[rows]
+        pair_of_term = np.repeat(np.arange(len(rows)), lengths)
+        term_offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        terms = np.repeat(self._indptr[rows], lengths) + term_offsets
+        products = (
+            queries[np.asarray(pair_texts, dtype=np.int64)[pair_of_term], self._indices[terms]]
+            * self._data[terms]
+        )
+        scores = np.bincount(pair_of_term, weights=products, minlength=len(rows))
+
+        matches: List[Tuple[str | None, float]] = [(None, 0.0)] * len(texts)
+        start = 0
+        for position, variants in enumerate(candidates):
+            stop = start + len(variants)
+            if stop > start:
+                best = start + int(np.argmax(scores[start:stop]))
+                score = float(scores[best])
+                if score > 0:
+                    matches[position] = (self.variants[pair_rows[best]], min(score, 1.0))
+            start = stop
+        return matches
+
+    def _query_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Dense, L2-normalised TF-IDF rows of ``texts`` over the fitted vocabulary."""
+        vocabulary = self._vocabulary
+        matrix = np.zeros((len(texts), len(vocabulary)), dtype=np.float64)
+        unseen = np.zeros(len(texts), dtype=np.float64)
+        for row, text in enumerate(texts):
+            grams = _ngrams(text)
+            columns: List[int] = []
+            values: List[int] = []
+            for gram, count in grams.items():
+                column = vocabulary.get(gram)
+                if column is None:
+                    unseen[row] += ((1 + np.log(count)) * self._unseen_idf) ** 2
+                else:
+                    columns.append(column)
+                    values.append(count)
+            matrix[row, columns] = values
+
+        present = matrix > 0
+        matrix[present] = 1 + np.log(matrix[present])
+        matrix *= self._idf
+        norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix) + unseen)
+        np.divide(matrix, norms[:, None], out=matrix, where=norms[:, None] > 0)
+        return matrix
@@ -1,11 +1,96 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping
+import threading
+from dataclasses import dataclass, field
+from string import Formatter
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Sequence, Tuple
 
-from .config_loader import load_vertical_templates
+from . import config_loader
 from .models import BehaviourFlag, IndustryVertical
 
+_MISSING = object()
+
+_engine_lock = threading.Lock()
+# (config root, vertical) -> (templates object the engine was built from, engine)
+_engine_cache: Dict[Tuple[str, str], Tuple[Dict[str, Any], "TemplateEngine"]] = {}
+
+# (workflow, speaker, role, behaviour); None marks an unconstrained field.
+_BucketKey = Tuple[str | None, str | None, str | None, str | None]
+
+_CONVERSIONS: Dict[str, Callable[[Any], str]] = {"s": str, "r": repr, "a": ascii}
+
+# (literal text, placeholder name or None, conversion, format spec)
+_Segment = Tuple[str, str | None, str | None, str]
+
+
+class CompiledTemplate:
+    """Template text parsed once into literal segments and placeholder slots.
+
+    Rendering resolves each slot against ``scopes`` in order (first hit wins)
+    and joins the pieces, which is equivalent to ``str.format_map`` over the
+    merged scopes without re-parsing the template or building that mapping.
+    """
+
+    __slots__ = ("text", "placeholders", "_segments")
+
+    def __init__(self, text: str, segments: Sequence[_Segment]) -> None:
+        self.text = text
+        self._segments = tuple(segments)
+        self.placeholders = tuple(
+            dict.fromkeys(name for _, name, _, _ in self._segments if name is not None)
+        )
+
+    @classmethod
+    def compile(cls, text: str) -> "CompiledTemplate | None":
+        """Compile ``text``, or return None when it needs ``str.format`` itself.
+
+        Positional fields, attribute/index lookups, nested format specs and
+        malformed templates are left to the regular formatter, which keeps
+        their exact behaviour (including the errors it raises).
+        """
+        segments: List[_Segment] = []
+        try:
+            for literal, name, spec, conversion in Formatter().parse(text):
+                if name is None:
+                    segments.append((literal, None, None, ""))
+                    continue
+                if not name.isidentifier() or "{" in (spec or ""):
+                    return None
+                if conversion is not None and conversion not in _CONVERSIONS:
+                    return None
+                segments.append((literal, name, conversion, spec or ""))
+        except ValueError:
+            return None
+        return cls(text, segments)
+
+    def render(
+        self,
+        scopes: Sequence[Mapping[str, Any]],
+        missing: Callable[[str], Any],
+    ) -> str:
+        parts: List[str] = []
+        for literal, name, conversion, spec in self._segments:
+            if literal:
+                parts.append(literal)
+            if name is None:
+                continue
+            for scope in scopes:
+                if name in scope:
+                    value = scope[name]
+                    break
+            else:
+                value = missing(name)
+            if conversion is not None:
+                value = _CONVERSIONS[conversion](value)
+            if spec or type(value) is not str:
+                value = format(value, spec)
+            parts.append(value)
+        return "".join(parts)
+
+
+def _raise_missing(name: str) -> Any:
+    raise KeyError(name)
+
 
 @dataclass(frozen=True)
 class TemplateCandidate:
@@ -15,6 +100,12 @@ class TemplateCandidate:
     role: str | None = None
     behaviour: str | None = None
     axes: Dict[str, Any] | None = None
+    compiled: CompiledTemplate | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "compiled", CompiledTemplate.compile(self.text))
 
     def match_score(
         self,
@@ -57,16 +148,53 @@ class TemplateCandidate:
                 score += 1
         return score
 
+    def specificity(self) -> int:
+        """Score this candidate gets from ``match_score`` whenever it matches."""
+        score = sum(
+            field is not None
+            for field in (self.workflow, self.speaker, self.role, self.behaviour)
+        )
+        if self.axes:
+            score += len(self.axes)
+        return score
+
+    def axes_match(self, axes: Mapping[str, str]) -> bool:
+        if not self.axes:
+            return True
+        for key, value in self.axes.items():
+            if key not in axes:
+                return False
+            if isinstance(value, list):
+                if axes[key] not in value:
+                    return False
+            elif axes[key] != value:
+                return False
+        return True
+
 
 class TemplateEngine:
     def __init__(self, templates: Dict[str, Any]) -> None:
         self._raw_templates = templates
         self._candidates = self._build_candidates(templates)
+        self._index = self._build_index(self._candidates)
+        self._constrained_axes = sorted(
+            {key for candidate in self._candidates if candidate.axes for key in candidate.axes}
+        )
+        self._selection_memo: Dict[Hashable, TemplateCandidate | None] = {}
 
     @classmethod
     def from_vertical(cls, vertical: IndustryVertical | str) -> "TemplateEngine":
-        templates = load_vertical_templates(vertical)
-        return cls(templates)
+        """Return the shared engine for a vertical, rebuilt when templates change."""
+        templates = config_loader.get_cached_templates(vertical).templates
+        vertical_key = vertical.value if isinstance(vertical, IndustryVertical) else vertical
+        key = (str(config_loader.CONFIG_DIR), vertical_key)
+        with _engine_lock:
+            cached = _engine_cache.get(key)
+            if cached is not None and cached[0] is templates:
+                return cached[1]
+            engine = cls(templates)
+            _engine_cache[key] = (templates, engine)
+            return engine
 
     def realise_turn(
         self,
@@ -106,6 +234,8 @@ class TemplateEngine:
             render_context.update(variables)
 
         try:
+            if selected.compiled is not None:
+                return selected.compiled.render((render_context,), _raise_missing)
             return selected.text.format(**render_context)
         except KeyError as exc:
             raise ValueError(
@@ -138,17 +268,85 @@ class TemplateEngine:
         behaviour: str | None,
         axes: Mapping[str, str],
     ) -> TemplateCandidate | None:
-        best_score = -1
+        # Only axes some candidate constrains can change the outcome, which
+        # keeps the memo small even for very large axes products.
+        memo_key = (
+            workflow,
+            speaker,
+            role,
+            behaviour,
+            tuple(axes.get(key, _MISSING) for key in self._constrained_axes),
+        )
+        try:
+            return self._selection_memo[memo_key]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._lookup_candidate(workflow, speaker, role, behaviour, axes)
+
+        selected = self._lookup_candidate(workflow, speaker, role, behaviour, axes)
+        self._selection_memo[memo_key] = selected
+        return selected
+
+    def _lookup_candidate(
+        self,
+        workflow: str,
+        speaker: str,
+        role: str,
+        behaviour: str | None,
+        axes: Mapping[str, str],
+    ) -> TemplateCandidate | None:
+        """Pick the highest-scoring match, earliest declared on ties.
+
+        Equivalent to scanning every candidate with ``match_score`` but only
+        visits the buckets whose identity fields can match the request.
+        """
+        best_rank: Tuple[int, int] | None = None
         best_candidate: TemplateCandidate | None = None
-        for candidate in self._candidates:
-            score = candidate.match_score(workflow, speaker, role, behaviour, axes)
-            if score is None:
-                continue
-            if score > best_score:
-                best_score = score
-                best_candidate = candidate
+        for bucket_key in self._bucket_keys(workflow, speaker, role, behaviour):
+            for rank, candidate in self._index.get(bucket_key, ()):
+                if best_rank is not None and rank >= best_rank:
+                    break
+                if candidate.axes_match(axes):
+                    best_rank = rank
+                    best_candidate = candidate
+                    break
         return best_candidate
 
+    @staticmethod
+    def _bucket_keys(
+        workflow: str,
+        speaker: str,
+        role: str,
+        behaviour: str | None,
+    ) -> Iterable[_BucketKey]:
+        options = [
+            (value, None) if value is not None else (None,)
+            for value in (workflow, speaker, role, behaviour)
+        ]
+        for workflow_key in options[0]:
+            for speaker_key in options[1]:
+                for role_key in options[2]:
+                    for behaviour_key in options[3]:
+                        yield (workflow_key, speaker_key, role_key, behaviour_key)
+
+    @staticmethod
+    def _build_index(
+        candidates: List[TemplateCandidate],
+    ) -> Dict[_BucketKey, List[Tuple[Tuple[int, int], TemplateCandidate]]]:
+        """Bucket candidates by identity fields, best-ranked first.
+
+        A candidate's score is fixed whenever it matches, so ranking by
+        (-score, declaration order) reproduces the linear scan's tie-breaking.
+        """
+        index: Dict[_BucketKey, List[Tuple[Tuple[int, int], TemplateCandidate]]] = {}
+        for position, candidate in enumerate(candidates):
+            key = (candidate.workflow, candidate.speaker, candidate.role, candidate.behaviour)
+            index.setdefault(key, []).append(((-candidate.specificity(), position), candidate))
+        for bucket in index.values():
+            bucket.sort(key=lambda item: item[0])
+        return index
+
     def _build_candidates(self, templates: Dict[str, Any]) -> List[TemplateCandidate]:
         candidates: List[TemplateCandidate] = []
         for _, data in templates.items():
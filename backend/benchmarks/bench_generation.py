@@ -0,0 +1,112 @@
+"""Micro-benchmark for plan metadata hoisting on the commerce vertical.
+
+Run from ``backend/``::
+
+    python benchmarks/bench_generation.py [--workflows N] [--behaviours N]
+
+Compares the per-sample metadata computation the generator used to do in its
+innermost loop against the per-workflow table and per-(workflow, axes) cache,
+then times end-to-end plan generation.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app import generation  # noqa: E402
+from app.config_loader import load_vertical_config  # noqa: E402
+from app.models import BehaviourFlag, GenerationRequest, IndustryVertical  # noqa: E402
+
+
+def _request(workflows: int, behaviours: int, samples: int) -> GenerationRequest:
+    config = load_vertical_config(IndustryVertical.commerce)
+    return GenerationRequest(
+        vertical=IndustryVertical.commerce,
+        workflows=config["workflows"][:workflows],
+        behaviours=list(BehaviourFlag)[:behaviours],
+        axes=config["axes"],
+        num_samples_per_combo=samples,
+        random_seed=1,
+    )
+
+
+def _inline_metadata(context: generation._GenerationContext) -> None:
+    """Per-sample metadata, as computed inside the innermost loop before hoisting."""
+    vertical_key = context.request.vertical.value
+    config = context.config
+    for index in range(context.total_conversations):
+        workflow, _, combo_index = generation._resolve_slot(context, index)
+        axes = context.axes_at(combo_index)
+        domain_label = generation._get_domain_label(vertical_key, workflow, config)
+        behavior_label = generation._get_behavior_label(workflow, config)
+        generation._get_policy_excerpt(workflow, config)
+        generation._generate_facts_bullets(workflow, axes, config)
+        generation._generate_short_description(behavior_label, axes)
+        generation._generate_conversation_id(
+            domain_label=domain_label,
+            behavior_label=behavior_label,
+            axes=axes,
+            workflow=workflow,
+        )
+
+
+def _hoisted_metadata(context: generation._GenerationContext) -> None:
+    """Metadata lookups through the per-workflow table and scenario cache."""
+    cache = generation._ScenarioCache()
+    for index in range(context.total_conversations):
+        workflow, _, combo_index = generation._resolve_slot(context, index)
+        workflow_metadata = context.workflow_metadata[workflow]
+        cache.get(
+            workflow,
+            combo_index,
+            context.axes_at(combo_index),
+            workflow_metadata,
+            context.config,
+        )
+
+
+def _best_of(repeats: int, func: Callable[[], None]) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workflows", type=int, default=2)
+    parser.add_argument("--behaviours", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    request = _request(args.workflows, args.behaviours, args.samples)
+    context = generation._prepare_generation(request)
+    total = context.total_conversations
+    print(f"commerce: {total} conversations")
+
+    inline = _best_of(args.repeats, lambda: _inline_metadata(context))
+    hoisted = _best_of(args.repeats, lambda: _hoisted_metadata(context))
+    print(f"metadata inline : {inline:8.3f}s")
+    print(f"metadata hoisted: {hoisted:8.3f}s  ({inline / hoisted:.1f}x faster)")
+
+    def generate() -> None:
+        plans, _ = generation.build_conversation_plans(request)
+        for _ in plans:
+            pass
+
+    full = _best_of(1, generate)
+    print(f"full plan generation: {full:.3f}s ({total / full:,.0f} plans/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Micro-benchmark for dataset/golden JSON serialisation on the commerce vertical.
+
+Run from ``backend/``::
+
+    python benchmarks/bench_serialization.py [--conversations N]
+
+Builds the eval and golden payloads once, then times encoding them the way the
+endpoint used to (whole-object ``json.dumps`` plus pydantic golden models)
+against the streaming serializer with each available backend.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Callable
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.config_loader import load_vertical_config  # noqa: E402
+from app.dataset_builder import (  # noqa: E402
+    build_eval_dataset_entry,
+    build_golden_entry,
+    build_golden_entry_payload,
+)
+from app.generation import build_conversation_plans  # noqa: E402
+from app.models import BehaviourFlag, GenerationRequest, IndustryVertical  # noqa: E402
+from app.serialization import JsonSerializer, iter_json_document, orjson  # noqa: E402
+from app.template_engine import TemplateEngine  # noqa: E402
+
+
+def _request() -> GenerationRequest:
+    config = load_vertical_config(IndustryVertical.commerce)
+    return GenerationRequest(
+        vertical=IndustryVertical.commerce,
+        workflows=config["workflows"],
+        behaviours=list(BehaviourFlag),
+        axes=config["axes"],
+        random_seed=1,
+    )
+
+
+def _best_of(repeats: int, func: Callable[[], int]) -> tuple[float, int]:
+    timings = []
+    size = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        size = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    request = _request()
+    config = load_vertical_config(request.vertical)
+    engine = TemplateEngine.from_vertical(request.vertical)
+    plans, _ = build_conversation_plans(request)
+    plans = list(islice(plans, args.conversations))
+    dataset = [build_eval_dataset_entry(plan, engine) for plan in plans]
+    golden = [build_golden_entry_payload(plan, config) for plan in plans]
+    print(f"commerce: {len(plans)} conversations")
+
+    dataset_header = {"dataset_id": "bench", "version": "1.0.0", "metadata": {}}
+    golden_header = {"dataset_id": "bench", "version": "1.0.0"}
+
+    def legacy() -> int:
+        entries = [build_golden_entry(plan, config).model_dump() for plan in plans]
+        dataset_bytes = json.dumps(
+            {**dataset_header, "conversations": dataset}, ensure_ascii=False, indent=2
+        ).encode("utf-8")
+        golden_bytes = json.dumps(
+            {**golden_header, "entries": entries}, ensure_ascii=False, indent=2
+        ).encode("utf-8")
+        return len(dataset_bytes) + len(golden_bytes)
+
+    def streaming(serializer: JsonSerializer) -> Callable[[], int]:
+        def run() -> int:
+            size = 0
+            for chunk in iter_json_document(dataset_header, "conversations", dataset, serializer):
+                size += len(chunk)
+            for chunk in iter_json_document(golden_header, "entries", golden, serializer):
+                size += len(chunk)
+            return size
+
+        return run
+
+    variants: list[tuple[str, Callable[[], int]]] = [
+        ("legacy json.dumps + model_dump", legacy),
+        ("streaming json, indented", streaming(JsonSerializer(backend="json"))),
+        ("streaming json, compact", streaming(JsonSerializer(backend="json", compact=True))),
+    ]
+    if orjson is not None:
+        variants += [
+            ("streaming orjson, indented", streaming(JsonSerializer(backend="orjson"))),
+            ("streaming orjson, compact", streaming(JsonSerializer(backend="orjson", compact=True))),
+        ]
+    else:
+        print("orjson not installed; skipping orjson variants")
+
+    baseline = None
+    for label, func in variants:
+        elapsed, size = _best_of(args.repeats, func)
+        baseline = baseline or elapsed
+        print(
+            f"{label:<32}: {elapsed:8.3f}s  {size / 1e6:8.1f} MB  "
+            f"({baseline / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
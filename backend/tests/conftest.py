@@ -3,7 +3,42 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 
 BACKEND_DIR = Path(__file__).resolve().parents[1]
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(autouse=True)
+def _golden_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep compiled golden indexes out of the repository during tests."""
+    cache_dir = tmp_path / "golden-cache"
+    monkeypatch.setenv("EVAL_GOLDEN_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def _jobs_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep scoring job directories out of the repository during tests."""
+    jobs_dir = tmp_path / "jobs"
+    monkeypatch.setenv("EVAL_JOBS_DIR", str(jobs_dir))
+    return jobs_dir
+
+
+@pytest.fixture(autouse=True)
+def _artefact_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep cached dataset archives out of the repository during tests."""
+    cache_dir = tmp_path / "artefact-cache"
+    monkeypatch.setenv("EVAL_ARTEFACT_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture
+def scoring_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use the scoring process pool for small runs, whatever the host's CPU count."""
+    from app import scoring
+
+    monkeypatch.setattr(scoring, "SCORE_PARALLEL_MIN_CONVERSATIONS", 0)
+    monkeypatch.setattr(scoring, "available_cpus", lambda: 4)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config_loader
+from app.artefact_cache import ArtefactCache, dataset_cache_key, etag_matches
+from app.main import app, artefact_cache
+from app.models import GenerationRequest
+
+CONFIG = {
+    "vertical": "commerce",
+    "workflows": ["ReturnsRefunds"],
+    "behaviours": ["HappyPath"],
+    "axes": {"policy_boundary": ["allowed", "not_allowed"]},
+    "random_seed": 3,
+}
+
+
+def _generate(client: TestClient, config: dict, **headers: str):
+    return client.post("/generate-dataset", data={"config": json.dumps(config)}, headers=headers)
+
+
+def test_repeat_request_is_served_from_cache() -> None:
+    client = TestClient(app)
+    before = artefact_cache.stats()
+
+    first = _generate(client, CONFIG)
+    second = _generate(client, {**CONFIG, "workers": 2})
+    stats = artefact_cache.stats()
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.headers["content-disposition"] == second.headers["content-disposition"]
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["entries"] == 1 and stats["bytes"] == len(first.content)
+
+    not_modified = _generate(client, CONFIG, **{"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304 and not not_modified.content
+
+
+def test_unseeded_and_changed_requests_are_not_shared() -> None:
+    client = TestClient(app)
+    unseeded = {key: value for key, value in CONFIG.items() if key != "random_seed"}
+
+    assert "etag" not in _generate(client, unseeded).headers
+    assert dataset_cache_key(GenerationRequest(**unseeded)) is None
+    seeded = _generate(client, CONFIG).headers["etag"]
+    assert _generate(client, {**CONFIG, "random_seed": 4}).headers["etag"] != seeded
+    assert artefact_cache.stats()["entries"] == 2
+
+
+def test_key_tracks_vertical_yaml_content(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    request = GenerationRequest(**CONFIG)
+    key = dataset_cache_key(request)
+    shutil.copytree(config_loader.CONFIG_DIR / "commerce", tmp_path / "commerce")
+    monkeypatch.setattr(config_loader, "CONFIG_DIR", tmp_path)
+
+    hashes = []
+    source_hash = config_loader._source_hash
+    monkeypatch.setattr(config_loader, "_source_hash", lambda *args: hashes.append(args) or source_hash(*args))
+
+    assert dataset_cache_key(request) == key
+    assert dataset_cache_key(request) == key
+    assert len(hashes) == 1  # unchanged files are not re-read
+    axes = tmp_path / "commerce" / "axes.yaml"
+    axes.write_text(axes.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+    assert dataset_cache_key(request) != key
+    assert len(hashes) == 2
+
+
+def test_store_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ArtefactCache(tmp_path, max_bytes=300)
+    for index, key in enumerate(["a", "b", "c"]):
+        assert b"".join(cache.store(key, f"{key}.zip", [b"x" * 50, b"y" * 50])) == b"x" * 50 + b"y" * 50
+        os.utime(tmp_path / key / f"{key}.zip", (index, index))
+
+    assert cache.lookup("a") is not None  # now the most recently used
+    assert b"".join(cache.store("d", "d.zip", [b"z" * 100])) == b"z" * 100
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a", "c", "d"]
+    assert cache.lookup("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["evictions"]) == (1, 1, 4, 1)
+
+
+def test_interrupted_store_leaves_no_entry(tmp_path: Path) -> None:
+    cache = ArtefactCache(tmp_path, max_bytes=1000)
+
+    def failing():
+        yield b"partial"
+        raise RuntimeError("generation failed")
+
+    with pytest.raises(RuntimeError):
+        b"".join(cache.store("a", "a.zip", failing()))
+    stream = cache.store("b", "b.zip", [b"one", b"two"])
+    next(stream)
+    stream.close()
+
+    assert list(tmp_path.iterdir()) == []
+    assert cache.lookup("a") is None and cache.lookup("b") is None
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
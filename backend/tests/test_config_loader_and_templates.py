@@ -1,9 +1,11 @@
+import random
+import shutil
 from pathlib import Path
 
 import pytest
 
 from app import config_loader
-from app.template_engine import TemplateEngine
+from app.template_engine import CompiledTemplate, TemplateCandidate, TemplateEngine
 
 
 @pytest.fixture()
@@ -54,3 +56,193 @@ def test_template_engine_realise_turn(monkeypatch: pytest.MonkeyPatch, demo_conf
     )
 
     assert rendered == "Hi Alex, I need a refund for my order placed via web."
+
+
+def _linear_select(engine: TemplateEngine, **kwargs) -> object:
+    best_score = -1
+    best_candidate = None
+    for candidate in engine._candidates:
+        score = candidate.match_score(
+            kwargs["workflow"], kwargs["speaker"], kwargs["role"], kwargs["behaviour"], kwargs["axes"]
+        )
+        if score is not None and score > best_score:
+            best_score = score
+            best_candidate = candidate
+    return best_candidate
+
+
+def test_template_engine_index_matches_linear_scan() -> None:
+    rng = random.Random(11)
+    choices = {
+        "workflow": [None, "A", "B"],
+        "speaker": [None, "user"],
+        "role": [None, "customer", "agent"],
+        "behaviour": [None, "HappyPath", "LowContext"],
+    }
+    axis_values = {"intent": ["refund", "exchange"], "channel": ["web", "mobile", "store"]}
+    templates = []
+    for index in range(60):
+        entry = {key: rng.choice(values) for key, values in choices.items()}
+        entry = {key: value for key, value in entry.items() if value is not None}
+        axes = {}
+        for axis, values in axis_values.items():
+            pick = rng.random()
+            if pick < 0.3:
+                axes[axis] = rng.choice(values)
+            elif pick < 0.45:
+                axes[axis] = rng.sample(values, 2)
+        if axes:
+            entry["axes"] = axes
+        entry["text"] = f"template {index}"
+        templates.append(entry)
+    engine = TemplateEngine({"random": {"templates": templates}})
+
+    for _ in range(500):
+        query = {
+            "workflow": rng.choice(["A", "B", "C"]),
+            "speaker": rng.choice(["user", "assistant"]),
+            "role": rng.choice(["customer", "agent"]),
+            "behaviour": rng.choice([None, "HappyPath", "LowContext"]),
+            "axes": {axis: rng.choice(values) for axis, values in axis_values.items() if rng.random() < 0.8},
+        }
+        assert engine.select_candidate(**query) is _linear_select(engine, **query)
+        # Memoised second lookup must agree as well.
+        assert engine.select_candidate(**query) is _linear_select(engine, **query)
+
+
+def test_vertical_config_cache_reuses_parse_until_files_change(
+    monkeypatch: pytest.MonkeyPatch, demo_config_dir: Path, tmp_path: Path
+) -> None:
+    shutil.copytree(demo_config_dir, tmp_path / "verticals")
+    monkeypatch.setattr(config_loader, "CONFIG_DIR", tmp_path / "verticals")
+    parse_calls: list[Path] = []
+    original_load_yaml = config_loader._load_yaml
+
+    def counting_load_yaml(path: Path):
+        parse_calls.append(path)
+        return original_load_yaml(path)
+
+    monkeypatch.setattr(config_loader, "_load_yaml", counting_load_yaml)
+
+    first = config_loader.load_vertical_config("demo")
+    first["workflows"].append("Mutated")
+    second = config_loader.load_vertical_config("demo")
+
+    assert len(parse_calls) == 3
+    assert second["workflows"] == ["DemoWorkflow"]
+
+    workflows_file = tmp_path / "verticals" / "demo" / "workflows.yaml"
+    workflows_file.write_text("workflows:\n  - DemoWorkflow\n  - OtherWorkflow\n", encoding="utf-8")
+    third = config_loader.load_vertical_config("demo")
+
+    assert third["workflows"] == ["DemoWorkflow", "OtherWorkflow"]
+    assert len(parse_calls) == 6
+
+    config_loader.clear_config_cache("demo")
+    config_loader.load_vertical_config("demo")
+    assert len(parse_calls) == 9
+
+
+def test_template_engine_shared_per_vertical(
+    monkeypatch: pytest.MonkeyPatch, demo_config_dir: Path, tmp_path: Path
+) -> None:
+    shutil.copytree(demo_config_dir, tmp_path / "verticals")
+    monkeypatch.setattr(config_loader, "CONFIG_DIR", tmp_path / "verticals")
+
+    engine = TemplateEngine.from_vertical("demo")
+    assert TemplateEngine.from_vertical("demo") is engine
+
+    template_file = tmp_path / "verticals" / "demo" / "templates" / "demo_workflow.yaml"
+    template_file.write_text(
+        "templates:\n  - workflow: DemoWorkflow\n    text: \"Changed template text.\"\n",
+        encoding="utf-8",
+    )
+    reloaded = TemplateEngine.from_vertical("demo")
+
+    assert reloaded is not engine
+    assert reloaded.select_candidate(
+        workflow="DemoWorkflow", speaker="user", role="customer", behaviour=None, axes={}
+    ).text == "Changed template text."
+
+
+def test_compiled_snapshot_used_while_fresh(
+    monkeypatch: pytest.MonkeyPatch, demo_config_dir: Path, tmp_path: Path
+) -> None:
+    shutil.copytree(demo_config_dir, tmp_path / "verticals")
+    monkeypatch.setattr(config_loader, "CONFIG_DIR", tmp_path / "verticals")
+    expected_config = config_loader.load_vertical_config("demo")
+    expected_templates = config_loader.load_vertical_templates("demo")
+
+    snapshot_path = config_loader.compile_vertical_snapshot("demo")
+    assert snapshot_path.name == config_loader.SNAPSHOT_FILENAME
+
+    def fail_load_yaml(path: Path):
+        raise AssertionError(f"YAML parsed despite fresh snapshot: {path}")
+
+    monkeypatch.setattr(config_loader, "_load_yaml", fail_load_yaml)
+    config_loader.clear_config_cache()
+
+    assert config_loader.load_vertical_config("demo") == expected_config
+    assert config_loader.load_vertical_templates("demo") == expected_templates
+
+
+def test_stale_snapshot_falls_back_to_yaml(
+    monkeypatch: pytest.MonkeyPatch, demo_config_dir: Path, tmp_path: Path
+) -> None:
+    shutil.copytree(demo_config_dir, tmp_path / "verticals")
+    monkeypatch.setattr(config_loader, "CONFIG_DIR", tmp_path / "verticals")
+    config_loader.compile_vertical_snapshot("demo")
+
+    behaviours_file = tmp_path / "verticals" / "demo" / "behaviours.yaml"
+    behaviours_file.write_text("behaviours:\n  - HappyPath\n", encoding="utf-8")
+
+    assert config_loader.load_vertical_config("demo")["behaviours"] == ["HappyPath"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Plain text with no placeholders.",
+        "Hi {customer_name}, order via {channel}.",
+        "{a}{b}{a}",
+        "Escaped {{braces}} around {a}",
+        "Padded {a:>8}|{b!r}|{c!s:^5}",
+        "Number {n:04d} and {n}",
+    ],
+)
+def test_compiled_template_matches_str_format(text: str) -> None:
+    values = {"customer_name": "Alex", "channel": "web", "a": "x", "b": "y", "c": "z", "n": 7}
+    compiled = CompiledTemplate.compile(text)
+
+    assert compiled is not None
+    assert compiled.render(({"a": "override"}, values), str) == text.format(**{**values, "a": "override"})
+
+
+@pytest.mark.parametrize("text", ["{0} positional", "{user.name}", "{items[0]}", "{a:{width}}", "broken {"])
+def test_compiled_template_defers_unsupported_syntax(text: str) -> None:
+    assert CompiledTemplate.compile(text) is None
+    assert TemplateCandidate(text=text).compiled is None
+
+
+def test_compiled_template_missing_placeholder_callback() -> None:
+    compiled = CompiledTemplate.compile("Hi {customer_name} via {channel}")
+
+    assert compiled.placeholders == ("customer_name", "channel")
+    assert compiled.render(({"channel": "web"},), str) == "Hi customer_name via web"
+
+
+def test_template_engine_realise_turn_missing_variable(
+    monkeypatch: pytest.MonkeyPatch, demo_config_dir: Path
+) -> None:
+    monkeypatch.setattr(config_loader, "CONFIG_DIR", demo_config_dir)
+
+    engine = TemplateEngine.from_vertical("demo")
+    with pytest.raises(ValueError, match="Missing template variable: 'customer_name'"):
+        engine.realise_turn(
+            vertical="demo",
+            workflow="DemoWorkflow",
+            speaker="user",
+            role="customer",
+            behaviour="HappyPath",
+            axes={"intent": "refund", "channel": "web"},
+        )
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from itertools import combinations, product
+
+import pytest
+
+from app.coverage import MixedRadixProduct, build_covering_array, coverage_report
+
+
+@pytest.mark.parametrize(
+    ("sizes", "strength"),
+    [([3] * 8, 2), ([3] * 8, 3), ([2, 5, 3, 4, 2], 2), ([4, 1, 3, 2], 3), ([3] * 6, 1)],
+)
+def test_covering_array_covers_every_interaction(sizes: list[int], strength: int) -> None:
+    rows = build_covering_array(sizes, strength)
+
+    for columns in combinations(range(len(sizes)), strength):
+        seen = {tuple(row[column] for column in columns) for row in rows}
+        assert seen == set(product(*(range(sizes[column]) for column in columns)))
+    assert all(0 <= value < size for row in rows for value, size in zip(row, sizes))
+    assert len(rows) <= len(list(product(*(range(size) for size in sizes))))
+    assert coverage_report(rows, sizes, strength)["coverage"] == 1.0
+
+
+def test_covering_array_sizes() -> None:
+    assert len(build_covering_array([3] * 8, 2)) <= 20
+    assert len(build_covering_array([3] * 8, 3)) <= 65
+    assert build_covering_array([2, 3], 2) == list(product(range(2), range(3)))
+    assert build_covering_array([2, 3], 5) == list(product(range(2), range(3)))
+    with pytest.raises(ValueError):
+        build_covering_array([2, 3], 0)
+
+
+def test_coverage_report_counts_missing_interactions() -> None:
+    report = coverage_report([(0, 0), (1, 1)], [2, 2], 2)
+
+    assert report["interactions_total"] == 4
+    assert report["interactions_covered"] == 2
+    assert report["coverage"] == 0.5
+    assert report["full_product_rows"] == 4
+
+
+def test_mixed_radix_product_matches_itertools_product() -> None:
+    options = [["a", "b"], [1, 2, 3], ["x"], [True, False]]
+    combinations_ = MixedRadixProduct(options)
+    expected = list(product(*options))
+
+    assert len(combinations_) == len(expected) == 12
+    assert list(combinations_) == expected
+    assert combinations_[-1] == expected[-1]
+    assert [combinations_.index(combination) for combination in expected] == list(range(12))
+    with pytest.raises(IndexError):
+        combinations_[12]
+    with pytest.raises(ValueError):
+        combinations_.index(("c", 1, "x", True))
+
+
+def test_mixed_radix_product_indexes_large_products() -> None:
+    combinations_ = MixedRadixProduct([list(range(10))] * 12)
+
+    assert len(combinations_) == 10**12
+    assert combinations_[123456789012] == (1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 1, 2)
+    assert combinations_.index((1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 1, 2)) == 123456789012
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import json
+from dataclasses import replace
 from typing import Any
 
+from app.config_loader import load_vertical_config
 from app.dataset_builder import (
     build_eval_dataset_entries,
     build_golden_dataset_entries,
+    build_golden_entry_payload,
+    iter_conversation_artefacts,
+    write_dataset_artefacts,
+    write_dataset_jsonl,
     write_eval_dataset_jsonl,
     write_golden_dataset_jsonl,
 )
-from app.models import BehaviourFlag, ConversationPlan, IndustryVertical
+from app.generation import build_conversation_plans
+from app.models import BehaviourFlag, ConversationPlan, GenerationRequest, IndustryVertical
 
 
 class DummyTemplateEngine:
@@ -39,25 +46,25 @@ def test_build_eval_dataset_entries_user_only() -> None:
     assert len(entries) == 1
     payload = entries[0]
 
-    assert payload["vertical"] == "commerce"
-    assert payload["workflow"] == "ReturnsRefunds"
-    assert payload["behaviours"] == ["HappyPath"]
+    assert payload["conversation_id"] == "scenario-001"
+    assert payload["metadata"]["workflow"] == "ReturnsRefunds"
+    assert payload["metadata"]["behaviours"] == ["HappyPath"]
 
-    turns = payload["turns"]
-    assert [turn["speaker"] for turn in turns] == ["user", "user"]
-    assert all("text" in turn for turn in turns)
-    assert all("agent_expected" not in turn for turn in turns)
+    assert payload["turns"] == [
+        {"role": "user", "text": "I need a refund."},
+        {"role": "user", "text": "Here is my order."},
+    ]
 
 
-def test_build_golden_dataset_entries_includes_agent_expected() -> None:
+def test_build_golden_dataset_entries_include_assistant_turns() -> None:
     plan = _build_plan()
     entries = build_golden_dataset_entries([plan], DummyTemplateEngine())
 
     assert len(entries) == 1
     turns = entries[0]["turns"]
 
-    assert [turn["speaker"] for turn in turns] == ["user", "assistant", "user"]
-    assert turns[1]["agent_expected"] == "I can help with that."
+    assert [turn["role"] for turn in turns] == ["user", "assistant", "user"]
+    assert turns[1]["text"] == "I can help with that."
 
 
 def test_write_jsonl_outputs_lines(tmp_path) -> None:
@@ -74,5 +81,83 @@ def test_write_jsonl_outputs_lines(tmp_path) -> None:
     assert len(eval_lines) == 1
     assert len(golden_lines) == 1
 
-    assert json.loads(eval_lines[0])["turns"][0]["speaker"] == "user"
-    assert json.loads(golden_lines[0])["turns"][1]["speaker"] == "assistant"
+    assert json.loads(eval_lines[0])["turns"][0]["role"] == "user"
+    assert json.loads(golden_lines[0])["turns"][1]["role"] == "assistant"
+
+
+class CountingTemplateEngine:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def realise_turn(self, **kwargs: Any) -> str:
+        self.calls += 1
+        return f"{kwargs['speaker']} {kwargs['workflow']} {kwargs['axes']['policy_boundary']}"
+
+
+def _generated_plans() -> list:
+    request = GenerationRequest(
+        vertical=IndustryVertical.commerce,
+        workflows=["ReturnsRefunds"],
+        behaviours=[BehaviourFlag.happy_path],
+        axes={"policy_boundary": ["allowed", "not_allowed"]},
+        random_seed=5,
+    )
+    plans, _ = build_conversation_plans(request)
+    # Drop the pre-rendered text so turns go through the template engine.
+    return [
+        replace(plan, turn_plan=tuple(replace(turn, text=None) for turn in plan.turn_plan))
+        for plan in plans
+    ]
+
+
+def test_single_pass_matches_separate_builders() -> None:
+    plans = _generated_plans()
+    config = load_vertical_config(IndustryVertical.commerce)
+    engine = CountingTemplateEngine()
+    eval_entries: list = []
+    golden_dataset_entries: list = []
+    golden_entries: list = []
+
+    count = write_dataset_artefacts(
+        iter(plans),
+        engine,
+        config,
+        eval_sink=eval_entries,
+        golden_dataset_sink=golden_dataset_entries,
+        golden_sink=golden_entries,
+    )
+    single_pass_calls = engine.calls
+
+    assert count == len(plans)
+    assert single_pass_calls == sum(len(plan.turn_plan) for plan in plans)
+    assert eval_entries == build_eval_dataset_entries(plans, engine)
+    assert golden_dataset_entries == build_golden_dataset_entries(plans, engine)
+    assert golden_entries == [build_golden_entry_payload(plan, config) for plan in plans]
+    # The separate builders render the user turns twice.
+    user_renders = sum(1 for entry in eval_entries for _ in entry["turns"])
+    assert engine.calls == 2 * single_pass_calls + user_renders
+
+
+def test_eval_only_pass_skips_assistant_turns() -> None:
+    plans = _generated_plans()
+    engine = CountingTemplateEngine()
+
+    artefacts = list(iter_conversation_artefacts(plans, engine, {}, golden_turns=False))
+
+    assert all(conversation.golden_dataset_entry is None for conversation in artefacts)
+    assert [conversation.eval_entry for conversation in artefacts] == build_eval_dataset_entries(plans, engine)
+    user_turns = sum(1 for plan in plans for turn in plan.turn_plan if turn.speaker == "user")
+    assert engine.calls == 2 * user_turns
+
+
+def test_write_dataset_jsonl_writes_all_artefacts(tmp_path) -> None:
+    plans = _generated_plans()
+    engine = CountingTemplateEngine()
+
+    count = write_dataset_jsonl(plans, engine, {}, tmp_path)
+
+    for name in ["eval_dataset.jsonl", "golden_dataset.jsonl", "golden.jsonl"]:
+        lines = (tmp_path / name).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == count == len(plans)
+    golden = json.loads((tmp_path / "golden.jsonl").read_text(encoding="utf-8").splitlines()[0])
+    assert golden["conversation_id"] == plans[0].scenario_id
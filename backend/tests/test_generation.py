@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from app import generation
+from app.generation import build_conversation_plans
+from app.models import BehaviourFlag, GenerationRequest, IndustryVertical
+from app.plans import PlanRecord
+
+
+def _request(**overrides) -> GenerationRequest:
+    payload = {
+        "vertical": IndustryVertical.commerce,
+        "workflows": ["ReturnsRefunds", "OrderStatusTracking"],
+        "behaviours": [BehaviourFlag.happy_path, BehaviourFlag.low_context],
+        "axes": {
+            "policy_boundary": ["allowed", "not_allowed"],
+            "item_condition": ["new", "used", "defective"],
+        },
+        "num_samples_per_combo": 2,
+        "random_seed": 42,
+    }
+    payload.update(overrides)
+    return GenerationRequest(**payload)
+
+
+def _dump(plans) -> list[dict]:
+    return [plan.to_model().model_dump() for plan in plans]
+
+
+@pytest.fixture
+def plan_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Use the process pool for small runs, whatever the host's CPU count."""
+    monkeypatch.setattr(generation, "PARALLEL_MIN_CONVERSATIONS", 0)
+    monkeypatch.setattr(generation, "available_cpus", lambda: 4)
+
+
+def test_parallel_generation_matches_serial(plan_pool: None) -> None:
+    serial, serial_manifest = build_conversation_plans(_request())
+    parallel, parallel_manifest = build_conversation_plans(_request(), workers=3, shard_size=7)
+
+    serial_plans = _dump(serial)
+    assert len(serial_plans) == serial_manifest["total_conversations"] == 48
+    assert _dump(parallel) == serial_plans
+    assert parallel_manifest["total_conversations"] == serial_manifest["total_conversations"]
+
+
+def test_parallel_generation_independent_of_worker_count(plan_pool: None) -> None:
+    two, _ = build_conversation_plans(_request(workers=2), shard_size=5)
+    four, _ = build_conversation_plans(_request(workers=4), shard_size=11)
+
+    assert _dump(two) == _dump(four)
+
+
+def test_small_runs_and_single_cpus_stay_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*_: object) -> None:
+        raise AssertionError("process pool used")
+
+    serial = _dump(build_conversation_plans(_request())[0])
+    monkeypatch.setattr(generation, "_iter_plans_parallel", fail)
+    monkeypatch.setattr(generation, "available_cpus", lambda: 4)
+    assert _dump(build_conversation_plans(_request(), workers=3, shard_size=7)[0]) == serial
+
+    monkeypatch.setattr(generation, "PARALLEL_MIN_CONVERSATIONS", 0)
+    monkeypatch.setattr(generation, "available_cpus", lambda: 1)
+    assert _dump(build_conversation_plans(_request(), workers=3, shard_size=7)[0]) == serial
+
+
+def test_plans_share_axes_and_turns() -> None:
+    plans = list(build_conversation_plans(_request(num_samples_per_combo=1))[0])
+
+    by_axes: dict[tuple, list] = {}
+    for plan in plans:
+        by_axes.setdefault(tuple(sorted(plan.axes.items())), []).append(plan)
+    for group in by_axes.values():
+        assert all(plan.axes is group[0].axes for plan in group)
+
+    assistant_turns = [turn for plan in plans for turn in plan.turn_plan if turn.speaker == "assistant"]
+    assert len({id(turn) for turn in assistant_turns}) <= 8
+    with pytest.raises(TypeError):
+        plans[0].axes["policy_boundary"] = "changed"
+
+
+def test_plan_record_model_round_trip_and_pickle() -> None:
+    plan = next(build_conversation_plans(_request())[0])
+
+    model = plan.to_model()
+    assert model.turn_plan[0]["axes"] == dict(plan.axes)
+    assert model.turn_plan[1] == {"speaker": "assistant", "role": "agent", "text": plan.turn_plan[1].text}
+    assert PlanRecord.from_model(model) == plan
+
+    restored = pickle.loads(pickle.dumps(plan))
+    assert restored == plan
+    with pytest.raises(TypeError):
+        restored.axes["policy_boundary"] = "changed"
+
+
+def test_coverage_strength_samples_axes_pairwise(plan_pool: None) -> None:
+    axes = {
+        "policy_boundary": ["allowed", "not_allowed", "edge"],
+        "item_condition": ["new", "used", "defective"],
+        "order_value": ["low", "medium", "high"],
+        "customer_tier": ["standard", "gold", "platinum"],
+    }
+    request = _request(axes=axes, num_samples_per_combo=1, coverage_strength=2)
+    plans, manifest = build_conversation_plans(request)
+    plans = list(plans)
+    per_slot = len(request.workflows) * len(request.behaviours)
+
+    assert len(plans) == manifest["total_conversations"] < 81 * per_slot
+    assert manifest["coverage"]["coverage"] == 1.0
+    assert manifest["coverage"]["full_product_rows"] == 81
+    for first, second in [("policy_boundary", "order_value"), ("item_condition", "customer_tier")]:
+        pairs = {(plan.axes[first], plan.axes[second]) for plan in plans}
+        assert len(pairs) == 9
+    assert _dump(build_conversation_plans(request, workers=2, shard_size=5)[0]) == _dump(plans)
+
+
+def test_max_conversations_samples_evenly_across_strata(plan_pool: None) -> None:
+    axes = {f"axis_{index}": [f"value_{value}" for value in range(10)] for index in range(5)}
+    request = _request(axes=axes, num_samples_per_combo=1, max_conversations=101)
+    plans, manifest = build_conversation_plans(request)
+    plans = list(plans)
+
+    assert len(plans) == manifest["total_conversations"] == 101
+    assert manifest["sampling"] == {"method": "stratified", "strata": 4, "population": 400000}
+    strata: dict[tuple, int] = {}
+    for plan in plans:
+        key = (plan.workflow, plan.behaviours)
+        strata[key] = strata.get(key, 0) + 1
+    assert len(strata) == 4 and set(strata.values()) <= {25, 26}
+    assert len({(plan.workflow, plan.behaviours, tuple(plan.axes.items())) for plan in plans}) == 101
+    assert _dump(build_conversation_plans(request)[0]) == _dump(plans)
+    assert _dump(build_conversation_plans(request, workers=2, shard_size=7)[0]) == _dump(plans)
+
+
+def test_max_conversations_above_population_keeps_every_plan() -> None:
+    full = list(build_conversation_plans(_request())[0])
+    capped = list(build_conversation_plans(_request(max_conversations=10_000))[0])
+
+    assert _dump(capped) == _dump(full)
+
+
+def test_coverage_strength_is_bounded_by_the_axes() -> None:
+    with pytest.raises(ValueError):
+        _request(coverage_strength=3)
+    with pytest.raises(ValueError):
+        _request(axes={f"axis_{index}": ["a", "b"] for index in range(6)}, coverage_strength=5)
+
+
+def test_plan_workers_reuse_the_parents_layout(plan_pool: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    axes = {f"axis_{index}": ["a", "b", "c"] for index in range(5)}
+    request = _request(axes=axes, num_samples_per_combo=1, coverage_strength=3, max_conversations=40)
+    plans, _ = build_conversation_plans(request)
+    serial = _dump(plans)
+    assert _dump(build_conversation_plans(request, workers=2, shard_size=7)[0]) == serial
+    layout = generation._plan_layout(request, list(axes.values()), len(request.behaviours))
+
+    def fail(*_: object) -> None:
+        raise AssertionError("plan layout rebuilt in a worker")
+
+    monkeypatch.setattr(generation, "_axes_combinations", fail)
+    monkeypatch.setattr(generation, "_sample_slots", fail)
+    monkeypatch.setattr(generation, "_worker_context", None)
+    generation._init_plan_worker(str(generation.config_loader.CONFIG_DIR), request, layout)
+    rng = generation.random.Random(request.random_seed)
+
+    assert _dump(generation._build_plan_shard(0, len(serial), rng.getstate())) == serial
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import time
+import zipfile
+from typing import Iterator
+
+from fastapi.testclient import TestClient
+
+from app.jobs import (
+    GenerationProgress,
+    create_generation_job,
+    request_cancellation,
+    run_generation_job,
+)
+from app.main import app
+
+CONFIG = {
+    "vertical": "commerce",
+    "workflows": ["ReturnsRefunds"],
+    "behaviours": ["HappyPath"],
+    "axes": {"policy_boundary": ["allowed", "not_allowed"]},
+    "random_seed": 3,
+}
+
+
+def _wait_for(client: TestClient, job_id: str) -> dict:
+    deadline = time.monotonic() + 30
+    while (status := client.get(f"/generation-jobs/{job_id}").json())["status"] in {"queued", "running"}:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    return status
+
+
+def test_generation_job_produces_the_streamed_archive() -> None:
+    client = TestClient(app)
+
+    submitted = client.post("/generation-jobs", data={"config": json.dumps(CONFIG)})
+    assert submitted.status_code == 202
+    status = _wait_for(client, submitted.json()["job_id"])
+    download = client.get(f"/generation-jobs/{status['job_id']}/download")
+    streamed = client.post("/generate-dataset", data={"config": json.dumps(CONFIG)})
+
+    assert status["status"] == "completed"
+    assert status["plans_built"] == status["entries_rendered"] == status["total"] > 0
+    assert status["bytes_written"] == len(download.content)
+    assert download.headers["content-type"] == "application/zip"
+    job_archive = zipfile.ZipFile(io.BytesIO(download.content))
+    streamed_archive = zipfile.ZipFile(io.BytesIO(streamed.content))
+    assert job_archive.namelist() == streamed_archive.namelist()
+    # manifest.json carries a generation timestamp; the datasets are identical.
+    for name in job_archive.namelist()[:2]:
+        assert job_archive.read(name) == streamed_archive.read(name)
+
+
+def test_generation_job_errors() -> None:
+    client = TestClient(app)
+    job = create_generation_job(json.dumps(CONFIG))
+
+    assert client.post("/generation-jobs", data={"config": "{"}).status_code == 400
+    assert client.get("/generation-jobs/not-a-job").status_code == 404
+    assert client.get(f"/generation-jobs/{job.job_id}/download").status_code == 409
+
+
+def test_cancelled_generation_job_discards_partial_output() -> None:
+    job = create_generation_job(json.dumps(CONFIG))
+
+    def prepare(_: str, progress: GenerationProgress) -> tuple[str, Iterator]:
+        def chunks() -> Iterator[bytes]:
+            for index in range(1000):
+                if index == 5:
+                    request_cancellation(job)
+                progress.entries_rendered += 1
+                yield os.urandom(64 * 1024)
+
+        return "demo", iter([("data.bin", chunks())])
+
+    cancelled = run_generation_job(job, prepare, progress_seconds=0)
+
+    assert cancelled.status == "cancelled"
+    assert 5 <= cancelled.entries_rendered < 1000
+    assert sorted(path.name for path in job.path.iterdir()) == ["cancel", "job.json"]
+    assert run_generation_job(cancelled, prepare).status == "cancelled"
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+import json
+import random
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import json_stream
+from app.golden_index import detect_record_format, iter_golden_entries
+from app.json_stream import iter_json_array
+from app.main import app
+
+
+def test_iter_json_array_matches_json_loads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(json_stream, "_READ_SIZE", 5)
+    rng = random.Random(4)
+    scalars = [1.25e-7, -3, 10, True, None, "a \"quoted\" ü", ""]
+    for _ in range(200):
+        items = [
+            {"id": rng.choice(scalars), "values": [rng.choice(scalars) for _ in range(rng.randint(0, 3))]}
+            for _ in range(rng.randint(0, 4))
+        ] + [rng.choice(scalars) for _ in range(rng.randint(0, 2))]
+        document = {"dataset_id": "x", "meta": {"n": [1, 2]}, "entries": items, "tail": 1.5}
+        for indent in (None, 2):
+            payload = json.dumps(document, ensure_ascii=False, indent=indent).encode("utf-8")
+            assert list(iter_json_array(io.BytesIO(payload), "entries")) == items
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b'{"entries": [1, 2', b'{"other": []}', b'{"entries": [1 2]}', b'[1]', b'{"entries": 3}'],
+)
+def test_iter_json_array_rejects_malformed_documents(payload: bytes) -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.BytesIO(payload), "entries"))
+
+
+def test_detect_record_format() -> None:
+    jsonl = io.BytesIO(b'{"conversation_id": "a"}\n{"conversation_id": "b"}\n')
+    pretty = io.BytesIO(json.dumps({"entries": []}, indent=2).encode())
+    compact = io.BytesIO(json.dumps({"dataset_id": "d", "entries": []}).encode())
+
+    assert detect_record_format(jsonl) == "jsonl"
+    assert detect_record_format(pretty) == "document"
+    assert detect_record_format(compact) == "document"
+    assert detect_record_format(pretty, "golden.jsonl") == "jsonl"
+
+
+def test_golden_and_dataset_must_line_up() -> None:
+    golden = io.BytesIO(json.dumps({"entries": [{"conversation_id": "a"}, {"conversation_id": "b"}]}).encode())
+    dataset = io.BytesIO(json.dumps({"conversations": [{"conversation_id": "a", "metadata": {}}]}).encode())
+
+    with pytest.raises(ValueError):
+        list(iter_golden_entries(golden, dataset))
+
+
+def test_score_generated_golden_json_directly() -> None:
+    client = TestClient(app)
+    config = {
+        "vertical": "commerce",
+        "workflows": ["ReturnsRefunds"],
+        "behaviours": ["HappyPath"],
+        "axes": {"policy_boundary": ["allowed", "not_allowed"]},
+        "random_seed": 5,
+    }
+    generated = client.post("/generate-dataset", data={"config": json.dumps(config)})
+    archive = zipfile.ZipFile(io.BytesIO(generated.content))
+    dataset_name, golden_name, _ = archive.namelist()
+    golden_bytes = archive.read(golden_name)
+    golden = json.loads(golden_bytes)
+    dataset = json.loads(archive.read(dataset_name))
+
+    # Answer the first conversation with one of its variants and the rest badly.
+    model_lines = []
+    for position, entry in enumerate(golden["entries"]):
+        expectation = entry["turns"][0]
+        reply = expectation["expected"]["variants"][0] if position == 0 else "no idea"
+        turns = [{"speaker": "user", "text": "hi"}] * expectation["turn_index"]
+        turns.append({"speaker": "assistant", "text": f"Sure. {reply}"})
+        model_lines.append(json.dumps({"conversation_id": entry["conversation_id"], "turns": turns}))
+
+    files = {
+        "golden_dataset": (golden_name, golden_bytes, "application/json"),
+        "eval_dataset": (dataset_name, archive.read(dataset_name), "application/json"),
+        "model_outputs": ("model.jsonl", "\n".join(model_lines).encode("utf-8"), "application/jsonl"),
+    }
+    response = client.post("/score-run", files=files, data={"model_id": "m", "summary": "true"})
+
+    assert response.status_code == 200
+    result = zipfile.ZipFile(io.BytesIO(response.content))
+    scored = [json.loads(line) for line in result.read("scored_results.jsonl").splitlines()]
+    summary = json.loads(result.read("summary.json"))
+
+    assert [entry["conversation_id"] for entry in scored] == [
+        conversation["conversation_id"] for conversation in dataset["conversations"]
+    ]
+    assert scored[0]["overall_pass"] is True
+    assert scored[0]["turns"][0]["matched"]
+    assert all(not entry["overall_pass"] for entry in scored[1:])
+    assert summary["turns"]["total"] == len(scored)
+    assert set(summary["by_axis"]["policy_boundary"]) == {"allowed", "not_allowed"}
+    assert summary["by_workflow"] == {
+        "ReturnsRefunds": {"total": len(scored), "passed": 1, "pass_rate": 1 / len(scored)}
+    }
+    assert summary["by_behaviour"] == {
+        "HappyPath": {"total": len(scored), "passed": 1, "pass_rate": 1 / len(scored)}
+    }
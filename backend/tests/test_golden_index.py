@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from app import golden_index
+from app.golden_index import compile_golden_index, load_golden_index
+from app.score_summary import ScoreSummary
+from app.scoring import iter_scored_conversations, score_dataset
+
+
+def _golden_file(count: int) -> io.BytesIO:
+    lines = [
+        json.dumps(
+            {
+                "conversation_id": f"c{index}",
+                "workflow": f"wf{index % 2}",
+                "expected_actions": ["refund", f"step {index % 3}"],
+                "key_facts": {"status": "approved"},
+                "scoring_rules": {"disallowed_phrases": ["guarantee"]},
+            }
+        )
+        for index in range(count)
+    ]
+    return io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def test_index_scores_like_raw_golden(tmp_path: Path) -> None:
+    golden_file = _golden_file(12)
+    golden = [json.loads(line) for line in golden_file.getvalue().splitlines()]
+    model = [{"conversation_id": f"c{index}", "text": f"Refund approved, step {index % 2}"} for index in range(12)]
+    models = {entry["conversation_id"]: entry for entry in model}
+
+    index = compile_golden_index(golden_file, tmp_path)
+    raw_summary, index_summary = ScoreSummary(), ScoreSummary()
+
+    assert len(index) == 12
+    assert list(iter_scored_conversations(index, models.get, summary=index_summary)) == score_dataset(
+        golden, model, summary=raw_summary
+    )
+    assert index_summary.to_dict() == raw_summary.to_dict()
+
+
+def test_repeated_compile_reuses_cached_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    first = compile_golden_index(_golden_file(3), tmp_path)
+
+    def fail(*_: object) -> None:
+        raise AssertionError("golden file was parsed again")
+
+    monkeypatch.setattr(golden_index, "iter_jsonl", fail)
+    second = compile_golden_index(_golden_file(3), tmp_path)
+
+    assert second == first
+    assert [entry.conversation_id for entry in second] == ["c0", "c1", "c2"]
+    assert next(iter(second)).compiled_matchers
+
+
+def test_stale_or_invalid_indexes_are_rejected(tmp_path: Path) -> None:
+    index = compile_golden_index(_golden_file(2), tmp_path)
+    assert load_golden_index(index.path, "other-hash") is None
+
+    index.path.write_bytes(b"garbage")
+    assert load_golden_index(index.path) is None
+    assert len(compile_golden_index(_golden_file(2), tmp_path)) == 2
+
+    with pytest.raises(ValueError):
+        compile_golden_index(io.BytesIO(b"{broken\n"), tmp_path)
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".idx"]
+
+
+def test_corrupt_or_truncated_indexes_are_recompiled(tmp_path: Path) -> None:
+    index = compile_golden_index(_golden_file(4), tmp_path)
+    content = index.path.read_bytes()
+
+    index.path.write_bytes(content[: len(content) - 10])
+    assert load_golden_index(index.path) is None
+    # A trailer that parses but holds the wrong types.
+    count, offset = golden_index._PREFIX.unpack(content[: golden_index._PREFIX.size])
+    index.path.write_bytes(content[:offset] + json.dumps(["not", "a", "header"]).encode("utf-8"))
+    assert load_golden_index(index.path) is None
+    index.path.write_bytes(golden_index._PREFIX.pack(4, 10**9) + content[golden_index._PREFIX.size :])
+    assert load_golden_index(index.path) is None
+
+    assert len(compile_golden_index(_golden_file(4), tmp_path)) == 4
+    assert load_golden_index(index.path) is not None
+
+
+class _Planted:
+    def __reduce__(self):
+        return (os.system, ("touch planted",))
+
+
+def test_planted_or_foreign_indexes_never_load(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    cache_dir = tmp_path / "cache"
+    index = compile_golden_index(_golden_file(3), cache_dir)
+    content = index.path.read_bytes()
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+
+    # A pickle in place of the trailer is never unpickled.
+    index.path.write_bytes(golden_index._PREFIX.pack(3, golden_index._PREFIX.size) + pickle.dumps(_Planted()))
+    assert load_golden_index(index.path) is None
+    assert not (tmp_path / "planted").exists()
+
+    index.path.write_bytes(content)
+    assert load_golden_index(index.path) is not None
+    if hasattr(os, "getuid") and os.getuid() == 0:
+        os.chown(index.path, os.getuid() + 1, -1)
+        assert load_golden_index(index.path) is None
+
+
+def test_cache_evicts_least_recently_used_indexes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(golden_index, "EVICTION_GRACE_SECONDS", 0)
+    paths = [compile_golden_index(_golden_file(count), tmp_path).path for count in (2, 3, 4)]
+    for age, path in enumerate(paths):
+        os.utime(path, (1000 + age, 1000 + age))
+    stale = tmp_path / "old.v1.idx"
+    stale.write_bytes(b"x" * 10)
+    os.utime(stale, (5000, 5000))
+    compile_golden_index(_golden_file(2), tmp_path)  # a hit refreshes the oldest index
+    size = sum(path.stat().st_size for path in paths)
+
+    evicted = golden_index.evict_golden_cache(tmp_path, max_bytes=size - 1)
+
+    assert evicted == [stale, paths[1]]
+    assert sorted(tmp_path.iterdir()) == sorted([paths[0], paths[2]])
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from app.matching import PhraseMatcher, ahocorasick, normalize_text
+from app.scoring import GoldenExpectations, score_conversation
+
+_BACKENDS = ["substring"] + (["ahocorasick"] if ahocorasick is not None else [])
+
+
+def _reference_contains(haystack: str, needle: str) -> bool:
+    if not haystack or not needle:
+        return False
+    return re.sub(r"\s+", " ", needle.strip().lower()) in re.sub(r"\s+", " ", haystack.lower())
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
+def test_phrase_matcher_agrees_with_substring_reference(backend: str) -> None:
+    rng = random.Random(11)
+    alphabet = ["a", "b", "ab", "Ré", " ", "\t", "\n", "  "]
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        phrases = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+            for _ in range(rng.randint(1, 6))
+        ]
+
+        found = PhraseMatcher(phrases, backend=backend).find(normalize_text(text))
+
+        assert found == {phrase for phrase in phrases if _reference_contains(text, phrase)}
+
+
+def test_score_conversation_matches_overlapping_needles() -> None:
+    golden = {
+        "conversation_id": "c1",
+        "expected_actions": ["refund", "full refund", "store credit", None],
+        "key_facts": {"status": "Approved", "amount": "", "days": "5  days"},
+        "scoring_rules": {"disallowed_phrases": ["guarantee", "refund"]},
+    }
+    model = {"text": "Your FULL   refund is approved\nwithin 5 days."}
+
+    scored = score_conversation(golden, model)
+
+    assert scored["expected_actions"]["matched"] == ["refund", "full refund"]
+    assert scored["expected_actions"]["missed"] == ["store credit"]
+    assert scored["key_facts"]["matched"] == ["status", "days"]
+    assert scored["key_facts"]["missed"] == ["amount"]
+    assert scored["policy_violations"]["violations"] == ["refund"]
+
+
+def test_shared_phrase_sets_reuse_one_matcher_across_conversations() -> None:
+    golden = [
+        {
+            "conversation_id": f"c{index}",
+            "expected_actions": ["refund"],
+            "key_facts": {"order": f"ORD-{index}"},
+            "scoring_rules": {"disallowed_phrases": ["guarantee", "promise"]},
+        }
+        for index in range(3)
+    ]
+    expectations = [GoldenExpectations.from_golden(entry).compiled() for entry in golden]
+
+    actions, disallowed, facts = zip(*(entry.compiled_matchers for entry in expectations))
+    assert len({id(matcher) for matcher in actions}) == 1
+    assert len({id(matcher) for matcher in disallowed}) == 1
+    assert len({id(matcher) for matcher in facts}) == 3
+    result = expectations[1].score({"conversation_id": "c1", "text": "Refund for ORD-1, I promise"})
+    assert result["expected_actions"]["matched"] == ["refund"]
+    assert result["key_facts"]["matched"] == ["order"]
+    assert result["policy_violations"]["violations"] == ["promise"]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.score_summary import ScoreSummary
+from app.scoring import compare_models, score_dataset
+
+
+def _jsonl(entries: list[dict]) -> bytes:
+    return "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+
+
+_GOLDEN = [
+    {
+        "conversation_id": f"c{index}",
+        "workflow": "Returns",
+        "expected_actions": ["refund"],
+        "scoring_rules": {"disallowed_phrases": ["guarantee"]},
+    }
+    for index in range(4)
+]
+_MODEL_A = [{"conversation_id": f"c{index}", "text": "refund issued"} for index in range(4)]
+_MODEL_B = [{"conversation_id": "c0", "text": "refund, guaranteed"}, {"conversation_id": "c1", "text": "refund"}]
+
+
+def test_compare_models_matches_individual_runs() -> None:
+    summaries = {"a": ScoreSummary(), "b": ScoreSummary()}
+
+    compared = compare_models(_GOLDEN, {"a": _MODEL_A, "b": _MODEL_B}, summaries=summaries)
+
+    assert compared["a"] == score_dataset(_GOLDEN, _MODEL_A)
+    assert compared["b"] == score_dataset(_GOLDEN, _MODEL_B)
+    assert summaries["a"].overall.passed == 4
+    assert summaries["b"].overall.passed == 1
+
+
+def test_score_compare_endpoint_returns_per_model_results_and_table() -> None:
+    client = TestClient(app)
+    files = [
+        ("golden_dataset", ("golden.jsonl", _jsonl(_GOLDEN), "application/jsonl")),
+        ("model_outputs", ("a.jsonl", _jsonl(_MODEL_A), "application/jsonl")),
+        ("model_outputs", ("b.jsonl", _jsonl(_MODEL_B), "application/jsonl")),
+    ]
+
+    response = client.post("/score-compare", files=files, data={"model_ids": ["model-a", "model-b"]})
+
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.namelist() == ["model-a.scored.jsonl", "model-b.scored.jsonl", "comparison.json"]
+    scored_b = [json.loads(line) for line in archive.read("model-b.scored.jsonl").splitlines()]
+    assert [entry["overall_pass"] for entry in scored_b] == [False, True, False, False]
+    assert {entry["model_id"] for entry in scored_b} == {"model-b"}
+
+    comparison = json.loads(archive.read("comparison.json"))
+    assert comparison["columns"] == ["metric", "model-a", "model-b"]
+    rows = {row[0]: row[1:] for row in comparison["rows"]}
+    assert rows["pass_rate"] == [1.0, 0.25]
+    assert rows["workflow:Returns.pass_rate"] == [1.0, 0.25]
+
+
+def test_score_compare_rejects_mismatched_ids() -> None:
+    client = TestClient(app)
+    files = [
+        ("golden_dataset", ("golden.jsonl", _jsonl(_GOLDEN), "application/jsonl")),
+        ("model_outputs", ("a.jsonl", _jsonl(_MODEL_A), "application/jsonl")),
+    ]
+
+    response = client.post("/score-compare", files=files, data={"model_ids": ["a", "b"]})
+    assert response.status_code == 400
+
+    files.append(("model_outputs", ("b.jsonl", b"not json\n", "application/jsonl")))
+    response = client.post("/score-compare", files=files, data={"model_ids": ["a", "b"]})
+    assert response.status_code == 400
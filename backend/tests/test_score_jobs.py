@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import jobs
+from app.jobs import (
+    JOB_FILE,
+    RESULTS_FILE,
+    create_generation_job,
+    create_scoring_job,
+    evict_finished_jobs,
+    iter_generation_jobs,
+    iter_scoring_jobs,
+    job_status,
+    run_scoring_job,
+)
+from app.main import app
+
+
+def _jsonl(entries: list[dict]) -> bytes:
+    return "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+
+
+def _inputs(count: int) -> tuple[bytes, bytes]:
+    golden = [
+        {
+            "conversation_id": f"c{index}",
+            "workflow": f"wf{index % 3}",
+            "expected_actions": ["refund"],
+            "key_facts": {"order": f"ORD-{index}"},
+        }
+        for index in range(count)
+    ]
+    model = [
+        {"conversation_id": f"c{index}", "text": f"refund ORD-{index}" if index % 4 else "no"}
+        for index in range(count)
+    ]
+    return _jsonl(golden), _jsonl(model)
+
+
+def test_score_job_endpoints_match_score_run() -> None:
+    client = TestClient(app)
+    golden, model = _inputs(25)
+    files = {
+        "golden_dataset": ("golden.jsonl", golden, "application/jsonl"),
+        "model_outputs": ("model.jsonl", model, "application/jsonl"),
+    }
+
+    submitted = client.post("/score-jobs", files=files, data={"model_id": "m"})
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+
+    deadline = time.monotonic() + 30
+    while (status := client.get(f"/score-jobs/{job_id}").json())["status"] != "completed":
+        assert status["status"] in {"queued", "running"}, status
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    assert status["scored"] == status["total"] == 25
+    assert status["summary"]["pass_rate"] == 18 / 25
+    results = client.get(f"/score-jobs/{job_id}/results")
+    expected = client.post("/score-run", files=files, data={"model_id": "m"})
+    assert results.status_code == 200
+    assert results.text == expected.text
+
+
+def test_unknown_or_unfinished_jobs() -> None:
+    client = TestClient(app)
+    golden, model = _inputs(2)
+    job = create_scoring_job(io.BytesIO(golden), io.BytesIO(model), "m", golden_filename="golden.jsonl")
+
+    assert client.get("/score-jobs/0123").status_code == 404
+    assert client.get(f"/score-jobs/{job.job_id}").json()["status"] == "queued"
+    assert client.get(f"/score-jobs/{job.job_id}/results").status_code == 409
+
+
+def test_interrupted_job_resumes_from_checkpoint() -> None:
+    golden, model = _inputs(40)
+    reference = run_scoring_job(
+        create_scoring_job(io.BytesIO(golden), io.BytesIO(model), "m", golden_filename="golden.jsonl")
+    )
+    job = create_scoring_job(io.BytesIO(golden), io.BytesIO(model), "m", golden_filename="golden.jsonl")
+
+    calls = iter(range(1000))
+    stopped = run_scoring_job(job, checkpoint_interval=7, should_stop=lambda: next(calls) == 16)
+    assert stopped.status == "queued"
+    assert job_status(stopped)["scored"] == 17
+    assert job_status(stopped)["last_conversation_id"] == "c16"
+
+    # A result written after the checkpoint, e.g. just before a crash.
+    with (job.path / RESULTS_FILE).open("ab") as results:
+        results.write(b'{"conversation_id": "c17", "partial')
+
+    resumed = run_scoring_job(stopped, checkpoint_interval=7)
+    assert resumed.status == "completed"
+    assert (job.path / RESULTS_FILE).read_bytes() == (reference.path / RESULTS_FILE).read_bytes()
+    assert job_status(resumed)["summary"] == job_status(reference)["summary"]
+
+
+def test_finished_jobs_are_evicted_by_age_and_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    golden, model = _inputs(20)
+    queued = create_scoring_job(io.BytesIO(golden), io.BytesIO(model), "m", golden_filename="golden.jsonl")
+    old, recent = (
+        run_scoring_job(create_scoring_job(io.BytesIO(golden), io.BytesIO(model), "m", golden_filename="golden.jsonl"))
+        for _ in range(2)
+    )
+    cancelled = create_generation_job("{}").update(status="cancelled")
+    now = time.time()
+    for job, age in [(queued, 30 * 86400), (old, 8 * 86400), (recent, 3600), (cancelled, 7200)]:
+        os.utime(job.path / JOB_FILE, (now - age, now - age))
+
+    # Past the retention age only ``old`` goes; unfinished jobs are never deleted.
+    assert evict_finished_jobs(max_bytes=10**12) == [old.job_id]
+    assert not old.path.exists() and queued.path.exists()
+
+    # Over the size budget the least recently updated finished jobs go next.
+    assert evict_finished_jobs(max_bytes=1) == [cancelled.job_id, recent.job_id]
+    assert [job.job_id for job in iter_scoring_jobs()] == [queued.job_id]
+    assert list(iter_generation_jobs()) == []
+
+    # Creating a job applies the limits; recent jobs are within the grace period.
+    finished = run_scoring_job(create_scoring_job(io.BytesIO(golden), io.BytesIO(model), "m"))
+    monkeypatch.setenv("EVAL_JOBS_MAX_BYTES", "1")
+    create_scoring_job(io.BytesIO(golden), io.BytesIO(model), "m")
+    assert finished.path.exists()
+    monkeypatch.setattr(jobs, "EVICTION_GRACE_SECONDS", 0)
+    create_generation_job("{}")
+    assert not finished.path.exists()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.score_summary import ScoreSummary, SummaryLabels, TopCounter
+from app.scoring import score_dataset
+
+
+def _golden(index: int) -> dict:
+    return {
+        "conversation_id": f"c{index}",
+        "workflow": "Returns" if index % 2 else "Orders",
+        "metadata": {"behaviours": ["HappyPath"], "axes": {"tier": "gold" if index < 2 else "basic"}},
+        "expected_actions": ["refund", "apologise"],
+        "key_facts": {"status": "approved"},
+        "scoring_rules": {"disallowed_phrases": ["guarantee"]},
+    }
+
+
+def test_summary_accumulates_while_scoring() -> None:
+    golden = [_golden(index) for index in range(4)]
+    model = [
+        {"conversation_id": "c0", "text": "refund approved, apologise"},
+        {"conversation_id": "c1", "text": "refund approved, I guarantee it"},
+        {"conversation_id": "c2", "text": "approved"},
+    ]
+
+    summary = ScoreSummary()
+    score_dataset(golden, model, summary=summary)
+    payload = summary.to_dict()
+
+    assert (payload["total"], payload["passed"], payload["pass_rate"]) == (4, 1, 0.25)
+    assert payload["model_text_missing"] == 1
+    assert payload["expected_actions"]["matched"] == 3
+    assert payload["expected_actions"]["most_missed"][0] == {"action": "apologise", "count": 3}
+    assert payload["key_facts"]["most_missed"] == [{"fact": "status", "count": 1}]
+    assert payload["policy_violations"]["most_common"] == [{"phrase": "guarantee", "count": 1}]
+    assert payload["by_workflow"]["Orders"] == {"total": 2, "passed": 1, "pass_rate": 0.5}
+    assert payload["by_behaviour"]["HappyPath"]["total"] == 4
+    assert payload["by_axis"]["tier"]["gold"] == {"total": 2, "passed": 1, "pass_rate": 0.5}
+
+
+def test_summary_with_workers_matches_serial(scoring_pool: None) -> None:
+    golden = [_golden(index) for index in range(30)]
+    model = [{"conversation_id": f"c{index}", "text": "refund"} for index in range(0, 30, 3)]
+
+    serial, parallel = ScoreSummary(), ScoreSummary()
+    score_dataset(golden, model, summary=serial)
+    score_dataset(golden, model, summary=parallel, workers=2, chunk_size=4)
+
+    assert parallel.to_dict() == serial.to_dict()
+
+
+def test_summary_labels_and_top_counter_bounds() -> None:
+    labels = SummaryLabels.from_golden({"behaviours": ["A", "B"], "axes": {"x": 1}})
+    assert labels == SummaryLabels(None, ("A", "B"), (("x", "1"),))
+
+    counter = TopCounter(capacity=2)
+    counter.update(["a", "a", "a", "b", "c", "d"])
+    assert len(counter.most_common()) == 2
+    assert counter.most_common()[0] == ("a", 3)
+
+
+def test_score_run_summary_returns_archive() -> None:
+    client = TestClient(app)
+    golden = b"".join((json.dumps(_golden(index)) + "\n").encode() for index in range(3))
+    files = {
+        "golden_dataset": ("golden.jsonl", golden, "application/jsonl"),
+        "model_outputs": ("model.jsonl", b'{"conversation_id": "c1", "text": "refund"}\n', "application/jsonl"),
+    }
+
+    response = client.post("/score-run", files=files, data={"model_id": "m", "summary": "true"})
+
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.namelist() == ["scored_results.jsonl", "summary.json"]
+    lines = archive.read("scored_results.jsonl").decode("utf-8").splitlines()
+    summary = json.loads(archive.read("summary.json"))
+    assert summary["model_id"] == "m"
+    assert summary["total"] == len(lines) == 3
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import io
 import json
 
+import pytest
 from fastapi.testclient import TestClient
 
+from app import scoring
 from app.main import app
+from app.scoring import index_model_outputs, score_dataset
 
 
 def _jsonl_line(payload: dict) -> bytes:
@@ -59,3 +63,110 @@ def test_score_run_invalid_jsonl_returns_400() -> None:
     response = client.post("/score-run", files=files, data=data)
 
     assert response.status_code == 400
+
+
+def test_score_run_streams_many_entries_in_golden_order() -> None:
+    client = TestClient(app)
+
+    golden = b"".join(
+        _jsonl_line({"conversation_id": f"conv-{index}", "expected_actions": [f"act{index}"]})
+        for index in range(1200)
+    )
+    model_lines = [
+        _jsonl_line({"conversation_id": f"conv-{index}", "text": f"did act{index}"})
+        for index in range(0, 1200, 2)
+    ]
+    model_lines.append(b"\n")
+    model_lines.append(_jsonl_line({"conversation_id": "conv-0", "text": "overridden"}))
+
+    files = {
+        "golden_dataset": ("golden.jsonl", golden, "application/jsonl"),
+        "model_outputs": ("model.jsonl", b"".join(reversed(model_lines)), "application/jsonl"),
+    }
+    response = client.post("/score-run", files=files, data={"model_id": "m"})
+
+    assert response.status_code == 200
+    scored = [json.loads(line) for line in response.text.splitlines()]
+    assert [entry["conversation_id"] for entry in scored] == [f"conv-{i}" for i in range(1200)]
+    assert [entry["overall_pass"] for entry in scored[:4]] == [True, False, True, False]
+    assert scored[1]["model_text_present"] is False
+
+
+def test_score_run_invalid_model_jsonl_returns_400() -> None:
+    client = TestClient(app)
+
+    files = {
+        "golden_dataset": ("golden.jsonl", b"{}\n", "application/jsonl"),
+        "model_outputs": ("model.jsonl", b"[1, 2]\n", "application/jsonl"),
+    }
+    response = client.post("/score-run", files=files, data={"model_id": "m"})
+
+    assert response.status_code == 400
+    assert "expected object" in response.json()["detail"]
+
+
+def test_offset_index_spills_to_sqlite() -> None:
+    lines = [{"conversation_id": f"c{index % 50}", "text": str(index)} for index in range(200)]
+    payload = io.BytesIO(b"".join(_jsonl_line(line) for line in lines))
+
+    index = index_model_outputs(payload, max_memory_keys=10)
+    try:
+        assert index.spilled
+        assert len(index) == 50
+        assert index.get("c3") == {"conversation_id": "c3", "text": "153"}
+        assert index.get("missing") is None
+    finally:
+        index.close()
+
+
+def test_score_dataset_workers_match_serial(scoring_pool: None) -> None:
+    golden = [
+        {
+            "conversation_id": f"conv-{index}",
+            "expected_actions": [f"act{index % 7}"],
+            "scoring_rules": {"disallowed_phrases": ["never"] if index % 3 else []},
+        }
+        for index in range(90)
+    ]
+    model = [
+        {"conversation_id": f"conv-{index}", "text": f"act{index % 5} never"}
+        for index in range(0, 90, 2)
+    ]
+
+    serial = score_dataset(golden, model)
+
+    assert score_dataset(golden, model, workers=2, chunk_size=8) == serial
+    assert score_dataset(golden[:5], model, workers=2, chunk_size=8) == serial[:5]
+
+
+def test_small_runs_and_single_cpus_score_serially(monkeypatch: pytest.MonkeyPatch) -> None:
+    golden = [{"conversation_id": f"conv-{index}", "expected_actions": ["refund"]} for index in range(30)]
+    model = [{"conversation_id": f"conv-{index}", "text": "refund"} for index in range(0, 30, 3)]
+    serial = score_dataset(golden, model)
+
+    def fail(*_: object, **__: object) -> None:
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(scoring, "ProcessPoolExecutor", fail)
+    monkeypatch.setattr(scoring, "available_cpus", lambda: 4)
+    monkeypatch.setattr(scoring, "SCORE_PARALLEL_MIN_CONVERSATIONS", 30)
+    assert score_dataset(golden, model, workers=4, chunk_size=4) == serial
+
+    monkeypatch.setattr(scoring, "SCORE_PARALLEL_MIN_CONVERSATIONS", 0)
+    monkeypatch.setattr(scoring, "available_cpus", lambda: 1)
+    assert score_dataset(golden, model, workers=4, chunk_size=4) == serial
+
+
+def test_score_run_accepts_workers_field() -> None:
+    client = TestClient(app)
+
+    files = {
+        "golden_dataset": ("golden.jsonl", _jsonl_line({"conversation_id": "c"}), "application/jsonl"),
+        "model_outputs": ("model.jsonl", _jsonl_line({"conversation_id": "c"}), "application/jsonl"),
+    }
+    response = client.post("/score-run", files=files, data={"model_id": "m", "workers": "4"})
+    assert response.status_code == 200
+    assert json.loads(response.text)["overall_pass"] is True
+
+    response = client.post("/score-run", files=files, data={"model_id": "m", "workers": "0"})
+    assert response.status_code == 422
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import shards
+from app.main import app
+from app.models import ShardCompression
+from app.shards import ShardOptions, iter_sharded_archive_entries
+
+CONFIG = {
+    "vertical": "commerce",
+    "workflows": ["ReturnsRefunds", "OrderStatusTracking"],
+    "behaviours": ["HappyPath"],
+    "axes": {
+        "policy_boundary": ["allowed", "partial", "not_allowed"],
+        "item_condition": ["new", "used", "defective"],
+    },
+    "num_samples_per_combo": 2,
+    "random_seed": 11,
+}
+
+
+def _generate(**overrides) -> zipfile.ZipFile:
+    response = TestClient(app).post("/generate-dataset", data={"config": json.dumps({**CONFIG, **overrides})})
+    assert response.status_code == 200, response.text
+    return zipfile.ZipFile(io.BytesIO(response.content))
+
+
+def _read_lines(archive: zipfile.ZipFile, path: str) -> list[dict]:
+    data = archive.read(path)
+    if path.endswith(".gz"):
+        data = gzip.decompress(data)
+    elif path.endswith(".zst"):
+        data = shards.zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return [json.loads(line) for line in data.splitlines()]
+
+
+_COMPRESSIONS = ["none", "gzip"] + (["zstd"] if shards.zstandard is not None else [])
+
+
+@pytest.mark.parametrize("compression", _COMPRESSIONS)
+def test_shards_hold_the_documents_records(compression: str) -> None:
+    documents = _generate()
+    names = documents.namelist()
+    conversations = json.loads(documents.read(names[0]))["conversations"]
+    golden = json.loads(documents.read(names[1]))["entries"]
+
+    archive = _generate(output_format="jsonl_shards", shard_max_records=7, shard_compression=compression)
+    output = json.loads(archive.read("manifest.json"))["output"]
+    dataset_shards = output["shards"]["dataset"]
+    golden_shards = output["shards"]["golden"]
+
+    assert output["format"] == "jsonl_shards" and output["compression"] == compression
+    assert [shard["records"] for shard in dataset_shards] == [7, 7, 7, 7, 7, 1]
+    assert [shard["records"] for shard in golden_shards] == [7, 7, 7, 7, 7, 1]
+    assert archive.namelist()[:2] == [dataset_shards[0]["path"], golden_shards[0]["path"]]
+    for shard in dataset_shards + golden_shards:
+        data = archive.read(shard["path"])
+        assert len(data) == shard["bytes"]
+        assert hashlib.sha256(data).hexdigest() == shard["sha256"]
+        expected_type = zipfile.ZIP_STORED if compression != "none" else zipfile.ZIP_DEFLATED
+        assert archive.getinfo(shard["path"]).compress_type == expected_type
+    assert [line for shard in dataset_shards for line in _read_lines(archive, shard["path"])] == conversations
+    assert [line for shard in golden_shards for line in _read_lines(archive, shard["path"])] == golden
+
+
+def test_shards_are_bounded_by_bytes() -> None:
+    entries = [({"conversation_id": f"c{index}", "text": "x" * 90}, {"conversation_id": f"c{index}"}) for index in range(9)]
+    described: dict = {}
+    options = ShardOptions(max_bytes=300)
+
+    archive_entries = [
+        (name, b"".join(chunks)) for name, chunks in iter_sharded_archive_entries(entries, "demo", options, described)
+    ]
+
+    # Each line is 125 bytes, so a shard closes after its third record.
+    assert [shard["records"] for shard in described["dataset"]] == [3, 3, 3]
+    assert all(shard["uncompressed_bytes"] == 375 for shard in described["dataset"])
+    assert [name for name, _ in archive_entries][:2] == [
+        "shards/demo.dataset.00000.jsonl",
+        "shards/demo.golden.00000.jsonl",
+    ]
+    assert archive_entries[1][1].splitlines()[0] == b'{"conversation_id":"c0"}'
+
+
+def test_default_and_unavailable_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert ShardOptions().max_records == shards.DEFAULT_SHARD_RECORDS
+    assert ShardOptions(max_bytes=10).max_records is None
+
+    monkeypatch.setattr(shards, "zstandard", None)
+    with pytest.raises(ValueError):
+        ShardOptions(compression=ShardCompression.zstd)
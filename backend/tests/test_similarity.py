@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from app.golden_index import compile_golden_index, load_golden_index
+from app.scoring import iter_scored_conversations, score_dataset
+from app.similarity import VariantSimilarity
+
+REFUND = "I can process a refund for your order today."
+DENIAL = "Sorry, refunds are not possible outside the return window."
+
+
+def _golden(count: int) -> list[dict]:
+    return [
+        {
+            "conversation_id": f"c{index}",
+            "turns": [{"turn_index": 1, "expected": {"variants": [REFUND] if index % 2 else [DENIAL]}}],
+        }
+        for index in range(count)
+    ]
+
+
+def _model(conversation_id: str, reply: str) -> dict:
+    return {
+        "conversation_id": conversation_id,
+        "turns": [{"speaker": "user", "text": "refund?"}, {"speaker": "assistant", "text": reply}],
+    }
+
+
+def test_best_matches_ranks_candidates_by_cosine() -> None:
+    similarity = VariantSimilarity([REFUND, DENIAL, REFUND])
+
+    matches = similarity.best_matches(
+        [REFUND, "sure, I can process the refund for your order", "", "refund"],
+        [[REFUND, DENIAL], [DENIAL, REFUND], [REFUND], []],
+    )
+
+    assert len(similarity) == 2
+    assert matches[0] == (REFUND, pytest.approx(1.0))
+    assert matches[1][0] == REFUND and 0.5 < matches[1][1] < 1.0
+    assert matches[2:] == [(None, 0.0), (None, 0.0)]
+    with pytest.raises(ValueError):
+        similarity.best_matches(["hello"], [["not fitted"]])
+
+
+def test_paraphrased_turn_passes_on_similarity() -> None:
+    golden = _golden(2)
+    model = [
+        _model("c0", "I'm sorry, but refunds are not possible outside of the return window."),
+        _model("c1", "Please hold while I check the weather."),
+    ]
+
+    paraphrase, unrelated = score_dataset(golden, model)
+
+    assert paraphrase["turns"][0]["matched"] == []
+    assert paraphrase["turns"][0]["best_variant"] == DENIAL
+    assert paraphrase["turns"][0]["passed"] and paraphrase["overall_pass"]
+    assert unrelated["turns"][0]["similarity"] < 0.5
+    assert not unrelated["overall_pass"]
+
+
+def test_parallel_and_indexed_scoring_share_similarity(tmp_path: Path, scoring_pool: None) -> None:
+    golden = _golden(9)
+    model = [_model(entry["conversation_id"], f"We can process a refund {index}") for index, entry in enumerate(golden)]
+    models = {entry["conversation_id"]: entry for entry in model}
+    golden_file = io.BytesIO("\n".join(json.dumps(entry) for entry in golden).encode("utf-8"))
+
+    index = compile_golden_index(golden_file, tmp_path)
+    reloaded = load_golden_index(index.path)
+    expected = score_dataset(golden, model)
+
+    assert reloaded is not None and reloaded.similarity.variants == (DENIAL, REFUND)
+    assert score_dataset(golden, model, workers=2, chunk_size=4) == expected
+    assert list(iter_scored_conversations(reloaded, models.get, similarity=reloaded.similarity)) == expected
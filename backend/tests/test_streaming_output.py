@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.archive import stream_zip
+from app.generation import build_conversation_plans
+from app.main import app
+from app.models import GenerationRequest, IndustryVertical
+from app.serialization import JsonArraySpool, JsonSerializer, iter_json_document, orjson
+
+
+def _header() -> dict:
+    return {"dataset_id": "demo", "version": "1.0.0", "metadata": {"tags": ["x", "ü"]}}
+
+
+def test_iter_json_document_matches_json_dumps() -> None:
+    items = [{"conversation_id": "c1", "turns": [{"role": "user", "text": "hi"}]}, [1, 2], "three"]
+
+    streamed = b"".join(iter_json_document(_header(), "conversations", iter(items)))
+    expected = json.dumps({**_header(), "conversations": items}, ensure_ascii=False, indent=2)
+
+    assert streamed.decode("utf-8") == expected
+
+
+def test_iter_json_document_empty_items() -> None:
+    streamed = b"".join(iter_json_document(_header(), "conversations", []))
+    expected = json.dumps({**_header(), "conversations": []}, ensure_ascii=False, indent=2)
+
+    assert streamed.decode("utf-8") == expected
+
+
+_BACKENDS = ["json"] + (["orjson"] if orjson is not None else [])
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
+@pytest.mark.parametrize("compact", [False, True])
+def test_serializer_backends_render_same_document(backend: str, compact: bool) -> None:
+    items = [{"conversation_id": "c1", "text": "naïve “quotes”", "n": [1, 2, {}]}, {}, []]
+    serializer = JsonSerializer(compact=compact, backend=backend)
+
+    streamed = b"".join(iter_json_document(_header(), "conversations", items, serializer))
+    reference = JsonSerializer(compact=compact, backend="json").dumps(
+        {**_header(), "conversations": items}
+    )
+
+    assert streamed == reference
+    assert json.loads(streamed) == {**_header(), "conversations": items}
+    assert (b"\n" not in streamed) is compact
+
+
+def test_json_array_spool_replays_document() -> None:
+    spool = JsonArraySpool(max_size=16)
+    items = [{"conversation_id": f"c{index}"} for index in range(5)]
+    for item in items:
+        spool.append(item)
+
+    streamed = b"".join(spool.iter_document({"dataset_id": "demo"}, "entries"))
+
+    assert json.loads(streamed) == {"dataset_id": "demo", "entries": items}
+
+
+def test_stream_zip_is_lazy_and_valid() -> None:
+    consumed: list[str] = []
+
+    def chunks(name: str):
+        consumed.append(name)
+        for index in range(100):
+            yield f"{name}-{index}\n".encode("utf-8")
+
+    def entries():
+        yield "first.txt", chunks("first")
+        yield "second.txt", chunks("second")
+
+    stream = stream_zip(entries(), chunk_size=16)
+    next(stream)
+    assert consumed == ["first"]
+
+    payload = b"".join(stream)
+    archive = zipfile.ZipFile(io.BytesIO(payload))
+    assert archive.namelist() == ["first.txt", "second.txt"]
+    assert archive.read("second.txt").decode("utf-8").splitlines()[-1] == "second-99"
+
+
+def test_build_conversation_plans_is_lazy() -> None:
+    request = GenerationRequest(
+        vertical=IndustryVertical.commerce,
+        workflows=["ReturnsRefunds"],
+        axes={"policy_boundary": ["allowed", "not_allowed"], "item_condition": ["new", "used"]},
+        num_samples_per_combo=2,
+    )
+
+    plans, manifest = build_conversation_plans(request)
+
+    assert not isinstance(plans, list)
+    assert manifest["total_conversations"] == 8
+    assert len(list(plans)) == 8
+
+
+def test_generate_dataset_streams_archive() -> None:
+    client = TestClient(app)
+    config = {
+        "vertical": "commerce",
+        "workflows": ["ReturnsRefunds", "OrderStatusTracking"],
+        "behaviours": ["HappyPath"],
+        "axes": {"policy_boundary": ["allowed", "not_allowed"]},
+        "random_seed": 3,
+    }
+
+    response = client.post("/generate-dataset", data={"config": json.dumps(config)})
+
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    dataset_name, golden_name, manifest_name = archive.namelist()
+    assert manifest_name == "manifest.json"
+
+    dataset = json.loads(archive.read(dataset_name))
+    golden = json.loads(archive.read(golden_name))
+    manifest = json.loads(archive.read(manifest_name))
+
+    assert len(dataset["conversations"]) == manifest["total_conversations"] == 4
+    assert [entry["conversation_id"] for entry in golden["entries"]] == [
+        conversation["conversation_id"] for conversation in dataset["conversations"]
+    ]
+
+
+def test_generate_dataset_compact_json() -> None:
+    client = TestClient(app)
+    config = {
+        "vertical": "commerce",
+        "workflows": ["ReturnsRefunds"],
+        "axes": {"policy_boundary": ["allowed", "not_allowed"]},
+        "compact_json": True,
+    }
+
+    response = client.post("/generate-dataset", data={"config": json.dumps(config)})
+
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    for name in archive.namelist():
+        payload = archive.read(name)
+        assert b"\n" not in payload
+        json.loads(payload)
+    golden = json.loads(archive.read(archive.namelist()[1]))
+    assert set(golden["entries"][0]) == {"conversation_id", "turns", "final_outcome", "constraints"}
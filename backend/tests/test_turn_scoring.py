@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from app.score_summary import ScoreSummary
+from app.scoring import ModelTurns, score_conversation
+
+GOLDEN = {
+    "conversation_id": "c1",
+    "turns": [
+        {
+            "turn_index": 3,
+            "expected": {
+                "expected_actions": ["issue refund"],
+                "key_facts": ["ORD-42"],
+                "disallowed_phrases": ["guarantee"],
+            },
+        }
+    ],
+}
+
+
+def _model(*replies: str) -> dict:
+    turns = []
+    for reply in replies:
+        turns.append({"role": "user", "text": "hello"})
+        turns.append({"role": "assistant", "text": reply})
+    return {"conversation_id": "c1", "turns": turns}
+
+
+def test_turn_checks_only_scan_the_aligned_turn() -> None:
+    early = score_conversation(GOLDEN, _model("I will issue refund for ORD-42", "Anything else?"))
+    aligned = score_conversation(GOLDEN, _model("We guarantee it", "I will issue refund for ORD-42"))
+
+    assert early["turns"][0]["expected_actions"]["missed"] == ["issue refund"]
+    assert early["turns"][0]["key_facts"]["missed"] == ["ORD-42"]
+    assert not early["overall_pass"]
+
+    # A disallowed phrase in another turn does not violate this turn's policy.
+    assert aligned["turns"][0]["policy_violations"]["violation_count"] == 0
+    assert aligned["turns"][0]["passed"] and aligned["overall_pass"]
+
+
+def test_model_turns_align_by_turn_index() -> None:
+    model = {
+        "turns": [
+            {"speaker": "agent", "turn_index": 1, "text": "first"},
+            {"speaker": "user", "turn_index": 2, "text": "question"},
+            {"speaker": "assistant", "turn_index": 5, "text": "second"},
+            {"speaker": "assistant", "turn_index": 4, "text": "late"},
+        ]
+    }
+    turns = ModelTurns(model)
+
+    assert [turns.text_at(index) for index in (0, 1, 2, 5, 6)] == ["first", "first", "second", "second", ""]
+    assert ModelTurns({"text": "flat output"}).text_at(7) == "flat output"
+    assert ModelTurns(None).text_at(0) == ""
+
+
+def test_role_only_turns_count_for_alignment_but_not_conversation_text() -> None:
+    golden = {"conversation_id": "c1", "expected_actions": ["issue refund"]}
+    model = _model("I will issue refund")
+
+    conversation = score_conversation(golden, model)
+    with_speaker = score_conversation(
+        golden, {"turns": [{"speaker": "assistant", "text": "I will issue refund"}]}
+    )
+
+    # Conversation-level text reads ``speaker`` only, as before per-turn scoring.
+    assert not conversation["model_text_present"]
+    assert conversation["expected_actions"]["missed"] == ["issue refund"]
+    assert with_speaker["expected_actions"]["matched"] == ["issue refund"]
+    assert ModelTurns(model).text_at(1) == "I will issue refund"
+
+
+def test_summary_reports_pass_rate_per_turn_index() -> None:
+    summary = ScoreSummary()
+    summary.add(score_conversation(GOLDEN, _model("", "issue refund ORD-42")))
+    summary.add(score_conversation(GOLDEN, _model("", "sorry")))
+
+    assert summary.to_dict()["turns"]["by_index"] == {"3": {"total": 2, "passed": 1, "pass_rate": 0.5}}